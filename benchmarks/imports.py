@@ -0,0 +1,75 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Import time benchmarks. Every import runs in a fresh interpreter, timed from
+after the ripe.atlas namespace package is imported so that only the cost of
+cousteau and its dependencies is measured.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORTS = {
+    "import_package": "import ripe.atlas.cousteau",
+    "import_results": "from ripe.atlas.cousteau import AtlasResultsRequest",
+    "import_stream": "from ripe.atlas.cousteau import AtlasStream",
+    "import_all": "from ripe.atlas.cousteau import *",
+}
+
+SCRIPT = """
+import json, sys, time
+import ripe.atlas
+before = set(sys.modules)
+start = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def measure_import(statement):
+    """
+    Run the import statement in a new interpreter and return the seconds it
+    took and the modules it imported.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, sys.path)))
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT, statement],
+        env=env, check=True, stdout=subprocess.PIPE,
+    ).stdout
+    measured = json.loads(output)
+    return measured["seconds"], measured["modules"]
+
+
+def run_import_benchmark(statement, repeat):
+    """Measure the import repeat times and return its statistics."""
+    timings = []
+    modules = []
+    for _ in range(repeat):
+        seconds, modules = measure_import(statement)
+        timings.append(seconds)
+
+    median = statistics.median(timings)
+    return {
+        "items": 1,
+        "seconds": median,
+        "best": min(timings),
+        "items_per_second": 1 / median if median else None,
+        "modules": len(modules),
+    }
@@ -0,0 +1,232 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmarks of listing iteration, result download, metadata hydration and
+stream decoding against the mock ATLAS server, and of import times. Results
+are written as JSON and can be compared with a previous run to catch regressions:
+
+    python -m benchmarks --output baseline.json
+    python -m benchmarks --output current.json --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from ripe.atlas.cousteau import (
+    AtlasClient,
+    AtlasLatestRequest,
+    AtlasResultsRequest,
+    AtlasStream,
+    Probe,
+    ProbeRequest,
+)
+from ripe.atlas.cousteau.version import __version__
+
+from .imports import IMPORTS, run_import_benchmark
+from tests.mock_server import MockAtlasServer
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a function(server, options) returning the items it handled."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+@benchmark("listing")
+def bench_listing(server, options):
+    return sum(1 for _ in ProbeRequest(server=server.url))
+
+
+@benchmark("listing_client")
+def bench_listing_client(server, options):
+    with AtlasClient(server=server.url) as client:
+        return sum(1 for _ in client.probes())
+
+
+@benchmark("results_json")
+def bench_results_json(server, options):
+    is_success, results = AtlasResultsRequest(msm_id=1001, server=server.url).create()
+    return len(results)
+
+
+@benchmark("results_stream")
+def bench_results_stream(server, options):
+    request = AtlasResultsRequest(msm_id=1001, server=server.url)
+    return sum(1 for _ in request.iter_results())
+
+
+@benchmark("latest")
+def bench_latest(server, options):
+    is_success, results = AtlasLatestRequest(msm_id=1001, server=server.url).create()
+    return len(results)
+
+
+@benchmark("metadata")
+def bench_metadata(server, options):
+    with AtlasClient(server=server.url) as client:
+        for probe_id in range(1, options.objects + 1):
+            Probe(id=probe_id, client=client).country_code
+    return options.objects
+
+
+@benchmark("stream")
+def bench_stream(server, options):
+    stream = AtlasStream(base_url=server.url)
+    stream.connect()
+    try:
+        stream.subscribe("result", msm=1001)
+        count = -1  # the atlas_subscribed event
+        for _ in stream.iter(seconds=options.stream_timeout):
+            count += 1
+            if count == server.stream_result_count:
+                break
+    finally:
+        stream.disconnect()
+    return count
+
+
+def run_benchmark(function, server, options):
+    """Run a benchmark options.repeat times and return its statistics."""
+    timings = []
+    items = 0
+    for _ in range(options.repeat):
+        start = time.perf_counter()
+        items = function(server, options)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "items": items,
+        "seconds": median,
+        "best": min(timings),
+        "items_per_second": items / median if median else None,
+    }
+
+
+def run(options, names=None):
+    """Run the selected benchmarks and return the report."""
+    server = MockAtlasServer(
+        probes=options.probes,
+        results=options.results,
+        result_probes=options.result_probes,
+        page_size=options.page_size,
+        latency=options.latency,
+        stream_results=options.stream_results,
+    )
+    report = {
+        "created": int(time.time()),
+        "python": platform.python_version(),
+        "cousteau": __version__,
+        "settings": {
+            key: value for key, value in vars(options).items()
+            if key not in ("output", "compare", "only")
+        },
+        "benchmarks": {},
+    }
+    names = names or list(BENCHMARKS) + list(IMPORTS)
+    with server:
+        for name in names:
+            if name in IMPORTS:
+                report["benchmarks"][name] = run_import_benchmark(
+                    IMPORTS[name], options.repeat
+                )
+            else:
+                report["benchmarks"][name] = run_benchmark(
+                    BENCHMARKS[name], server, options
+                )
+    return report
+
+
+def compare(report, baseline, threshold):
+    """
+    Return (name, baseline seconds, seconds, ratio, regressed) for every
+    benchmark of the report that is in the baseline.
+    """
+    rows = []
+    for name, current in report["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        ratio = current["seconds"] / previous["seconds"]
+        rows.append((
+            name, previous["seconds"], current["seconds"], ratio,
+            ratio > 1 + threshold
+        ))
+    return rows
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--probes", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--results", type=int, default=50000)
+    parser.add_argument("--result-probes", type=int, default=1000)
+    parser.add_argument("--objects", type=int, default=200,
+                        help="probes hydrated by the metadata benchmark")
+    parser.add_argument("--stream-results", type=int, default=20000)
+    parser.add_argument("--stream-timeout", type=float, default=30.0)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds the server waits before every response")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", nargs="*", choices=sorted(list(BENCHMARKS) + list(IMPORTS))
+    )
+    parser.add_argument("--output", help="file to write the JSON report to")
+    parser.add_argument("--compare", help="report of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown ratio reported as a regression")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parse_args(args)
+    report = run(options, options.only)
+
+    for name, stats in report["benchmarks"].items():
+        print("{0:<16} {1:>10.4f}s {2:>12.0f} items/s".format(
+            name, stats["seconds"], stats["items_per_second"] or 0
+        ))
+
+    if options.output:
+        with open(options.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if not options.compare:
+        return 0
+
+    with open(options.compare) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = 0
+    print()
+    for name, before, after, ratio, regressed in compare(
+            report, baseline, options.threshold):
+        regressions += regressed
+        print("{0:<16} {1:>10.4f}s -> {2:>8.4f}s  x{3:.2f}{4}".format(
+            name, before, after, ratio, "  REGRESSION" if regressed else ""
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,20 +12,96 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from .measurement import AtlasMeasurement, Ping, Traceroute, Dns, Sslcert, Ntp, Http
-from .source import AtlasSource, AtlasChangeSource
-from .request import (
-    AtlasRequest,
-    AtlasCreateRequest,
-    AtlasChangeRequest,
-    AtlasStopRequest,
-    AtlasLatestRequest,
-    AtlasResultsRequest
-)
-from .stream import AtlasStream
-from .api_listing import ProbeRequest, MeasurementRequest, AnchorRequest
-from .api_meta_data import Probe, Measurement
-from .measurement_tagging import MeasurementTagger
+"""
+The public names are imported from their submodules on first use, so that
+importing the package stays cheap and, for instance, using only the requests
+never imports the stream dependencies.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .measurement import (
+        AtlasMeasurement,
+        Ping,
+        Traceroute,
+        Dns,
+        Sslcert,
+        Ntp,
+        Http,
+        MeasurementTemplate,
+    )
+    from .source import AtlasSource, AtlasChangeSource
+    from .request import (
+        AtlasRequest,
+        AtlasCreateRequest,
+        AtlasChangeRequest,
+        AtlasStopRequest,
+        AtlasLatestRequest,
+        AtlasResultsRequest
+    )
+    from .stream import AtlasStream, StreamStats
+    from .transport import RequestsTransport, HTTP2Transport
+    from .api_listing import ProbeRequest, MeasurementRequest, AnchorRequest
+    from .api_meta_data import Probe, Measurement
+    from .measurement_tagging import MeasurementTagger
+    from .client import AtlasClient
+    from .sync import ProbeSync, MeasurementSync
+    from .probe_catalog import ProbeCatalog
+    from .bulk import BulkCreator, RateLimiter
+
+# Submodule defining every public name
+_SUBMODULES = {
+    "AtlasMeasurement": "measurement",
+    "Ping": "measurement",
+    "Traceroute": "measurement",
+    "Dns": "measurement",
+    "Sslcert": "measurement",
+    "Ntp": "measurement",
+    "Http": "measurement",
+    "MeasurementTemplate": "measurement",
+    "AtlasSource": "source",
+    "AtlasChangeSource": "source",
+    "AtlasRequest": "request",
+    "AtlasCreateRequest": "request",
+    "AtlasChangeRequest": "request",
+    "AtlasStopRequest": "request",
+    "AtlasLatestRequest": "request",
+    "AtlasResultsRequest": "request",
+    "AtlasStream": "stream",
+    "StreamStats": "stream",
+    "RequestsTransport": "transport",
+    "HTTP2Transport": "transport",
+    "ProbeRequest": "api_listing",
+    "MeasurementRequest": "api_listing",
+    "AnchorRequest": "api_listing",
+    "Probe": "api_meta_data",
+    "Measurement": "api_meta_data",
+    "MeasurementTagger": "measurement_tagging",
+    "AtlasClient": "client",
+    "ProbeSync": "sync",
+    "MeasurementSync": "sync",
+    "ProbeCatalog": "probe_catalog",
+    "BulkCreator": "bulk",
+    "RateLimiter": "bulk",
+}
+
+
+def __getattr__(name):
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(import_module("." + submodule, __name__), name)
+    # Cache it, later lookups don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
 
 
 __all__ = [
@@ -35,6 +111,7 @@ __all__ = [
     "Sslcert",
     "Ntp",
     "Http",
+    "MeasurementTemplate",
     "AtlasRequest",
     "AtlasChangeRequest",
     "AtlasCreateRequest",
@@ -44,6 +121,9 @@ __all__ = [
     "AtlasSource",
     "AtlasChangeSource",
     "AtlasStream",
+    "StreamStats",
+    "RequestsTransport",
+    "HTTP2Transport",
     "AtlasMeasurement",
     "ProbeRequest",
     "MeasurementRequest",
@@ -51,4 +131,10 @@ __all__ = [
     "Probe",
     "Measurement",
     "MeasurementTagger",
+    "AtlasClient",
+    "ProbeSync",
+    "MeasurementSync",
+    "ProbeCatalog",
+    "BulkCreator",
+    "RateLimiter",
 ]
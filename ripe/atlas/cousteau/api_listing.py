@@ -12,12 +12,26 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import calendar
+import json
+import os
+import time
 from datetime import datetime
 
 from urllib.parse import urlparse
 
 from .api_meta_data import Probe, Measurement
+from .columnar import (
+    Column,
+    get_name,
+    get_status_name,
+    select_columns,
+    batches_to_columns,
+    batches_to_numpy,
+    batches_to_arrow,
+    arrow_to_dataframe,
+    columns_to_dataframe,
+)
+from . import instrumentation, timestamps
 from .request import AtlasRequest
 from .exceptions import APIResponseError
 
@@ -28,17 +42,27 @@ class RequestGenerator(object):
     probes/measurements as single objects. It supports any filter APIs support
     in a dummy way, which means it will take accept whatever it passed and
     build url_path from this.
+
+    Iteration can be resumed after a restart: get_cursor() returns a JSON
+    serialisable snapshot of the remaining work that can be passed back with
+    resume_from. If checkpoint_file is given, the cursor is saved there after
+    every batch and loaded on start, so an interrupted listing continues from
+    the last fetched page. The file is removed once the listing is exhausted.
     """
 
     url = ""
     id_filter = ""
+    columns = ()
     URL_LENGTH_LIMIT = 5000
 
     def __init__(self, return_objects=False, user_agent=None, server=None,
-                 verify=True, **filters):
+                 verify=None, transport=None, client=None, resume_from=None,
+                 checkpoint_file=None, **filters):
         self._user_agent = user_agent
         self.server = server
         self.verify = verify
+        self.transport = transport
+        self.client = client
         self.api_filters = filters
         self.split_urls = []
         self.total_count_flag = False
@@ -47,6 +71,56 @@ class RequestGenerator(object):
         self.return_objects = return_objects
         self.atlas_url = self.build_url()
 
+        self.checkpoint_file = checkpoint_file
+        if resume_from is None and checkpoint_file:
+            resume_from = self.load_checkpoint()
+        if resume_from is not None:
+            self.resume(resume_from)
+
+    def get_cursor(self):
+        """
+        Return the current position of the iteration as a JSON serialisable
+        dictionary. Objects of the current batch not returned yet are part of
+        the cursor.
+        """
+        return {
+            "next_url": self.atlas_url,
+            "split_urls": list(self.split_urls),
+            "counts": list(self._count),
+            "total_count_flag": self.total_count_flag,
+            "pending": list(self.current_batch),
+        }
+
+    def resume(self, cursor):
+        """Restore the position of the iteration from a cursor."""
+        self.atlas_url = cursor["next_url"]
+        self.split_urls = list(cursor["split_urls"])
+        self._count = list(cursor["counts"])
+        self.total_count_flag = cursor["total_count_flag"]
+        self.current_batch = list(cursor["pending"])
+
+    def load_checkpoint(self):
+        """Return the cursor stored in the checkpoint file if there is one."""
+        try:
+            with open(self.checkpoint_file) as checkpoint:
+                return json.load(checkpoint)
+        except FileNotFoundError:
+            return None
+
+    def save_checkpoint(self):
+        """Atomically write the current cursor to the checkpoint file."""
+        tmp_file = "{0}.tmp".format(self.checkpoint_file)
+        with open(tmp_file, "w") as checkpoint:
+            json.dump(self.get_cursor(), checkpoint)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def remove_checkpoint(self):
+        """Remove the checkpoint file of a finished iteration."""
+        try:
+            os.remove(self.checkpoint_file)
+        except FileNotFoundError:
+            pass
+
     def build_url(self):
         """Build the url path based on the filter options."""
 
@@ -56,7 +130,7 @@ class RequestGenerator(object):
         # Reduce complex objects to simpler strings
         for k, v in self.api_filters.items():
             if isinstance(v, datetime):  # datetime > UNIX timestamp
-                self.api_filters[k] = int(calendar.timegm(v.timetuple()))
+                self.api_filters[k] = timestamps.to_timestamp(v)
             if isinstance(v, (tuple, list)):  # tuples & lists > x,y,z
                 self.api_filters[k] = ",".join([str(_) for _ in v])
 
@@ -103,27 +177,96 @@ class RequestGenerator(object):
     def next(self):
         if not self.current_batch:  # If first time or current batch was all given
             if not self.atlas_url:  # We don't have any next url any more, exit
-                raise StopIteration()
+                self.stop_iteration()
             self.next_batch()
+            if self.checkpoint_file:
+                self.save_checkpoint()
             if not self.current_batch:  # Server request gives empty batch, exit
-                raise StopIteration()
+                self.stop_iteration()
 
         current_object = self.current_batch.pop(0)
         if self.return_objects:
-            return self.object_class(meta_data=current_object)
+            return self.object_class(
+                meta_data=current_object,
+                transport=self.transport,
+                client=self.client
+            )
         else:
             return current_object
 
+    def iter_batches(self):
+        """
+        Yield the remaining objects page by page, as lists of dictionaries
+        the way the API returns them.
+        """
+        while True:
+            if not self.current_batch:
+                if not self.atlas_url:
+                    break
+                self.next_batch()
+                if self.checkpoint_file:
+                    self.save_checkpoint()
+                if not self.current_batch:
+                    break
+            batch, self.current_batch = self.current_batch, []
+            yield batch
+
+        if self.checkpoint_file:
+            self.remove_checkpoint()
+
+    def to_columns(self, fields=None):
+        """
+        Return the remaining objects as a dictionary of column name to NumPy
+        array, built page by page: integers as int64, floats as float64 and
+        times as datetime64 in seconds. fields selects columns by name from
+        the class columns or gives extra Column definitions.
+        """
+        columns = select_columns(self.columns, fields)
+        return batches_to_numpy(self.iter_batches(), columns)
+
+    def to_arrow(self, fields=None):
+        """
+        Return the remaining objects as a pyarrow Table with typed columns:
+        integers as int64, timestamps as UTC timestamps and categories
+        dictionary encoded. Every page becomes a record batch.
+        """
+        columns = select_columns(self.columns, fields)
+        return batches_to_arrow(self.iter_batches(), columns)
+
+    def to_dataframe(self, fields=None):
+        """
+        Return the remaining objects as a pandas DataFrame with typed columns.
+        Goes through pyarrow if it is installed.
+        """
+        columns = select_columns(self.columns, fields)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return columns_to_dataframe(
+                batches_to_columns(self.iter_batches(), columns), columns
+            )
+        return arrow_to_dataframe(batches_to_arrow(self.iter_batches(), columns))
+
+    def stop_iteration(self):
+        """Clean up the checkpoint of a finished iteration and stop it."""
+        if self.checkpoint_file:
+            self.remove_checkpoint()
+        raise StopIteration()
+
     def next_batch(self):
         """
         Querying API for the next batch of objects and store next url and
         batch of objects.
         """
+        start = time.perf_counter()
+        url = self.atlas_url
         is_success, results = AtlasRequest(
             url_path=self.atlas_url,
             user_agent=self._user_agent,
             server=self.server,
             verify=self.verify,
+            transport=self.transport,
+            client=self.client,
         ).get()
 
         if not is_success:
@@ -133,6 +276,14 @@ class RequestGenerator(object):
         self.atlas_url = self.build_next_url(results.get("next"))
         self.current_batch = results.get("results", [])
 
+        if "page" in instrumentation.hooks:
+            instrumentation.fire("page", {
+                "url": url,
+                "items": len(self.current_batch),
+                "count": self.total_count,
+                "seconds": time.perf_counter() - start,
+            })
+
     def build_next_url(self, url):
         """Builds next url in a format compatible with cousteau. Path + query"""
         if not url:
@@ -173,6 +324,24 @@ class ProbeRequest(RequestGenerator):
     url = "/api/v2/probes/"
     id_filter = "id__in"
     object_class = Probe
+    columns = (
+        Column("id", "id", "int"),
+        Column("asn_v4", "asn_v4", "int"),
+        Column("asn_v6", "asn_v6", "int"),
+        Column("country_code", "country_code", "category"),
+        Column("status", get_status_name, "category"),
+        Column("is_anchor", "is_anchor", "bool"),
+        Column("is_public", "is_public", "bool"),
+        Column("address_v4", "address_v4", "string"),
+        Column("address_v6", "address_v6", "string"),
+        Column("prefix_v4", "prefix_v4", "string"),
+        Column("prefix_v6", "prefix_v6", "string"),
+        Column("longitude", ("geometry", "coordinates", 0), "float"),
+        Column("latitude", ("geometry", "coordinates", 1), "float"),
+        Column("first_connected", "first_connected", "timestamp"),
+        Column("last_connected", "last_connected", "timestamp"),
+        Column("total_uptime", "total_uptime", "int"),
+    )
 
 
 class MeasurementRequest(RequestGenerator):
@@ -185,6 +354,23 @@ class MeasurementRequest(RequestGenerator):
     url = "/api/v2/measurements/"
     id_filter = "id__in"
     object_class = Measurement
+    columns = (
+        Column("id", "id", "int"),
+        Column("type", lambda m: get_name(m.get("type")), "category"),
+        Column("af", "af", "int"),
+        Column("status", get_status_name, "category"),
+        Column("target", "target", "string"),
+        Column("target_ip", "target_ip", "string"),
+        Column("target_asn", "target_asn", "int"),
+        Column("description", "description", "string"),
+        Column("interval", "interval", "int"),
+        Column("is_oneoff", "is_oneoff", "bool"),
+        Column("is_public", "is_public", "bool"),
+        Column("participant_count", "participant_count", "int"),
+        Column("creation_time", "creation_time", "timestamp"),
+        Column("start_time", "start_time", "timestamp"),
+        Column("stop_time", "stop_time", "timestamp"),
+    )
 
 
 class AnchorRequest(RequestGenerator):
@@ -197,6 +383,18 @@ class AnchorRequest(RequestGenerator):
     url = "/api/v2/anchors/"
     id_filter = "id__in"
     object_class = None
+    columns = (
+        Column("id", "id", "int"),
+        Column("probe", "probe", "int"),
+        Column("fqdn", "fqdn", "string"),
+        Column("country", "country", "category"),
+        Column("city", "city", "string"),
+        Column("ip_v4", "ip_v4", "string"),
+        Column("as_v4", "as_v4", "int"),
+        Column("ip_v6", "ip_v6", "string"),
+        Column("as_v6", "as_v6", "int"),
+        Column("is_ipv4_only", "is_ipv4_only", "bool"),
+    )
 
     def __init__(self, *args, **kwargs):
         super(AnchorRequest, self).__init__(*args, **kwargs)
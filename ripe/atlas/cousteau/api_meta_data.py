@@ -12,31 +12,96 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from datetime import datetime
-from dateutil.tz import tzutc
-
+from . import timestamps
 from .request import AtlasRequest
 from .exceptions import CousteauGenericError, APIResponseError
 
 
+class LazyAttribute(object):
+    """
+    Descriptor computing an entity attribute from its raw meta data when it
+    is read, instead of copying every field to the instance on creation.
+    Assigned values are kept aside and take precedence over the meta data.
+    If cache is set the computed value is kept after the first read.
+    """
+
+    def __init__(self, getter, cache=False):
+        self.getter = getter
+        self.cache = cache
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        overrides = instance._overrides
+        if overrides is not None and self.name in overrides:
+            return overrides[self.name]
+
+        value = self.getter(instance)
+        if self.cache:
+            self.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value):
+        if instance._overrides is None:
+            instance._overrides = {}
+        instance._overrides[self.name] = value
+
+
+def meta_field(key, subkey=None):
+    """Lazy attribute reading meta_data[key], or meta_data[key][subkey]."""
+    def getter(entity):
+        value = entity.meta_data.get(key)
+        if subkey is not None:
+            value = value.get(subkey) if isinstance(value, dict) else None
+        return value
+
+    return LazyAttribute(getter)
+
+
+def meta_time_field(key):
+    """Lazy attribute turning the UNIX timestamp in meta_data[key] to datetime."""
+    def getter(entity):
+        timestamp = entity.meta_data.get(key)
+        if not timestamp:
+            return None
+        return timestamps.to_datetime(timestamp)
+
+    return LazyAttribute(getter, cache=True)
+
+
 class EntityRepresentation(object):
     """
     A crude representation of entity's meta data as we get it from the API.
+    Attributes are read lazily from the meta data, see LazyAttribute.
     """
 
+    __slots__ = (
+        "id", "server", "verify", "api_key", "meta_data", "_user_agent",
+        "transport", "client", "_fields", "_optional_fields", "get_params",
+        "_overrides",
+    )
+
     API_META_URL = ""
 
     def __init__(self, **kwargs):
 
+        self._overrides = None
         self.id = kwargs.get("id")
         self.server = kwargs.get("server")
-        self.verify = kwargs.get("verify", True)
-        self.api_key = kwargs.get("key", "")
+        self.verify = kwargs.get("verify")
+        self.api_key = kwargs.get("key")
         self.meta_data = kwargs.get("meta_data")
         self._user_agent = kwargs.get("user_agent")
+        self.transport = kwargs.get("transport")
+        self.client = kwargs.get("client")
         self._fields = kwargs.get("fields")
         self._optional_fields = kwargs.get("optional_fields")
-        self.get_params = {}
+        self.get_params = None
 
         if self.meta_data is None and self.id is None:
             raise CousteauGenericError(
@@ -54,6 +119,9 @@ class EntityRepresentation(object):
 
     def update_get_params(self):
         """Update HTTP GET params with the given fields that user wants to fetch."""
+        if self.get_params is None:
+            self.get_params = {}
+
         if isinstance(self._fields, (tuple, list)):  # tuples & lists > x,y,z
             self.get_params["fields"] = ",".join([str(_) for _ in self._fields])
         elif isinstance(self._fields, str):
@@ -71,8 +139,10 @@ class EntityRepresentation(object):
             key=self.api_key,
             server=self.server,
             verify=self.verify,
-            user_agent=self._user_agent
-        ).get(**self.get_params)
+            user_agent=self._user_agent,
+            transport=self.transport,
+            client=self.client
+        ).get(**(self.get_params or {}))
 
         self.meta_data = meta_data
         if not is_success:
@@ -91,25 +161,28 @@ class Probe(EntityRepresentation):
     """
     A crude representation of probe's meta data as we get it from the API.
     """
+    __slots__ = ()
+
     API_META_URL = "/api/v2/probes/{0}/"
 
+    is_anchor = meta_field("is_anchor")
+    country_code = meta_field("country_code")
+    description = meta_field("description")
+    is_public = meta_field("is_public")
+    asn_v4 = meta_field("asn_v4")
+    asn_v6 = meta_field("asn_v6")
+    address_v4 = meta_field("address_v4")
+    address_v6 = meta_field("address_v6")
+    prefix_v4 = meta_field("prefix_v4")
+    prefix_v6 = meta_field("prefix_v6")
+    geometry = meta_field("geometry")
+    tags = meta_field("tags")
+    status = meta_field("status", "name")
+
     def _populate_data(self):
-        """Assing some probe's raw meta data from API response to instance properties"""
+        """Take probe's id from the raw meta data, other attributes are lazy"""
         if self.id is None:
             self.id = self.meta_data.get("id")
-        self.is_anchor = self.meta_data.get("is_anchor")
-        self.country_code = self.meta_data.get("country_code")
-        self.description = self.meta_data.get("description")
-        self.is_public = self.meta_data.get("is_public")
-        self.asn_v4 = self.meta_data.get("asn_v4")
-        self.asn_v6 = self.meta_data.get("asn_v6")
-        self.address_v4 = self.meta_data.get("address_v4")
-        self.address_v6 = self.meta_data.get("address_v6")
-        self.prefix_v4 = self.meta_data.get("prefix_v4")
-        self.prefix_v6 = self.meta_data.get("prefix_v6")
-        self.geometry = self.meta_data.get("geometry")
-        self.tags = self.meta_data.get("tags")
-        self.status = self.meta_data.get("status", {}).get("name")
 
     def __str__(self):
         return "Probe #{0}".format(self.id)
@@ -122,31 +195,32 @@ class Measurement(EntityRepresentation):
     """
     A crude representation of measurement's meta data as we get it from the API.
     """
+    __slots__ = ()
+
     API_META_URL = "/api/v2/measurements/{0}/"
 
+    stop_time = meta_time_field("stop_time")
+    creation_time = meta_time_field("creation_time")
+    start_time = meta_time_field("start_time")
+    protocol = meta_field("af")
+    target_ip = meta_field("target_ip")
+    target_asn = meta_field("target_asn")
+    target = meta_field("target")
+    description = meta_field("description")
+    is_oneoff = meta_field("is_oneoff")
+    is_public = meta_field("is_public")
+    interval = meta_field("interval")
+    resolve_on_probe = meta_field("resolve_on_probe")
+    status_id = meta_field("status", "id")
+    status = meta_field("status", "name")
+    type = LazyAttribute(lambda measurement: measurement.get_type())
+    result_url = meta_field("result")
+
     def _populate_data(self):
-        """Assinging some measurement's raw meta data from API response to instance properties"""
+        """Take measurement's id from the raw meta data, other attributes are lazy"""
         if self.id is None:
             self.id = self.meta_data.get("id")
 
-        self.stop_time = None
-        self.creation_time = None
-        self.start_time = None
-        self.populate_times()
-        self.protocol = self.meta_data.get("af")
-        self.target_ip = self.meta_data.get("target_ip")
-        self.target_asn = self.meta_data.get("target_asn")
-        self.target = self.meta_data.get("target")
-        self.description = self.meta_data.get("description")
-        self.is_oneoff = self.meta_data.get("is_oneoff")
-        self.is_public = self.meta_data.get("is_public")
-        self.interval = self.meta_data.get("interval")
-        self.resolve_on_probe = self.meta_data.get("resolve_on_probe")
-        self.status_id = self.meta_data.get("status", {}).get("id")
-        self.status = self.meta_data.get("status", {}).get("name")
-        self.type = self.get_type()
-        self.result_url = self.meta_data.get("result")
-
     def get_type(self):
         """
         Getting type of measurement keeping backwards compatibility for
@@ -166,23 +240,10 @@ class Measurement(EntityRepresentation):
 
     def populate_times(self):
         """
-        Populates all different meta data times that comes with measurement if
-        they are present.
+        Converts all different meta data times that comes with measurement
+        at once. Times are otherwise converted when first accessed.
         """
-        stop_time = self.meta_data.get("stop_time")
-        if stop_time:
-            stop_naive = datetime.utcfromtimestamp(stop_time)
-            self.stop_time = stop_naive.replace(tzinfo=tzutc())
-
-        creation_time = self.meta_data.get("creation_time")
-        if creation_time:
-            creation_naive = datetime.utcfromtimestamp(creation_time)
-            self.creation_time = creation_naive.replace(tzinfo=tzutc())
-
-        start_time = self.meta_data.get("start_time")
-        if start_time:
-            start_naive = datetime.utcfromtimestamp(start_time)
-            self.start_time = start_naive.replace(tzinfo=tzutc())
+        return self.stop_time, self.creation_time, self.start_time
 
     def __str__(self):
         return "Measurement #{0}".format(self.id)
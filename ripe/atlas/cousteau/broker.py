@@ -0,0 +1,398 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a local broker sharing one AtlasStream connection between
+processes. The broker owns the WebSocket and forwards the raw messages over
+a Unix socket to every subscriber whose filter matches, so the subscriptions
+are made and the messages received upstream only once. Messages are only
+decoded by the broker if a subscriber filters on payload fields.
+
+Every frame sent to subscribers is the raw JSON message prefixed by its
+length as a 4 bytes big endian integer. Subscribers start by sending their
+filter as one line of JSON: {"events": [...], "match": {field: [...]}}.
+"""
+
+import json
+import logging
+import os
+import select
+import selectors
+import socket
+import stat
+import struct
+import time
+
+import websocket
+
+from .exceptions import CousteauGenericError
+from .stream import message_size
+
+LOG = logging.getLogger("atlas-stream")
+
+LENGTH = struct.Struct("!I")
+
+
+def event_name_of(message):
+    """Return the event name of a raw stream message without decoding it."""
+    if message.startswith('["'):
+        return message[2:message.index('"', 2)]
+    return json.loads(message)[0]
+
+
+class BrokerClient(object):
+    """A subscriber connected to the broker, with its filter and backlog."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.events = None
+        self.match = None
+        self.ready = False
+        self.received = b""
+        self.backlog = bytearray()
+
+    def read_filter(self, data):
+        """Read the filter line, return True once it is complete."""
+        self.received += data
+        if b"\n" not in self.received:
+            return False
+        line = self.received.split(b"\n", 1)[0]
+        options = json.loads(line) if line.strip() else {}
+        events = options.get("events")
+        self.events = set(events) if events else None
+        self.match = {
+            field: set(values)
+            for field, values in (options.get("match") or {}).items()
+        }
+        self.ready = True
+        return True
+
+    def wants(self, event_name, payload):
+        if self.events is not None and event_name not in self.events:
+            return False
+        if not self.match:
+            return True
+        payload = payload()
+        if not isinstance(payload, dict):
+            return False
+        for field, values in self.match.items():
+            if payload.get(field) not in values:
+                return False
+        return True
+
+
+class StreamBroker(object):
+    """
+    Shares the subscriptions of an AtlasStream with the StreamSubscriber of
+    other processes through a Unix socket at path. A subscriber whose
+    backlog grows over max_backlog bytes is disconnected instead of making
+    the broker, and every other subscriber, fall behind.
+    Usage:
+        stream = AtlasStream()
+        stream.connect()
+        stream.subscribe("result", msm=1001)
+        with StreamBroker(stream, "/run/atlas-stream.sock") as broker:
+            broker.serve()
+    """
+
+    def __init__(self, stream, path, max_backlog=16 << 20):
+        self.stream = stream
+        self.path = path
+        self.max_backlog = max_backlog
+        self.clients = {}
+        self.messages = 0
+        self.dropped = 0
+        self.selector = selectors.DefaultSelector()
+
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise CousteauGenericError(
+                    "{0} exists and is not a socket".format(path)
+                )
+            os.unlink(path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(path)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ, "accept")
+        self.registered_ws = None
+
+    def register_stream(self):
+        """Watch the stream WebSocket, which changes on reconnections."""
+        if self.registered_ws is self.stream.ws:
+            return
+        if self.registered_ws is not None:
+            self.selector.unregister(self.registered_ws)
+        self.selector.register(self.stream.ws, selectors.EVENT_READ, "stream")
+        self.registered_ws = self.stream.ws
+
+    def accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = BrokerClient(sock)
+        self.clients[sock] = client
+        self.selector.register(sock, selectors.EVENT_READ, "client")
+
+    def drop(self, client):
+        self.selector.unregister(client.sock)
+        client.sock.close()
+        del self.clients[client.sock]
+
+    def read_client(self, client):
+        try:
+            data = client.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            return self.drop(client)
+        if not client.ready:
+            try:
+                client.read_filter(data)
+            except (ValueError, AttributeError, TypeError) as exc:
+                LOG.warning(f"Dropping subscriber with invalid filter: {exc}")
+                self.drop(client)
+
+    def flush(self, client):
+        """Send as much of the backlog of a subscriber as it accepts."""
+        try:
+            sent = client.sock.send(client.backlog)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            return self.drop(client)
+        del client.backlog[:sent]
+        events = selectors.EVENT_READ
+        if client.backlog:
+            events |= selectors.EVENT_WRITE
+        self.selector.modify(client.sock, events, "client")
+
+    def publish(self, message):
+        """Forward a raw stream message to the matching subscribers."""
+        self.messages += 1
+        event_name = event_name_of(message)
+        decoded = []
+
+        def payload():
+            if not decoded:
+                decoded.append(json.loads(message)[1])
+            return decoded[0]
+
+        frame = None
+        for client in list(self.clients.values()):
+            if not client.ready or not client.wants(event_name, payload):
+                continue
+            if frame is None:
+                data = message.encode("utf-8")
+                frame = LENGTH.pack(len(data)) + data
+            if len(client.backlog) + len(frame) > self.max_backlog:
+                LOG.warning("Dropping subscriber falling behind the stream")
+                self.dropped += 1
+                self.drop(client)
+                continue
+            was_empty = not client.backlog
+            client.backlog += frame
+            if was_empty:
+                self.flush(client)
+
+        stats = self.stream.stats
+        if stats is not None:
+            size = len(data) if frame is not None else message_size(message)
+            stats.record_message(
+                event_name, size, 0.0, decoded[0] if decoded else None
+            )
+
+    def receive(self):
+        """Publish the messages waiting on the stream WebSocket."""
+        ws = self.stream.ws
+        try:
+            self.publish(self.stream.recv_raw(ws))
+            # Messages already decrypted by SSL don't wake select() up
+            pending = getattr(ws.sock, "pending", None)
+            while pending is not None and pending():
+                self.publish(self.stream.recv_raw(ws))
+        except (websocket.WebSocketException, OSError) as exc:
+            # Resets and socket timeouts are OSErrors, not WebSocketExceptions
+            LOG.error(f"{exc} while reading from RIPE Atlas stream")
+            self.selector.unregister(self.registered_ws)
+            self.registered_ws = None
+            ws.close()
+            self.stream.ws = None
+            self.stream.connect()
+
+    def serve(self, seconds=None):
+        """Forward the stream for `seconds` if specified, or else forever."""
+        t0 = time.perf_counter()
+        while True:
+            self.register_stream()
+            timeout = None
+            if seconds is not None:
+                timeout = seconds - (time.perf_counter() - t0)
+                if timeout < 0:
+                    break
+            stats = self.stream.stats
+            if stats is not None:
+                # Wake up for the stats snapshot even if nothing arrives
+                stats.tick()
+                stats_timeout = stats.seconds_left()
+                timeout = stats_timeout if timeout is None else \
+                    min(timeout, stats_timeout)
+            for key, events in self.selector.select(timeout):
+                if key.data == "accept":
+                    self.accept()
+                elif key.data == "stream":
+                    self.receive()
+                else:
+                    client = self.clients.get(key.fileobj)
+                    if client is not None and events & selectors.EVENT_READ:
+                        self.read_client(client)
+                    client = self.clients.get(key.fileobj)
+                    if client is not None and events & selectors.EVENT_WRITE:
+                        self.flush(client)
+
+    def close(self):
+        for client in list(self.clients.values()):
+            self.drop(client)
+        self.selector.close()
+        self.listener.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StreamSubscriber(object):
+    """
+    Receives the messages of a StreamBroker, with the same iter(), bind()
+    and timeout() interface as AtlasStream. Only the events in events, and
+    if match is given the results whose fields have one of the given values,
+    are received.
+    Usage:
+        subscriber = StreamSubscriber(
+            "/run/atlas-stream.sock", events=["atlas_result"],
+            match={"prb_id": [1, 2, 3]},
+        )
+        subscriber.connect()
+        subscriber.bind("atlas_result", on_result_response)
+        subscriber.timeout()
+    """
+
+    def __init__(self, path, events=None, match=None):
+        self.path = path
+        self.events = events
+        self.match = match
+        self.callbacks = {}
+        self.sock = None
+        self.buffer = bytearray()
+
+    def connect(self):
+        """Connect to the broker, waiting for it to be started."""
+        while self.sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError as exc:
+                sock.close()
+                LOG.debug(f"{exc} while connecting to the stream broker")
+                time.sleep(1)
+                continue
+            options = {"events": self.events, "match": self.match}
+            sock.sendall(json.dumps(options).encode("utf-8") + b"\n")
+            self.sock = sock
+            self.buffer = bytearray()
+
+    def disconnect(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.callbacks = {}
+
+    def bind(self, channel, callback):
+        self.callbacks[channel] = callback
+
+    def unbind(self, channel):
+        self.callbacks.pop(channel, None)
+
+    def next_frame(self):
+        """Pop the next complete message from the buffer, None if there isn't any."""
+        if len(self.buffer) < LENGTH.size:
+            return None
+        length, = LENGTH.unpack_from(self.buffer)
+        end = LENGTH.size + length
+        if len(self.buffer) < end:
+            return None
+        message = bytes(self.buffer[LENGTH.size:end])
+        del self.buffer[:end]
+        return message
+
+    def recv(self):
+        """Receive a single (event_name, payload) message from the broker."""
+        message = self.next_frame()
+        while message is None:
+            data = self.sock.recv(1 << 20)
+            if not data:
+                raise ConnectionError("Stream broker closed the connection")
+            self.buffer += data
+            message = self.next_frame()
+        event_name, payload = json.loads(message)
+        return event_name, payload
+
+    def has_frame(self):
+        if len(self.buffer) < LENGTH.size:
+            return False
+        return len(self.buffer) >= LENGTH.size + LENGTH.unpack_from(self.buffer)[0]
+
+    def iter(self, seconds=None):
+        """Yield incoming events for `seconds` if specified, or else forever."""
+        t0 = time.perf_counter()
+        while True:
+            if seconds is not None and not self.has_frame():
+                remaining = seconds - (time.perf_counter() - t0)
+                if remaining < 0:
+                    break
+                rlist, _, _ = select.select([self.sock], [], [], remaining)
+                if not rlist:
+                    break
+            try:
+                yield self.recv()
+            except (ConnectionError, OSError) as exc:
+                LOG.error(f"{exc} while reading from the stream broker")
+                self.sock.close()
+                self.sock = None
+                self.connect()
+
+    def timeout(self, seconds=None):
+        """
+        Process events for `seconds` if specified, or else forever, calling
+        a bound callback for each event if one is defined.
+        """
+        for event_name, payload in self.iter(seconds=seconds):
+            callback = self.callbacks.get(event_name)
+            if callback:
+                callback(payload)
+
+    def __iter__(self):
+        return self.iter()
+
+
+__all__ = ["StreamBroker", "StreamSubscriber"]
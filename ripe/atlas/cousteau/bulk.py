@@ -0,0 +1,379 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing helpers to act on many measurements at once: a rate
+limiter that requests can share, a bulk creator splitting measurement
+definitions into batches sent concurrently, and concurrent stop, change and
+tag operations reporting the outcome of every measurement.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .exceptions import CousteauGenericError
+from .measurement import MalFormattedMeasurement
+from .measurement_tagging import (
+    MeasurementTagAddRequest,
+    MeasurementTagRemoveRequest,
+)
+from .request import AtlasCreateRequest, AtlasChangeRequest, AtlasStopRequest
+from .transport import RequestsTransport
+
+LOG = logging.getLogger(__name__)
+
+# Number of definitions sent in one creation request by default.
+MAX_DEFINITIONS = 100
+
+
+class RateLimiter(object):
+    """
+    Token bucket allowing rate requests per second on average and bursts of
+    up to burst requests. Can be shared between threads and given to any
+    request, or to an AtlasClient, as limiter.
+    Usage:
+        limiter = RateLimiter(rate=2)
+        client = AtlasClient(key="api_key", limiter=limiter)
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a request can be sent."""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            self.sleep(wait)
+
+
+class BulkCreateResult(object):
+    """
+    Outcome of a bulk creation. measurements lists a (measurement, msm_id,
+    error) tuple for every measurement given, in order, where msm_id is None
+    if it was not created. errors lists an (index, measurements, error)
+    tuple for every batch that failed. inconsistent lists an (index,
+    measurements, msm_ids) tuple for every batch the API accepted but
+    returned a different number of ids for: the ids are given to its
+    measurements in order and the others have neither an id nor an error,
+    as they may have been created too.
+    """
+
+    def __init__(self, measurements):
+        self.measurements = [[msm, None, None] for msm in measurements]
+        self.errors = []
+        self.inconsistent = []
+
+    @property
+    def msm_ids(self):
+        """Ids of the created measurements, in the order they were given."""
+        return [msm_id for _, msm_id, _ in self.measurements if msm_id is not None]
+
+    @property
+    def failed(self):
+        """The (measurement, error) pairs of measurements not created."""
+        return [
+            (msm, error) for msm, msm_id, error in self.measurements
+            if error is not None
+        ]
+
+    @property
+    def is_success(self):
+        return not self.failed
+
+
+class BulkCreator(object):
+    """
+    Creates any number of measurements sharing the same sources by splitting
+    them into requests of at most batch_size definitions, sent by up to
+    max_workers threads. If rate is given, no more than rate requests per
+    second are sent. Measurements failing validation are reported without
+    being sent. Other keyword arguments (key, client, server...) are given to
+    every AtlasCreateRequest.
+    Usage:
+        creator = BulkCreator(key="api_key", rate=1)
+        result = creator.create(
+            measurements=[Ping(af=4, target=t, description=t) for t in targets],
+            sources=[AtlasSource(type="area", value="WW", requested=5)],
+            is_oneoff=True,
+        )
+        for msm, msm_id, error in result.measurements:
+            print(msm.target, msm_id or error)
+    """
+
+    def __init__(self, batch_size=MAX_DEFINITIONS, max_workers=4, rate=None,
+                 limiter=None, **request_kwargs):
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.limiter = limiter
+        if self.limiter is None and rate:
+            self.limiter = RateLimiter(rate)
+        self.request_kwargs = request_kwargs
+
+    def split(self, measurements):
+        """Return the measurements in lists of at most batch_size."""
+        return [
+            measurements[i:i + self.batch_size]
+            for i in range(0, len(measurements), self.batch_size)
+        ]
+
+    def create_batch(self, measurements, sources, **kwargs):
+        """Send one creation request and return (is_success, response)."""
+        kwargs = dict(self.request_kwargs, **kwargs)
+        if self.limiter is not None:
+            kwargs["limiter"] = self.limiter
+        request = AtlasCreateRequest(
+            measurements=measurements, sources=sources, **kwargs
+        )
+        return request.create()
+
+    def create(self, measurements, sources, **kwargs):
+        """
+        Create the measurements with the given sources. Other keyword
+        arguments (start_time, is_oneoff, bill_to...) are the ones of
+        AtlasCreateRequest. Returns a BulkCreateResult.
+        """
+        conflicts = sorted(set(kwargs) & set(self.request_kwargs))
+        if conflicts:
+            raise CousteauGenericError(
+                "Options given to both BulkCreator and create(): {0}".format(
+                    ", ".join(conflicts)
+                )
+            )
+        result = BulkCreateResult(measurements)
+
+        valid = []
+        for position, msm in enumerate(measurements):
+            try:
+                msm.build_api_struct()
+            except MalFormattedMeasurement as exc:
+                result.measurements[position][2] = exc
+                continue
+            valid.append(position)
+
+        batches = self.split(valid)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.create_batch,
+                    [measurements[position] for position in batch],
+                    sources,
+                    **kwargs
+                )
+                for batch in batches
+            ]
+
+            for index, (batch, future) in enumerate(zip(batches, futures)):
+                try:
+                    is_success, response = future.result()
+                except Exception as exc:
+                    is_success, response = False, exc
+
+                msm_ids = None
+                if is_success and isinstance(response, dict):
+                    msm_ids = response.get("measurements")
+                if msm_ids is None:
+                    error = response
+                    result.errors.append(
+                        (index, [measurements[position] for position in batch], error)
+                    )
+                    for position in batch:
+                        result.measurements[position][2] = error
+                    continue
+
+                if len(msm_ids) != len(batch):
+                    # Created anyway, retrying the batch would duplicate it
+                    LOG.warning(
+                        f"Batch {index} of {len(batch)} measurements was "
+                        f"created with {len(msm_ids)} ids"
+                    )
+                    result.inconsistent.append((
+                        index, [measurements[position] for position in batch],
+                        msm_ids
+                    ))
+                for position, msm_id in zip(batch, msm_ids):
+                    result.measurements[position][1] = msm_id
+
+        result.measurements = [tuple(item) for item in result.measurements]
+        return result
+
+
+def create_many(measurements, sources, batch_size=MAX_DEFINITIONS,
+                max_workers=4, rate=None, **kwargs):
+    """
+    Shortcut for BulkCreator(...).create(measurements, sources, ...).
+    Request options (key, client...) and creation options (start_time,
+    is_oneoff...) can both be given as keyword arguments.
+    """
+    create_options = {
+        option: kwargs.pop(option)
+        for option in ("start_time", "stop_time", "is_oneoff", "bill_to")
+        if option in kwargs
+    }
+    creator = BulkCreator(
+        batch_size=batch_size, max_workers=max_workers, rate=rate, **kwargs
+    )
+    return creator.create(measurements, sources, **create_options)
+
+
+class BulkResult(object):
+    """
+    Outcome of a bulk operation: items lists an (item, is_success, response)
+    tuple for every item given, in order. Exceptions raised while handling
+    an item are reported as its response.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def succeeded(self):
+        return [item for item, is_success, _ in self.items if is_success]
+
+    @property
+    def failed(self):
+        """The (item, response) pairs of the items that failed."""
+        return [
+            (item, response) for item, is_success, response in self.items
+            if not is_success
+        ]
+
+    @property
+    def is_success(self):
+        return all(is_success for _, is_success, _ in self.items)
+
+
+def pooled_transport(max_workers):
+    """
+    Return a RequestsTransport whose session keeps up to max_workers
+    connections alive, to be shared by as many threads.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=max_workers
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(session=session)
+
+
+def run_many(operation, items, max_workers=8, rate=None, limiter=None,
+             **request_kwargs):
+    """
+    Call operation(item, **request_kwargs) for every item from a pool of
+    max_workers threads and return a BulkResult. Unless a client or a
+    transport is given, all the requests share one session with a
+    connection per worker. If rate is given, no more than rate requests per
+    second are sent.
+    """
+    if limiter is None and rate:
+        limiter = RateLimiter(rate)
+    if limiter is not None:
+        request_kwargs["limiter"] = limiter
+
+    transport = None
+    if request_kwargs.get("client") is None and request_kwargs.get("transport") is None:
+        transport = pooled_transport(max_workers)
+        request_kwargs["transport"] = transport
+
+    def run(item):
+        try:
+            is_success, response = operation(item, **request_kwargs)
+        except Exception as exc:
+            is_success, response = False, exc
+        return item, is_success, response
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return BulkResult(list(executor.map(run, items)))
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+def stop_one(msm_id, **kwargs):
+    return AtlasStopRequest(msm_id=msm_id, **kwargs).create()
+
+
+def change_one(change, **kwargs):
+    msm_id, sources = change
+    return AtlasChangeRequest(msm_id=msm_id, sources=sources, **kwargs).create()
+
+
+def stop_many(msm_ids, max_workers=8, rate=None, **kwargs):
+    """
+    Stop the given measurements concurrently, see run_many. Returns a
+    BulkResult with one item per measurement id.
+    Usage:
+        result = stop_many(stale_ids, key=ATLAS_API_KEY, rate=5)
+        for msm_id, response in result.failed:
+            print(msm_id, response)
+    """
+    return run_many(stop_one, msm_ids, max_workers=max_workers, rate=rate, **kwargs)
+
+
+def change_many(changes, max_workers=8, rate=None, **kwargs):
+    """
+    Change the probes of many measurements concurrently. changes maps
+    measurement ids to lists of AtlasChangeSource, or is an iterable of
+    (msm_id, sources) pairs. Returns a BulkResult with (msm_id, sources)
+    items.
+    """
+    if isinstance(changes, dict):
+        changes = changes.items()
+    return run_many(
+        change_one, list(changes), max_workers=max_workers, rate=rate, **kwargs
+    )
+
+
+def tag_many(msm_ids, tag, remove=False, max_workers=8, rate=None, **kwargs):
+    """
+    Add the tag to the given measurements concurrently, or remove it if
+    remove is True. Returns a BulkResult with one item per measurement id.
+    """
+    request_class = MeasurementTagRemoveRequest if remove else MeasurementTagAddRequest
+
+    def tag_one(msm_id, **request_kwargs):
+        return request_class(msm_id=msm_id, tag=tag, **request_kwargs).create()
+
+    return run_many(tag_one, msm_ids, max_workers=max_workers, rate=rate, **kwargs)
+
+
+__all__ = [
+    "BulkCreator",
+    "BulkCreateResult",
+    "BulkResult",
+    "RateLimiter",
+    "create_many",
+    "stop_many",
+    "change_many",
+    "tag_many",
+]
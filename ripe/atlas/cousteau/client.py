@@ -0,0 +1,190 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing the client object that keeps the configuration shared by
+many requests to the ATLAS API.
+"""
+
+import requests
+
+from .request import (
+    AtlasRequest,
+    AtlasCreateRequest,
+    AtlasChangeRequest,
+    AtlasStopRequest,
+    AtlasLatestRequest,
+    AtlasResultsRequest,
+    build_headers,
+    get_default_user_agent,
+)
+from .api_listing import ProbeRequest, MeasurementRequest, AnchorRequest
+from .api_meta_data import Probe, Measurement
+from .measurement_tagging import MeasurementTagger
+from .transport import RequestsTransport
+from .bulk import create_many, stop_many, change_many, tag_many
+from .fetcher import results_many
+
+
+class AtlasClient(object):
+    """
+    Keeps the API key, server, headers and HTTP transport once and hands them
+    to every request created from it. By default requests go through a shared
+    requests session so connections are reused.
+    Usage:
+        from ripe.atlas.cousteau import AtlasClient
+        client = AtlasClient(key="api_key")
+        for probe in client.probes(country_code="NL"):
+            print(probe["id"])
+        is_success, results = client.results(msm_id=1001)
+    """
+
+    def __init__(self, key=None, server=None, verify=True, proxies=None,
+                 headers=None, user_agent=None, transport=None, limiter=None):
+        self.key = key
+        self.server = server or "atlas.ripe.net"
+        self.verify = verify
+        self.proxies = proxies or {}
+        self.headers = headers
+        self.http_agent = user_agent or get_default_user_agent()
+        self.transport = transport or RequestsTransport(session=requests.Session())
+        self.limiter = limiter
+        self.http_headers = build_headers(self.http_agent, self.key, self.headers)
+
+        self.defaults = {
+            "key": self.key,
+            "server": self.server,
+            "verify": self.verify,
+            "proxies": self.proxies,
+            "headers": self.headers,
+            "user_agent": self.http_agent,
+            "transport": self.transport,
+            "limiter": self.limiter,
+        }
+
+    def get_request_kwargs(self, **kwargs):
+        """
+        Return the given request arguments completed with the client's
+        configuration for every argument that was not set.
+        """
+        for option, value in self.defaults.items():
+            if kwargs.get(option) is None:
+                kwargs[option] = value
+        return kwargs
+
+    def get_headers(self, key, headers, http_agent):
+        """
+        Return a copy of the prebuilt headers if the given request options
+        match the client's ones, otherwise None.
+        """
+        if key == self.key and headers == self.headers and \
+                http_agent == self.http_agent:
+            return dict(self.http_headers)
+        return None
+
+    def request(self, request_class=AtlasRequest, **kwargs):
+        """Create a request of the given class bound to this client."""
+        return request_class(client=self, **kwargs)
+
+    def get(self, url_path, **url_params):
+        """Makes an HTTP GET to the given url path."""
+        return self.request(url_path=url_path).get(**url_params)
+
+    def create(self, **kwargs):
+        """Creates new measurements, see AtlasCreateRequest."""
+        return self.request(AtlasCreateRequest, **kwargs).create()
+
+    def create_many(self, measurements, sources, **kwargs):
+        """
+        Creates any number of measurements in concurrent batches, see
+        bulk.create_many.
+        """
+        return create_many(measurements, sources, client=self, **kwargs)
+
+    def change(self, **kwargs):
+        """Changes the probes of a measurement, see AtlasChangeRequest."""
+        return self.request(AtlasChangeRequest, **kwargs).create()
+
+    def stop(self, msm_id, **kwargs):
+        """Stops the given measurement."""
+        return self.request(AtlasStopRequest, msm_id=msm_id, **kwargs).create()
+
+    def stop_many(self, msm_ids, **kwargs):
+        """Stops many measurements concurrently, see bulk.stop_many."""
+        return stop_many(msm_ids, client=self, **kwargs)
+
+    def change_many(self, changes, **kwargs):
+        """Changes the probes of many measurements, see bulk.change_many."""
+        return change_many(changes, client=self, **kwargs)
+
+    def tag_many(self, msm_ids, tag, **kwargs):
+        """Adds or removes a tag on many measurements, see bulk.tag_many."""
+        return tag_many(msm_ids, tag, client=self, **kwargs)
+
+    def results(self, **kwargs):
+        """Fetches results of a measurement, see AtlasResultsRequest."""
+        return self.request(AtlasResultsRequest, **kwargs).create()
+
+    def results_many(self, measurements, **kwargs):
+        """
+        Streams the results of many measurements concurrently, see
+        fetcher.MultiResultsFetcher.
+        """
+        return results_many(measurements, client=self, **kwargs)
+
+    def latest(self, msm_id, probe_ids=(), **kwargs):
+        """Fetches latest results of a measurement, see AtlasLatestRequest."""
+        return self.request(
+            AtlasLatestRequest, msm_id=msm_id, probe_ids=probe_ids, **kwargs
+        ).create()
+
+    def probes(self, **filters):
+        """Returns a ProbeRequest generator for the given filters."""
+        return ProbeRequest(client=self, **filters)
+
+    def measurements(self, **filters):
+        """Returns a MeasurementRequest generator for the given filters."""
+        return MeasurementRequest(client=self, **filters)
+
+    def anchors(self, **filters):
+        """Returns an AnchorRequest generator for the given filters."""
+        return AnchorRequest(client=self, **filters)
+
+    def probe(self, id=None, **kwargs):
+        """Returns a Probe object for the given id or meta data."""
+        return Probe(id=id, client=self, **kwargs)
+
+    def measurement(self, id=None, **kwargs):
+        """Returns a Measurement object for the given id or meta data."""
+        return Measurement(id=id, client=self, **kwargs)
+
+    def tagger(self, **kwargs):
+        """Returns a MeasurementTagger using this client."""
+        return MeasurementTagger(client=self, **kwargs)
+
+    def close(self):
+        """Closes the connections kept by the transport."""
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["AtlasClient"]
@@ -0,0 +1,260 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing helpers that turn pages of API objects into typed NumPy
+columns, Arrow tables or pandas DataFrames. numpy, pyarrow and pandas are
+optional dependencies and only imported when needed.
+"""
+
+import json
+from collections import namedtuple
+
+from .exceptions import CousteauGenericError
+
+# A column is taken from each object by getter, which can be a key, a tuple
+# of keys/indexes into nested objects or a callable. Kinds are:
+# int, float, bool, timestamp (UNIX seconds), category, string, float_list,
+# string_list and json (any value, stored serialised as a JSON string).
+Column = namedtuple("Column", ["name", "getter", "kind"])
+
+COLUMN_KINDS = (
+    "int", "float", "bool", "timestamp", "category", "string",
+    "float_list", "string_list", "json",
+)
+
+# NumPy types of the column kinds, other kinds are kept in object arrays.
+NUMPY_DTYPES = {
+    "int": "int64",
+    "float": "float64",
+    "bool": "bool",
+    "timestamp": "datetime64[s]",
+}
+
+
+def get_value(obj, getter):
+    """Return the value the getter points to in obj, None if it is missing."""
+    if callable(getter):
+        return getter(obj)
+    if not isinstance(getter, tuple):
+        return obj.get(getter)
+
+    value = obj
+    for key in getter:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
+
+
+def get_name(value):
+    """Return the name of a {"id": .., "name": ..} value or the value itself."""
+    if isinstance(value, dict):
+        return value.get("name")
+    return value
+
+
+def get_status_name(obj):
+    """Return the status name of a probe or measurement in any API format."""
+    status = obj.get("status")
+    if isinstance(status, dict):
+        return status.get("name")
+    return obj.get("status_name")
+
+
+def select_columns(default_columns, fields=None):
+    """
+    Return the columns to build. fields can contain names of the default
+    columns or Column definitions.
+    """
+    if fields is None:
+        return list(default_columns)
+
+    by_name = {column.name: column for column in default_columns}
+    columns = []
+    for field in fields:
+        if isinstance(field, Column):
+            columns.append(field)
+        elif field in by_name:
+            columns.append(by_name[field])
+        else:
+            raise CousteauGenericError("Unknown column: {0}".format(field))
+
+        if columns[-1].kind not in COLUMN_KINDS:
+            raise CousteauGenericError(
+                "Unknown column kind: {0}".format(columns[-1].kind)
+            )
+    return columns
+
+
+def batch_to_columns(batch, columns):
+    """Return the values of the given columns for a batch of objects."""
+    values = {}
+    for column in columns:
+        column_values = [get_value(obj, column.getter) for obj in batch]
+        if column.kind == "json":
+            column_values = [
+                None if value is None else json.dumps(value)
+                for value in column_values
+            ]
+        values[column.name] = column_values
+    return values
+
+
+def batches_to_columns(batches, columns):
+    """Return the values of the given columns for an iterable of batches."""
+    values = {column.name: [] for column in columns}
+    for batch in batches:
+        for name, column_values in batch_to_columns(batch, columns).items():
+            values[name].extend(column_values)
+    return values
+
+
+def numpy_array(np, values, kind):
+    """
+    Return the values of a column as a NumPy array. Missing floats are NaN,
+    missing timestamps NaT and missing ints and bools are masked.
+    """
+    dtype = NUMPY_DTYPES.get(kind)
+    if dtype is None:
+        return np.fromiter(values, dtype=object, count=len(values))
+    if kind in ("int", "bool") and any(value is None for value in values):
+        return np.ma.masked_array(
+            [0 if value is None else value for value in values],
+            mask=[value is None for value in values], dtype=dtype
+        )
+    return np.array(values, dtype=dtype)
+
+
+def batches_to_numpy(batches, columns):
+    """
+    Return the given columns of an iterable of batches as NumPy arrays,
+    converting every batch as it comes.
+    """
+    np = import_optional("numpy", "numpy")
+    arrays = {column.name: [] for column in columns}
+    for batch in batches:
+        values = batch_to_columns(batch, columns)
+        for column in columns:
+            arrays[column.name].append(
+                numpy_array(np, values.pop(column.name), column.kind)
+            )
+
+    for column in columns:
+        parts = arrays[column.name]
+        if not parts:
+            arrays[column.name] = numpy_array(np, [], column.kind)
+        elif any(isinstance(part, np.ma.MaskedArray) for part in parts):
+            arrays[column.name] = np.ma.concatenate(parts)
+        else:
+            arrays[column.name] = np.concatenate(parts)
+    return arrays
+
+
+def import_optional(module_name, extra):
+    """Import an optional dependency or explain how to install it."""
+    try:
+        return __import__(module_name)
+    except ImportError:
+        raise CousteauGenericError(
+            "{0} is required for this, install it with "
+            "pip install ripe.atlas.cousteau[{1}]".format(module_name, extra)
+        )
+
+
+def arrow_type(pa, kind):
+    return {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("s", tz="UTC"),
+        "category": pa.string(),
+        "string": pa.string(),
+        "float_list": pa.list_(pa.float64()),
+        "string_list": pa.list_(pa.string()),
+        "json": pa.string(),
+    }[kind]
+
+
+def arrow_schema(columns):
+    """Return the Arrow schema of the given columns."""
+    pa = import_optional("pyarrow", "arrow")
+    return pa.schema([
+        pa.field(
+            column.name,
+            pa.dictionary(pa.int32(), pa.string())
+            if column.kind == "category" else arrow_type(pa, column.kind)
+        )
+        for column in columns
+    ])
+
+
+def batch_to_arrow(batch, columns):
+    """Convert a batch of objects to an Arrow record batch."""
+    pa = import_optional("pyarrow", "arrow")
+    values = batch_to_columns(batch, columns)
+    arrays = []
+    for column in columns:
+        array = pa.array(values.pop(column.name), type=arrow_type(pa, column.kind))
+        if column.kind == "category":
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema(columns))
+
+
+def batches_to_arrow(batches, columns):
+    """Convert an iterable of object batches to an Arrow table."""
+    pa = import_optional("pyarrow", "arrow")
+    record_batches = [batch_to_arrow(batch, columns) for batch in batches]
+    return pa.Table.from_batches(record_batches, schema=arrow_schema(columns))
+
+
+def arrow_to_dataframe(table):
+    """Convert an Arrow table to pandas keeping nullable integers and bools."""
+    pa = import_optional("pyarrow", "arrow")
+    pd = import_optional("pandas", "pandas")
+    types = {
+        pa.int64(): pd.Int64Dtype(),
+        pa.float64(): pd.Float64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+    }
+    return table.to_pandas(types_mapper=types.get)
+
+
+def columns_to_dataframe(values, columns):
+    """Build a pandas DataFrame with typed columns from column values."""
+    pd = import_optional("pandas", "pandas")
+    data = {}
+    for column in columns:
+        column_values = values.pop(column.name)
+        if column.kind == "int":
+            data[column.name] = pd.array(column_values, dtype="Int64")
+        elif column.kind == "float":
+            data[column.name] = pd.array(column_values, dtype="Float64")
+        elif column.kind == "bool":
+            data[column.name] = pd.array(column_values, dtype="boolean")
+        elif column.kind == "timestamp":
+            data[column.name] = pd.to_datetime(
+                pd.array(column_values, dtype="Int64"), unit="s", utc=True
+            )
+        elif column.kind == "category":
+            data[column.name] = pd.Categorical(column_values)
+        else:
+            data[column.name] = pd.array(column_values, dtype=object)
+    return pd.DataFrame(data, columns=[column.name for column in columns])
+
+
+__all__ = ["Column"]
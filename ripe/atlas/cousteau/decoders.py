@@ -0,0 +1,200 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing decoders turning raw result lines, as streamed by
+AtlasResultsRequest.iter_lines(), into NumPy structured arrays chunk by chunk.
+Nested results like traceroutes are flattened to one row per reply.
+NumPy is an optional dependency and only imported when a decoder is used.
+"""
+
+import ipaddress
+import json
+import re
+from functools import lru_cache
+
+from .columnar import import_optional
+
+PING_DTYPE = [
+    ("msm_id", "i8"),
+    ("prb_id", "i8"),
+    ("timestamp", "i8"),
+    ("min", "f8"),
+    ("avg", "f8"),
+    ("max", "f8"),
+    ("sent", "i4"),
+    ("rcvd", "i4"),
+]
+
+PING_FIELDS = [name for name, _ in PING_DTYPE]
+
+# Top level numeric fields of a ping result. A quote has to precede the key so
+# that e.g. "stored_timestamp" does not match "timestamp".
+PING_FIELDS_RE = re.compile(
+    rb'"(msm_id|prb_id|timestamp|min|avg|max|sent|rcvd)"\s*:\s*(-?[0-9][0-9.eE+-]*)'
+)
+
+
+TRACEROUTE_DTYPE = [
+    ("msm_id", "i8"),
+    ("prb_id", "i8"),
+    ("timestamp", "i8"),
+    ("af", "i1"),
+    ("hop", "i2"),
+    ("from_hi", "u8"),
+    ("from_lo", "u8"),
+    ("rtt", "f8"),
+    ("ttl", "i2"),
+    ("size", "i4"),
+]
+
+TRACEROUTE_FIELDS = [name for name, _ in TRACEROUTE_DTYPE]
+
+IPV4_MAPPED = 0xffff << 32
+NAN = float("nan")
+LOW_64_BITS = (1 << 64) - 1
+
+
+def iter_chunks(lines, chunk_size):
+    """Yield lists of at most chunk_size lines."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ping_values(line):
+    """
+    Return the values of PING_FIELDS in a raw ping result line, without
+    decoding the whole result. Falls back to JSON for unusual lines.
+    """
+    if isinstance(line, str):
+        line = line.encode("utf-8")
+
+    fields = dict(PING_FIELDS_RE.findall(line))
+    if len(fields) == len(PING_FIELDS):
+        return [float(fields[name.encode()]) for name in PING_FIELDS]
+
+    result = json.loads(line)
+    return [
+        -1 if result.get(name) is None else result[name] for name in PING_FIELDS
+    ]
+
+
+def decode_ping(lines, chunk_size=10000):
+    """
+    Decode raw ping result lines into NumPy structured arrays with the
+    PING_DTYPE fields, yielding one array per chunk_size results so memory
+    stays bounded while downloading. min/avg/max are NaN when no reply came.
+    Usage:
+        request = AtlasResultsRequest(msm_id=1001, start=start, stop=stop)
+        for chunk in decode_ping(request.iter_lines()):
+            print(chunk["avg"].mean())
+    """
+    np = import_optional("numpy", "numpy")
+    for chunk in iter_chunks(lines, chunk_size):
+        rows = np.array([ping_values(line) for line in chunk], dtype="f8")
+        array = np.empty(len(chunk), dtype=PING_DTYPE)
+        for i, name in enumerate(PING_FIELDS):
+            array[name] = rows[:, i]
+        for name in ("min", "avg", "max"):
+            array[name][array[name] < 0] = np.nan
+        yield array
+
+
+@lru_cache(maxsize=65536)
+def pack_address(address):
+    """
+    Return an IP address as two unsigned 64 bit integers (high, low). IPv4
+    addresses are IPv4-mapped (::ffff:a.b.c.d), missing ones are (0, 0).
+    """
+    if not address:
+        return 0, 0
+    try:
+        packed = ipaddress.ip_address(address)
+    except ValueError:
+        return 0, 0
+    value = int(packed)
+    if packed.version == 4:
+        value |= IPV4_MAPPED
+    return value >> 64, value & LOW_64_BITS
+
+
+def unpack_address(high, low):
+    """Return the IP address packed by pack_address, None for (0, 0)."""
+    value = (int(high) << 64) | int(low)
+    if not value:
+        return None
+    address = ipaddress.IPv6Address(value)
+    return str(address.ipv4_mapped or address)
+
+
+def traceroute_rows(result, columns):
+    """Append a row to the columns for every reply of a traceroute result."""
+    head = (
+        result.get("msm_id", -1),
+        result.get("prb_id", -1),
+        result.get("timestamp", -1),
+        result.get("af", -1),
+    )
+    for hop in result.get("result") or ():
+        for reply in hop.get("result") or ():
+            high, low = pack_address(reply.get("from"))
+            row = head + (
+                hop.get("hop", -1),
+                high,
+                low,
+                reply.get("rtt", NAN),
+                reply.get("ttl", -1),
+                reply.get("size", -1),
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+
+
+def decode_traceroute(lines, chunk_size=10000):
+    """
+    Flatten raw traceroute result lines into NumPy structured arrays with
+    one row per reply (TRACEROUTE_DTYPE), yielding one array per chunk_size
+    results so memory is proportional to one chunk. Timeouts have a NaN rtt
+    and a (0, 0) address, see unpack_address() to get the addresses back.
+    Usage:
+        request = AtlasResultsRequest(msm_id=5001, start=start, stop=stop)
+        for hops in decode_traceroute(request.iter_lines()):
+            last_hops = hops[hops["hop"] == hops["hop"].max()]
+    """
+    np = import_optional("numpy", "numpy")
+    for chunk in iter_chunks(lines, chunk_size):
+        columns = [[] for _ in TRACEROUTE_FIELDS]
+        for line in chunk:
+            traceroute_rows(json.loads(line), columns)
+
+        array = np.empty(len(columns[0]), dtype=TRACEROUTE_DTYPE)
+        for name, values in zip(TRACEROUTE_FIELDS, columns):
+            array[name] = values
+        yield array
+
+
+__all__ = [
+    "decode_ping",
+    "decode_traceroute",
+    "unpack_address",
+    "PING_DTYPE",
+    "TRACEROUTE_DTYPE",
+]
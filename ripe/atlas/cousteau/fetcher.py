@@ -0,0 +1,277 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a fetcher streaming the results of many measurements at
+once, in the order they arrive or interleaved by time.
+"""
+
+import heapq
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import timestamps
+from .bulk import pooled_transport
+from .exceptions import CousteauGenericError
+from .request import AtlasResultsRequest, result_time
+
+LOG = logging.getLogger(__name__)
+
+# Marks the end of the results of a measurement in a queue.
+DONE = object()
+
+
+class MeasurementProgress(object):
+    """Results received so far from a measurement, and whether it is done."""
+
+    __slots__ = ("msm_id", "results", "done", "error")
+
+    def __init__(self, msm_id):
+        self.msm_id = msm_id
+        self.results = 0
+        self.done = False
+        self.error = None
+
+    def __repr__(self):
+        return "<MeasurementProgress #{0}: {1} results{2}>".format(
+            self.msm_id, self.results, ", done" if self.done else ""
+        )
+
+
+def measurement_id(measurement):
+    """
+    Return the id of a measurement given as an id, a Measurement, or a
+    dictionary from a MeasurementRequest listing.
+    """
+    if isinstance(measurement, dict):
+        return measurement["id"]
+    return getattr(measurement, "id", measurement)
+
+
+class MultiResultsFetcher(object):
+    """
+    Streams the results of many measurements, given as ids, Measurement
+    objects or a MeasurementRequest, from up to max_workers concurrent
+    downloads. Results are yielded as they arrive, or merged by timestamp if
+    interleave is set. Interleaving needs the next result of every
+    measurement: up to max_workers measurements are streamed at once, each
+    buffering at most queue_size results, more are downloaded window (in
+    seconds) after window from start to stop (or now), keeping the results
+    of one window of every measurement in memory while the next one is
+    downloaded. Without interleaving at most queue_size results are waiting
+    in total.
+    progress maps every measurement id to its MeasurementProgress and
+    progress_callback, if given, is called with it once a measurement is
+    done. A measurement failing doesn't stop the others, its error is kept
+    in its progress. Other keyword arguments (start, stop, probe_ids, key,
+    client...) are given to every AtlasResultsRequest.
+    Usage:
+        fetcher = MultiResultsFetcher(
+            MeasurementRequest(tags="dns-monitoring"),
+            start=datetime(2026, 1, 1), stop=datetime(2026, 1, 2),
+            interleave=True,
+        )
+        for result in fetcher:
+            print(result["msm_id"], result["timestamp"])
+        print(fetcher.errors)
+    """
+
+    def __init__(self, measurements, max_workers=8, queue_size=10000,
+                 interleave=False, window=3600, progress_callback=None,
+                 **request_kwargs):
+        self.msm_ids = [
+            measurement_id(measurement) for measurement in measurements
+        ]
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.interleave = interleave
+        self.window = window
+        if interleave and len(self.msm_ids) > max_workers and \
+                request_kwargs.get("start") is None:
+            raise CousteauGenericError(
+                "Interleaving more measurements than max_workers needs a "
+                "start time."
+            )
+        self.progress_callback = progress_callback
+        self.request_kwargs = request_kwargs
+        self.progress = {
+            msm_id: MeasurementProgress(msm_id) for msm_id in self.msm_ids
+        }
+        self.stopped = threading.Event()
+
+    @property
+    def errors(self):
+        """The (msm_id, error) pairs of the measurements that failed."""
+        return [
+            (progress.msm_id, progress.error)
+            for progress in self.progress.values() if progress.error is not None
+        ]
+
+    def put(self, results, item):
+        """Queue an item, giving up if the iteration was stopped."""
+        while not self.stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def iter_measurement(self, msm_id, request_kwargs):
+        """Yield the results of a measurement then DONE, keeping progress."""
+        progress = self.progress[msm_id]
+        try:
+            request = AtlasResultsRequest(msm_id=msm_id, **request_kwargs)
+            for result in request.iter_results():
+                progress.results += 1
+                yield result
+        except Exception as exc:
+            LOG.error(f"{exc} while fetching the results of measurement {msm_id}")
+            progress.error = exc
+        progress.done = True
+        yield DONE
+
+    def measurement_done(self, msm_id):
+        if self.progress_callback is not None:
+            self.progress_callback(self.progress[msm_id])
+
+    def fetch(self, msm_id, results, request_kwargs):
+        """Stream the results of a measurement into the results queue."""
+        for result in self.iter_measurement(msm_id, request_kwargs):
+            if not self.put(results, (msm_id, result)):
+                return
+        self.measurement_done(msm_id)
+
+    def fetch_window(self, msm_id, request_kwargs, start, stop):
+        """Return the results of a measurement between start and stop."""
+        progress = self.progress[msm_id]
+        if progress.error is not None or self.stopped.is_set():
+            return []
+        results = []
+        try:
+            request = AtlasResultsRequest(
+                msm_id=msm_id, start=start, stop=stop, **request_kwargs
+            )
+            for result in request.iter_results():
+                if self.stopped.is_set():
+                    return []
+                results.append(result)
+        except Exception as exc:
+            LOG.error(f"{exc} while fetching the results of measurement {msm_id}")
+            progress.error = exc
+            return []
+        progress.results += len(results)
+        return results
+
+    def iter_windows(self, executor, request_kwargs):
+        """
+        Yield the results of all the measurements merged by time, one window
+        of time after the other. The next window is downloaded while the
+        current one is merged.
+        """
+        request_kwargs = dict(request_kwargs)
+        start = timestamps.to_timestamp(request_kwargs.pop("start"))
+        stop = timestamps.to_timestamp(request_kwargs.pop("stop", None))
+        if stop is None:
+            stop = int(time.time())
+        windows = [
+            (window_start, min(window_start + self.window - 1, stop))
+            for window_start in range(start, stop + 1, self.window)
+        ]
+
+        def submit(window):
+            return [
+                executor.submit(self.fetch_window, msm_id, request_kwargs, *window)
+                for msm_id in self.msm_ids
+            ]
+
+        pending = submit(windows[0]) if windows else []
+        for index in range(len(windows)):
+            futures = pending
+            pending = submit(windows[index + 1]) if index + 1 < len(windows) else []
+            parts = [future.result() for future in futures]
+            for result in heapq.merge(*parts, key=result_time):
+                yield result
+
+        for msm_id in self.msm_ids:
+            self.progress[msm_id].done = True
+            self.measurement_done(msm_id)
+
+    def iter_queue(self, results, count):
+        """Yield the results in a queue until count measurements are done."""
+        while count:
+            msm_id, result = results.get()
+            if result is DONE:
+                count -= 1
+                continue
+            yield result
+
+    def iter_results(self):
+        """Yield the results of all the measurements."""
+        self.stopped.clear()
+        if not self.msm_ids:
+            return
+
+        workers = min(self.max_workers, len(self.msm_ids))
+        request_kwargs = self.request_kwargs
+        transport = None
+        if (request_kwargs.get("client") is None
+                and request_kwargs.get("transport") is None):
+            transport = pooled_transport(workers)
+            request_kwargs = dict(request_kwargs, transport=transport)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        if self.interleave and len(self.msm_ids) > workers:
+            merged = self.iter_windows(executor, request_kwargs)
+        elif self.interleave:
+            queues = [queue.Queue(self.queue_size) for _ in self.msm_ids]
+            for msm_id, results in zip(self.msm_ids, queues):
+                executor.submit(self.fetch, msm_id, results, request_kwargs)
+            merged = heapq.merge(
+                *(self.iter_queue(results, 1) for results in queues),
+                key=result_time
+            )
+        else:
+            results = queue.Queue(self.queue_size)
+            for msm_id in self.msm_ids:
+                executor.submit(self.fetch, msm_id, results, request_kwargs)
+            merged = self.iter_queue(results, len(self.msm_ids))
+
+        try:
+            for result in merged:
+                yield result
+        finally:
+            # Unblock the downloads if the iteration stopped early
+            self.stopped.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            if transport is not None:
+                transport.close()
+
+    def __iter__(self):
+        return self.iter_results()
+
+
+def results_many(measurements, **kwargs):
+    """
+    Shortcut for iter(MultiResultsFetcher(measurements, ...)), yielding the
+    results of many measurements.
+    """
+    return MultiResultsFetcher(measurements, **kwargs).iter_results()
+
+
+__all__ = ["MultiResultsFetcher", "MeasurementProgress", "results_many"]
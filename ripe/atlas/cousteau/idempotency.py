@@ -0,0 +1,215 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a creation request that is safe to retry. Every payload is
+fingerprinted and recorded in a local ledger, and the created measurements
+carry a tag derived from the fingerprint so that a retry after an unknown
+outcome (e.g. a timeout) finds them instead of creating them twice.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+from .api_listing import MeasurementRequest
+from .client import AtlasClient
+from .exceptions import CousteauGenericError
+from .request import AtlasCreateRequest
+
+PENDING = "pending"
+CREATED = "created"
+
+
+def fingerprint(post_data):
+    """Return the SHA-256 hex digest of a payload in canonical JSON."""
+    canonical = json.dumps(post_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CreationLedger(object):
+    """
+    JSON file recording, per payload fingerprint, whether the creation is
+    pending (sent but outcome unknown) or created, with the measurement ids.
+    Created entries are kept forever unless ttl (in seconds) is given, after
+    which the same payload can be created again. Every change is written to
+    disk atomically. Can be shared by threads.
+    """
+
+    def __init__(self, path, ttl=None):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        try:
+            with open(path) as ledger:
+                self.entries = json.load(ledger)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and \
+                    entry["state"] == CREATED and \
+                    entry["updated"] + self.ttl < time.time():
+                del self.entries[key]
+                self._save()
+                return None
+            return entry
+
+    def _save(self):
+        tmp_file = "{0}.tmp".format(self.path)
+        with open(tmp_file, "w") as ledger:
+            json.dump(self.entries, ledger)
+        os.replace(tmp_file, self.path)
+
+    def set(self, key, state, tag, msm_ids=None):
+        with self.lock:
+            self.entries[key] = {
+                "state": state,
+                "tag": tag,
+                "msm_ids": msm_ids,
+                "updated": int(time.time()),
+            }
+            self._save()
+
+    def remove(self, key):
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self._save()
+
+
+class IdempotentCreateRequest(AtlasCreateRequest):
+    """
+    AtlasCreateRequest that can be retried without creating duplicates. The
+    payload is fingerprinted (or idempotency_key is used) and looked up in
+    the ledger before sending:
+
+    - created: the recorded ids are returned without calling the API.
+    - pending: the previous attempt has an unknown outcome, measurements
+      tagged with its marker tag are looked up and returned if found.
+    - otherwise the measurements are created with the marker tag added
+      to every definition.
+
+    Client errors (4xx) clear the entry so the next retry sends again, while
+    network and server errors (5xx) leave it pending as the measurements may
+    have been created. Times given relative to now change the payload on
+    every retry, pass idempotency_key in that case. Every new creation gets
+    its own marker tag, so forget() (or a ledger ttl) allows creating the
+    same payload again.
+    Usage:
+        request = IdempotentCreateRequest(
+            ledger=CreationLedger("creations.json"),
+            key=ATLAS_API_KEY, measurements=[ping], sources=[source],
+            is_oneoff=True,
+        )
+        is_success, response = request.create()
+    """
+
+    TAG_PREFIX = "cousteau-"
+
+    def __init__(self, **kwargs):
+        super(IdempotentCreateRequest, self).__init__(**kwargs)
+        self.ledger = kwargs["ledger"]
+        self.idempotency_key = kwargs.get("idempotency_key")
+        if self.idempotency_key is not None and (
+                not isinstance(self.idempotency_key, str)
+                or not self.idempotency_key):
+            raise CousteauGenericError("idempotency_key has to be a string.")
+        self.fingerprint = None
+        self.marker_tag = None
+
+    def _construct_post_data(self):
+        """Build the payload and fingerprint it."""
+        super(IdempotentCreateRequest, self)._construct_post_data()
+        self.fingerprint = self.idempotency_key or fingerprint(self.post_data)
+
+    def new_marker_tag(self):
+        """
+        Return a marker tag for a new creation of the payload. It is a hex
+        digest, so any idempotency_key gives a tag the API accepts.
+        """
+        digest = fingerprint([self.fingerprint, uuid.uuid4().hex])
+        return self.TAG_PREFIX + digest[:32]
+
+    def add_marker_tag(self, marker_tag):
+        self.marker_tag = marker_tag
+        for definition in self.post_data["definitions"]:
+            definition["tags"] = list(definition.get("tags") or []) + [marker_tag]
+
+    def forget(self):
+        """
+        Remove the payload from the ledger, so that the next create() sends
+        it again even if it was created before.
+        """
+        if self.fingerprint is None:
+            self._construct_post_data()
+        self.ledger.remove(self.fingerprint)
+
+    def find_created(self):
+        """Return the ids of measurements carrying the marker tag."""
+        client = self.client
+        if client is None:
+            client = AtlasClient(
+                key=self.key, server=self.server, verify=self.verify,
+                proxies=self.proxies, user_agent=self.http_agent,
+                transport=self.transport, limiter=self.limiter,
+            )
+        return sorted(
+            measurement["id"]
+            for measurement in MeasurementRequest(client=client, tags=self.marker_tag)
+        )
+
+    def create(self):
+        """Sends the POST request unless the measurements already exist."""
+        self._construct_post_data()
+        expected = len(self.post_data["definitions"])
+
+        entry = self.ledger.get(self.fingerprint)
+        if entry is not None and entry["state"] == CREATED:
+            return True, {"measurements": entry["msm_ids"]}
+
+        if entry is not None and entry["state"] == PENDING:
+            self.add_marker_tag(entry["tag"])
+            msm_ids = self.find_created()
+            if len(msm_ids) >= expected:
+                self.ledger.set(self.fingerprint, CREATED, self.marker_tag, msm_ids)
+                return True, {"measurements": msm_ids}
+        else:
+            self.add_marker_tag(self.new_marker_tag())
+
+        self.ledger.set(self.fingerprint, PENDING, self.marker_tag)
+        self.http_method_args["json"] = self.post_data
+        self.response = None
+        is_success, response = self.http_method("POST")
+
+        status_code = getattr(self.response, "status_code", None)
+        if is_success and isinstance(response, dict):
+            self.ledger.set(
+                self.fingerprint, CREATED, self.marker_tag,
+                response.get("measurements")
+            )
+        elif status_code is not None and 400 <= status_code < 500:
+            # The API refused the request, so nothing was created. Server
+            # errors stay pending for the marker tag lookup to settle.
+            self.ledger.remove(self.fingerprint)
+
+        return is_success, response
+
+
+__all__ = ["CreationLedger", "IdempotentCreateRequest", "fingerprint"]
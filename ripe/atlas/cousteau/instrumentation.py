@@ -0,0 +1,350 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing instrumentation hooks and an optional metrics registry.
+Hooks are callbacks receiving an event dictionary, fired for:
+
+- "request" by AtlasRequest.http_method: method, url, status_code, ok,
+  seconds (total), response_seconds (until the response was received),
+  decode_seconds (JSON decoding), bytes, error and, for transports
+  reporting them, the connection phases in timings.
+- "page" by RequestGenerator.next_batch: url, items, count and seconds.
+- "stream_message" by AtlasStream.recv: event_name, bytes and
+  decode_seconds.
+
+Nothing is measured beyond a couple of clock reads when no hooks are added.
+"""
+
+import bisect
+import logging
+import math
+import threading
+
+from .columnar import import_optional
+
+LOG = logging.getLogger(__name__)
+
+EVENTS = ("request", "page", "stream_message")
+
+# Hooks by event, replaced as a whole on changes so firing needs no lock.
+hooks = {}
+_hooks_lock = threading.Lock()
+
+
+def add_hook(event, callback):
+    """Call callback(data) every time the event fires."""
+    if event not in EVENTS:
+        raise ValueError("Unknown instrumentation event: {0}".format(event))
+    with _hooks_lock:
+        hooks[event] = hooks.get(event, ()) + (callback,)
+
+
+def remove_hook(event, callback):
+    """Stop calling a callback added with add_hook."""
+    with _hooks_lock:
+        callbacks = tuple(c for c in hooks.get(event, ()) if c is not callback)
+        if callbacks:
+            hooks[event] = callbacks
+        else:
+            hooks.pop(event, None)
+
+
+def fire(event, data):
+    """
+    Call the hooks of the event with the event data. Failing hooks are
+    logged and never fail the instrumented call.
+    """
+    data["event"] = event
+    for callback in hooks.get(event, ()):
+        try:
+            callback(data)
+        except Exception:
+            LOG.exception(f"Instrumentation hook failed on {event} event")
+
+
+def request_event(method, url, response, error, start, received, finished):
+    """Build the data of a "request" event."""
+    content = getattr(response, "content", None)
+    return {
+        "method": method,
+        "url": url,
+        "status_code": getattr(response, "status_code", None),
+        "ok": bool(getattr(response, "ok", False)),
+        "seconds": finished - start,
+        "response_seconds": (received or finished) - start,
+        "decode_seconds": finished - received if received else 0.0,
+        "bytes": len(content) if isinstance(content, bytes) else 0,
+        "error": error,
+        "timings": getattr(response, "timings", None) or {},
+    }
+
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ITEMS_BUCKETS = (1, 10, 50, 100, 250, 500, 1000)
+
+
+class Counter(object):
+    """Counter with a value per label values tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = sorted(self.values.items())
+        for label_values, value in values:
+            yield self.name, dict(zip(self.labels, label_values)), value
+
+
+class Histogram(object):
+    """Histogram with cumulative buckets per label values tuple."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            if label_values not in self.values:
+                self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts, _, _ = state = self.values[label_values]
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self.lock:
+            values = sorted(
+                (label_values, (list(counts), total, count))
+                for label_values, (counts, total, count) in self.values.items()
+            )
+        for label_values, (counts, total, count) in values:
+            labels = dict(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                bucket_labels = dict(labels, le=format_value(bound))
+                yield self.name + "_bucket", bucket_labels, cumulative
+            yield self.name + "_sum", labels, total
+            yield self.name + "_count", labels, count
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        '{0}="{1}"'.format(
+            key, str(value).replace("\\", "\\\\").replace('"', '\\"')
+        )
+        for key, value in labels.items()
+    ) + "}"
+
+
+class MetricsRegistry(object):
+    """
+    Metrics about requests, listing pages and stream messages, fed by the
+    instrumentation hooks once installed. The metrics can be exposed in the
+    Prometheus text format or forwarded to OpenTelemetry.
+    Usage:
+        registry = MetricsRegistry().install()
+        for probe in ProbeRequest(country_code="NL"):
+            pass
+        print(registry.to_prometheus())
+    """
+
+    def __init__(self, prefix="cousteau"):
+        def name(metric):
+            return "{0}_{1}".format(prefix, metric)
+
+        self.requests = Counter(
+            name("requests_total"), "HTTP requests by method and status code.",
+            ("method", "status_code"),
+        )
+        self.request_errors = Counter(
+            name("request_errors_total"), "HTTP requests failed without a response.",
+            ("method",),
+        )
+        self.request_seconds = Histogram(
+            name("request_seconds"), "Total duration of HTTP requests.", ("method",)
+        )
+        self.response_seconds = Histogram(
+            name("response_seconds"),
+            "Time until the response of HTTP requests was received.", ("method",)
+        )
+        self.decode_seconds = Histogram(
+            name("decode_seconds"), "Time spent decoding JSON responses.", ("method",)
+        )
+        self.response_bytes = Counter(
+            name("response_bytes_total"), "Bytes of HTTP response bodies.", ("method",)
+        )
+        self.pages = Counter(name("listing_pages_total"), "Listing pages fetched.")
+        self.page_items = Histogram(
+            name("listing_page_items"), "Objects per listing page.",
+            buckets=ITEMS_BUCKETS,
+        )
+        self.stream_messages = Counter(
+            name("stream_messages_total"), "Stream messages by event name.",
+            ("event_name",),
+        )
+        self.stream_bytes = Counter(
+            name("stream_bytes_total"), "Bytes of stream messages."
+        )
+        self.stream_decode_seconds = Histogram(
+            name("stream_decode_seconds"), "Time spent decoding stream messages."
+        )
+        self.metrics = (
+            self.requests, self.request_errors, self.request_seconds,
+            self.response_seconds, self.decode_seconds, self.response_bytes,
+            self.pages, self.page_items, self.stream_messages,
+            self.stream_bytes, self.stream_decode_seconds,
+        )
+        self.exporters = []
+
+    def on_request(self, data):
+        method = data["method"]
+        if data["error"] is not None:
+            self.request_errors.inc(1, method)
+        else:
+            self.requests.inc(1, method, str(data["status_code"]))
+        self.request_seconds.observe(data["seconds"], method)
+        self.response_seconds.observe(data["response_seconds"], method)
+        self.decode_seconds.observe(data["decode_seconds"], method)
+        self.response_bytes.inc(data["bytes"], method)
+        for exporter in self.exporters:
+            exporter.on_request(data)
+
+    def on_page(self, data):
+        self.pages.inc()
+        self.page_items.observe(data["items"])
+        for exporter in self.exporters:
+            exporter.on_page(data)
+
+    def on_stream_message(self, data):
+        self.stream_messages.inc(1, data["event_name"])
+        self.stream_bytes.inc(data["bytes"])
+        self.stream_decode_seconds.observe(data["decode_seconds"])
+        for exporter in self.exporters:
+            exporter.on_stream_message(data)
+
+    def install(self):
+        """Start recording the instrumented events."""
+        add_hook("request", self.on_request)
+        add_hook("page", self.on_page)
+        add_hook("stream_message", self.on_stream_message)
+        return self
+
+    def uninstall(self):
+        """Stop recording the instrumented events."""
+        remove_hook("request", self.on_request)
+        remove_hook("page", self.on_page)
+        remove_hook("stream_message", self.on_stream_message)
+
+    def snapshot(self):
+        """Return the current samples as {name: [(labels, value), ...]}."""
+        samples = {}
+        for metric in self.metrics:
+            for name, labels, value in metric.samples():
+                samples.setdefault(name, []).append((labels, value))
+        return samples
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append("# HELP {0} {1}".format(metric.name, metric.help))
+            lines.append("# TYPE {0} {1}".format(metric.name, metric.kind))
+            for name, labels, value in metric.samples():
+                lines.append("{0}{1} {2}".format(
+                    name, format_labels(labels), format_value(value)
+                ))
+        return "\n".join(lines) + "\n"
+
+    def add_opentelemetry(self, meter=None):
+        """
+        Also record the events as OpenTelemetry instruments of the given
+        meter, or of a "ripe.atlas.cousteau" meter from the global meter
+        provider. Needs pip install ripe.atlas.cousteau[opentelemetry].
+        """
+        self.exporters.append(OpenTelemetryExporter(meter))
+        return self
+
+
+class OpenTelemetryExporter(object):
+    """Forwards instrumentation events to OpenTelemetry instruments."""
+
+    def __init__(self, meter=None):
+        if meter is None:
+            metrics = import_optional("opentelemetry.metrics", "opentelemetry").metrics
+            meter = metrics.get_meter("ripe.atlas.cousteau")
+        self.requests = meter.create_counter(
+            "cousteau.requests", description="HTTP requests."
+        )
+        self.request_duration = meter.create_histogram(
+            "cousteau.request.duration", unit="s",
+            description="Total duration of HTTP requests.",
+        )
+        self.response_size = meter.create_counter(
+            "cousteau.response.size", unit="By",
+            description="Bytes of HTTP response bodies.",
+        )
+        self.page_items = meter.create_histogram(
+            "cousteau.listing.page_items", description="Objects per listing page."
+        )
+        self.stream_messages = meter.create_counter(
+            "cousteau.stream.messages", description="Stream messages."
+        )
+
+    def on_request(self, data):
+        attributes = {
+            "http.request.method": data["method"],
+            "http.response.status_code": data["status_code"] or 0,
+        }
+        self.requests.add(1, attributes)
+        self.request_duration.record(data["seconds"], attributes)
+        self.response_size.add(data["bytes"], attributes)
+
+    def on_page(self, data):
+        self.page_items.record(data["items"])
+
+    def on_stream_message(self, data):
+        self.stream_messages.add(1, {"event_name": data["event_name"]})
+
+
+__all__ = ["add_hook", "remove_hook", "MetricsRegistry"]
@@ -17,6 +17,41 @@
 Module containing classes responsible for creating different kind of Atlas
 measurement objects.
 """
+from string import Formatter
+
+# Options renamed in the v2 API, old name to new name.
+RENAMING_PAIRS = {
+    "dontfrag": "dont_fragment",
+    "maxhops": "max_hops",
+    "firsthop": "first_hop",
+    "use_NSID": "set_nsid_bit",
+    "cd": "set_cd_bit",
+    "do": "set_do_bit",
+    "qbuf": "include_qbuf",
+    "recursion_desired": "set_rd_bit",
+    "noabuf": "include_abuf"
+}
+
+
+def translate_option(option, value):
+    """
+    Translates an option name from API v1 to its v2 name and value, printing
+    a deprecation warning for renamed options.
+    """
+    if option not in RENAMING_PAIRS:
+        return option, value
+
+    warninglog = (
+        "DeprecationWarning: {0} option has been deprecated and "
+        "renamed to {1}."
+    ).format(option, RENAMING_PAIRS[option])
+    print(warninglog)
+
+    # noabuf was changed to include_abuf so we need a double-negative
+    if option == "noabuf":
+        value = not value
+
+    return RENAMING_PAIRS[option], value
 
 
 class AtlasMeasurement(object):
@@ -109,33 +144,7 @@ class AtlasMeasurement(object):
         breaking already running script and keep backwards compatibility.
         Translates option name from API v1 to renamed one of v2 API.
         """
-        new_option = option
-        new_value = getattr(self, option)
-
-        renaming_pairs = {
-            "dontfrag": "dont_fragment",
-            "maxhops": "max_hops",
-            "firsthop": "first_hop",
-            "use_NSID": "set_nsid_bit",
-            "cd": "set_cd_bit",
-            "do": "set_do_bit",
-            "qbuf": "include_qbuf",
-            "recursion_desired": "set_rd_bit",
-            "noabuf": "include_abuf"
-        }
-        if option in renaming_pairs.keys():
-            warninglog = (
-                "DeprecationWarning: {0} option has been deprecated and "
-                "renamed to {1}."
-            ).format(option, renaming_pairs[option])
-            print(warninglog)
-            new_option = renaming_pairs[option]
-
-        # noabuf was changed to include_abuf so we need a double-negative
-        if option == "noabuf":
-            new_value = not new_value
-
-        return new_option, new_value
+        return translate_option(option, getattr(self, option))
 
     def build_api_struct(self):
         """
@@ -223,7 +232,140 @@ class Http(AtlasMeasurement):
         self._init(**kwargs)
 
 
+class MeasurementDefinition(object):
+    """
+    Measurement definition stamped out by a MeasurementTemplate. It can be
+    passed as measurement to AtlasCreateRequest or BulkCreator and its
+    options can be read as attributes.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __getattr__(self, option):
+        # copy and pickle look attributes up before data is set, which
+        # would otherwise recurse through this method forever.
+        if option == "data" or option.startswith("__"):
+            raise AttributeError(option)
+        try:
+            return self.data[option]
+        except KeyError:
+            raise AttributeError(option)
+
+    def build_api_struct(self):
+        return dict(self.data)
+
+
+class MeasurementTemplate(object):
+    """
+    Validates and translates the options of a measurement once, then stamps
+    out variants of it with only the per variant options to handle. Required
+    options missing from the measurement (e.g. target) have to be given to
+    every variant. A description containing {option} placeholders is
+    formatted with the options of each variant, one with unbalanced braces
+    is used as it is.
+    Usage:
+        from ripe.atlas.cousteau import Ping, MeasurementTemplate
+        template = MeasurementTemplate(Ping(af=4, description="Ping {target}"))
+        measurements = template.definitions({"target": t} for t in targets)
+        structs = template.build_api_structs({"target": t} for t in targets)
+    """
+
+    def __init__(self, measurement):
+        if not measurement.measurement_type:
+            raise MalFormattedMeasurement("Please define a valid measurement type.")
+
+        self.measurement_class = measurement.__class__.__name__
+        self.base = {"type": measurement.measurement_type}
+        self.variable_options = []
+        for option in measurement.used_options:
+            if getattr(measurement, option, None) is None and \
+                    option in measurement.required_options:
+                self.variable_options.append(option)
+                continue
+            option_key, option_value = measurement.v2_translator(option)
+            self.base[option_key] = option_value
+
+        self.description = self.description_template(
+            self.base.get("description")
+        )
+
+    @staticmethod
+    def description_template(description):
+        """
+        Return the description if it has placeholders to format, None if it
+        has to be used as it is.
+        """
+        if not isinstance(description, str) or "{" not in description:
+            return None
+        try:
+            fields = [
+                field for _, field, _, _ in Formatter().parse(description)
+                if field is not None
+            ]
+        except ValueError:
+            return None
+        for field in fields:
+            if not field or field[0].isdigit():
+                raise MalFormattedMeasurement(
+                    "Description placeholders have to name an option: "
+                    "{0}".format(description)
+                )
+        return description
+
+    def build_api_struct(self, **options):
+        """Return the API structure of the variant with the given options."""
+        data = dict(self.base)
+        for option, value in options.items():
+            if option in RENAMING_PAIRS:
+                option, value = translate_option(option, value)
+            data[option] = value
+
+        for option in self.variable_options:
+            if data.get(option) is None:
+                log = "%s Measurement field: <%s> is required" % (
+                    self.measurement_class, option
+                )
+                raise MalFormattedMeasurement(log)
+
+        if self.description is not None and "description" not in options:
+            try:
+                data["description"] = self.description.format(**data)
+            except KeyError as exc:
+                raise MalFormattedMeasurement(
+                    "Unknown option in description: {0}".format(exc)
+                )
+            except (IndexError, ValueError, AttributeError) as exc:
+                raise MalFormattedMeasurement(
+                    "Invalid description placeholder: {0}".format(exc)
+                )
+
+        return data
+
+    def definition(self, **options):
+        """Return the variant with the given options as a measurement."""
+        return MeasurementDefinition(self.build_api_struct(**options))
+
+    def build_api_structs(self, variants):
+        """Return the API structures of an iterable of option dictionaries."""
+        return [self.build_api_struct(**options) for options in variants]
+
+    def definitions(self, variants):
+        """Return the measurements of an iterable of option dictionaries."""
+        return [self.definition(**options) for options in variants]
+
+
 class MalFormattedMeasurement(Exception):
     pass
 
-__all__ = ["Ping", "Traceroute", "Dns", "Sslcert", "Ntp", "Http"]
+__all__ = [
+    "Ping",
+    "Traceroute",
+    "Dns",
+    "Sslcert",
+    "Ntp",
+    "Http",
+    "MeasurementTemplate",
+]
@@ -0,0 +1,248 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a sink writing measurement results to a Parquet dataset
+partitioned by result type, measurement and day. pyarrow is an optional
+dependency and only imported when a sink is created.
+"""
+
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from .columnar import Column, import_optional, arrow_schema, batch_to_arrow
+
+
+def positive_or_none(key):
+    """Getter returning the value of key, None for the -1 of missing values."""
+    def getter(result):
+        value = result.get(key)
+        if value is None or value < 0:
+            return None
+        return value
+    return getter
+
+
+def ping_rtts(result):
+    return [reply["rtt"] for reply in result.get("result") or () if "rtt" in reply]
+
+
+def hop_count(result):
+    return len(result.get("result") or ())
+
+
+# msm_id is not stored in the files, it is given by the partition directory.
+COMMON_COLUMNS = (
+    Column("prb_id", "prb_id", "int"),
+    Column("timestamp", "timestamp", "timestamp"),
+    Column("stored_timestamp", "stored_timestamp", "timestamp"),
+    Column("af", "af", "int"),
+    Column("from", "from", "string"),
+    Column("src_addr", "src_addr", "string"),
+    Column("fw", "fw", "int"),
+)
+
+RESULT_COLUMNS = {
+    "ping": COMMON_COLUMNS + (
+        Column("dst_addr", "dst_addr", "string"),
+        Column("dst_name", "dst_name", "string"),
+        Column("proto", "proto", "category"),
+        Column("size", "size", "int"),
+        Column("ttl", "ttl", "int"),
+        Column("sent", "sent", "int"),
+        Column("rcvd", "rcvd", "int"),
+        Column("dup", "dup", "int"),
+        Column("min", positive_or_none("min"), "float"),
+        Column("avg", positive_or_none("avg"), "float"),
+        Column("max", positive_or_none("max"), "float"),
+        Column("rtts", ping_rtts, "float_list"),
+    ),
+    "traceroute": COMMON_COLUMNS + (
+        Column("dst_addr", "dst_addr", "string"),
+        Column("dst_name", "dst_name", "string"),
+        Column("proto", "proto", "category"),
+        Column("paris_id", "paris_id", "int"),
+        Column("size", "size", "int"),
+        Column("endtime", "endtime", "timestamp"),
+        Column("hop_count", hop_count, "int"),
+        Column("result", "result", "json"),
+    ),
+    "dns": COMMON_COLUMNS + (
+        Column("dst_addr", "dst_addr", "string"),
+        Column("proto", "proto", "category"),
+        Column("rt", ("result", "rt"), "float"),
+        Column("size", ("result", "size"), "int"),
+        Column("ancount", ("result", "ANCOUNT"), "int"),
+        Column("abuf", ("result", "abuf"), "string"),
+        Column("resultset", "resultset", "json"),
+        Column("error", "error", "json"),
+    ),
+    "http": COMMON_COLUMNS + (
+        Column("uri", "uri", "string"),
+        Column("res", ("result", 0, "res"), "int"),
+        Column("rt", ("result", 0, "rt"), "float"),
+        Column("hsize", ("result", 0, "hsize"), "int"),
+        Column("bsize", ("result", 0, "bsize"), "int"),
+        Column("dst_addr", ("result", 0, "dst_addr"), "string"),
+        Column("result", "result", "json"),
+    ),
+    "sslcert": COMMON_COLUMNS + (
+        Column("dst_addr", "dst_addr", "string"),
+        Column("dst_name", "dst_name", "string"),
+        Column("dst_port", "dst_port", "string"),
+        Column("method", "method", "category"),
+        Column("ver", "ver", "category"),
+        Column("rt", "rt", "float"),
+        Column("ttc", "ttc", "float"),
+        Column("cert", "cert", "string_list"),
+        Column("alert", "alert", "json"),
+        Column("err", "err", "string"),
+    ),
+    "ntp": COMMON_COLUMNS + (
+        Column("dst_addr", "dst_addr", "string"),
+        Column("dst_name", "dst_name", "string"),
+        Column("proto", "proto", "category"),
+        Column("stratum", "stratum", "int"),
+        Column("poll", "poll", "float"),
+        Column("precision", "precision", "float"),
+        Column("root_delay", "root-delay", "float"),
+        Column("root_dispersion", "root-dispersion", "float"),
+        Column("ref_id", "ref-id", "string"),
+        Column("result", "result", "json"),
+    ),
+}
+
+DEFAULT_COLUMNS = COMMON_COLUMNS + (
+    Column("result", "result", "json"),
+)
+
+
+class ParquetResultSink(object):
+    """
+    Writes results to a Parquet dataset under root, partitioned as
+    type=<type>/msm_id=<msm_id>/date=<YYYY-MM-DD>/part-<id>.parquet, each
+    type with its own schema (see RESULT_COLUMNS). Results are buffered per
+    partition and written in row groups of at most row_group_size rows, and
+    no more than max_buffered_rows are kept in memory overall.
+
+    Every sink writes new part files, so running it again over the same root
+    appends to the dataset. The dataset can be read with
+    pyarrow.dataset.dataset(root + "/type=ping", partitioning="hive").
+    Usage:
+        request = AtlasResultsRequest(msm_id=1001, start=start, stop=stop)
+        with ParquetResultSink("results") as sink:
+            sink.write_lines(request.iter_lines())
+    """
+
+    def __init__(self, root, row_group_size=50000, max_buffered_rows=200000,
+                 max_open_files=64, compression="zstd"):
+        self.pq = import_optional("pyarrow.parquet", "arrow").parquet
+        self.root = root
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows
+        self.max_open_files = max_open_files
+        self.compression = compression
+        self.buffers = {}
+        self.buffered_rows = 0
+        self.writers = OrderedDict()
+        self.days = {}
+
+    def get_day(self, timestamp):
+        """Return the UTC date of a timestamp as YYYY-MM-DD."""
+        day = int(timestamp or 0) // 86400
+        if day not in self.days:
+            self.days[day] = time.strftime("%Y-%m-%d", time.gmtime(day * 86400))
+        return self.days[day]
+
+    def write(self, result):
+        """Add a result, as a dictionary, to the dataset."""
+        key = (
+            result.get("type", "unknown"),
+            result.get("msm_id"),
+            self.get_day(result.get("timestamp")),
+        )
+        buffer = self.buffers.setdefault(key, [])
+        buffer.append(result)
+        self.buffered_rows += 1
+
+        if len(buffer) >= self.row_group_size:
+            self.flush_partition(key)
+        elif self.buffered_rows >= self.max_buffered_rows:
+            self.flush_partition(max(self.buffers, key=lambda k: len(self.buffers[k])))
+
+    def write_lines(self, lines):
+        """Add raw JSON results, e.g. from AtlasResultsRequest.iter_lines()."""
+        for line in lines:
+            self.write(json.loads(line))
+
+    def get_writer(self, key, columns):
+        """Return the open Parquet writer of a partition, opening it if needed."""
+        if key in self.writers:
+            self.writers.move_to_end(key)
+            return self.writers[key]
+
+        if len(self.writers) >= self.max_open_files:
+            _, oldest = self.writers.popitem(last=False)
+            oldest.close()
+
+        result_type, msm_id, day = key
+        directory = os.path.join(
+            self.root,
+            "type={0}".format(result_type),
+            "msm_id={0}".format(msm_id),
+            "date={0}".format(day),
+        )
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "part-{0}.parquet".format(uuid.uuid4().hex))
+
+        writer = self.pq.ParquetWriter(
+            path, arrow_schema(columns), compression=self.compression
+        )
+        self.writers[key] = writer
+        return writer
+
+    def flush_partition(self, key):
+        """Write the buffered results of a partition as a row group."""
+        results = self.buffers.pop(key)
+        self.buffered_rows -= len(results)
+        columns = RESULT_COLUMNS.get(key[0], DEFAULT_COLUMNS)
+        writer = self.get_writer(key, columns)
+        writer.write_batch(
+            batch_to_arrow(results, columns), row_group_size=self.row_group_size
+        )
+
+    def flush(self):
+        """Write all the buffered results."""
+        for key in list(self.buffers):
+            self.flush_partition(key)
+
+    def close(self):
+        """Write all the buffered results and close the files."""
+        self.flush()
+        while self.writers:
+            _, writer = self.writers.popitem()
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["ParquetResultSink", "RESULT_COLUMNS"]
@@ -0,0 +1,165 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a pipeline downloading measurement results with threads
+and decoding and aggregating them in a pool of processes, so that CPU bound
+analysis is not limited by the GIL.
+"""
+
+import functools
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .request import AtlasResultsRequest
+
+# Marks a missing reduce initial value, None being a valid one.
+NOTHING = object()
+
+
+def process_chunk(chunk, map_function, reduce_function):
+    """
+    Decode the results in a chunk of newline delimited JSON and map them.
+    Returns the number of mapped values and the mapped values, or their
+    reduction if reduce_function is given. Runs in the worker processes.
+    """
+    values = []
+    for line in chunk.splitlines():
+        if not line:
+            continue
+        value = map_function(json.loads(line))
+        if value is not None:
+            values.append(value)
+
+    if reduce_function is None or not values:
+        return len(values), values
+    return len(values), functools.reduce(reduce_function, values)
+
+
+class ResultPipeline(object):
+    """
+    Fetches the results of measurements with up to fetchers threads and
+    hands them in chunks of about chunk_size bytes to a pool of processes
+    (one per CPU by default) that decodes them and calls
+    map_function(result) on every result. Mapped values that are None are
+    dropped. If reduce_function is given, the values are combined with
+    reduce_function(aggregate, value), first inside every chunk and then
+    across chunks, so it has to be associative. At most max_pending chunks
+    wait for a process, which bounds memory use when downloading is faster
+    than processing.
+    map_function and reduce_function are sent to the processes, they have to
+    be module level functions. Other keyword arguments (key, server,
+    client...) are given to every AtlasResultsRequest.
+    Usage:
+        def rtt(result):
+            return result.get("avg") if result.get("avg", -1) > 0 else None
+
+        pipeline = ResultPipeline(rtt, max, processes=8)
+        highest = pipeline.run([1001, 1002, {"msm_id": 1003, "start": 1600000000}])
+    """
+
+    def __init__(self, map_function, reduce_function=None, initial=NOTHING,
+                 processes=None, fetchers=4, chunk_size=1 << 20,
+                 max_pending=None, executor=None, **request_kwargs):
+        self.map_function = map_function
+        self.reduce_function = reduce_function
+        self.initial = initial
+        self.processes = processes
+        self.fetchers = fetchers
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.executor = executor
+        self.request_kwargs = request_kwargs
+
+    def build_request(self, request):
+        """
+        Return an AtlasResultsRequest for a request, a measurement id or a
+        dictionary of request keyword arguments.
+        """
+        if isinstance(request, AtlasResultsRequest):
+            return request
+        if isinstance(request, dict):
+            return AtlasResultsRequest(**dict(self.request_kwargs, **request))
+        return AtlasResultsRequest(msm_id=request, **self.request_kwargs)
+
+    def fetch(self, request, executor, pending):
+        """Submit the chunks of one request, return their futures in order."""
+        futures = []
+        for chunk in request.iter_chunks(self.chunk_size):
+            pending.acquire()
+            future = executor.submit(
+                process_chunk, chunk, self.map_function, self.reduce_function
+            )
+            future.add_done_callback(lambda _: pending.release())
+            futures.append(future)
+        return futures
+
+    def run(self, requests):
+        """
+        Process the results of the given requests, measurement ids or
+        dictionaries of request keyword arguments. Returns the aggregate if
+        a reduce_function is given, or else the list of mapped values in the
+        order of the requests and of their results.
+        """
+        requests = [self.build_request(request) for request in requests]
+        executor = self.executor
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=self.processes)
+        pending = threading.BoundedSemaphore(
+            self.max_pending or 2 * (self.processes or os.cpu_count() or 1)
+        )
+
+        try:
+            # Start the processes now: forking them later, from a fetcher
+            # thread, could copy locks held by the other threads.
+            executor.submit(int).result()
+            with ThreadPoolExecutor(max_workers=self.fetchers) as fetchers:
+                fetches = [
+                    fetchers.submit(self.fetch, request, executor, pending)
+                    for request in requests
+                ]
+                chunks = [
+                    future.result()
+                    for fetch in fetches for future in fetch.result()
+                ]
+        except BaseException:
+            if self.executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        if self.executor is None:
+            executor.shutdown()
+
+        if self.reduce_function is None:
+            return [value for _, values in chunks for value in values]
+
+        partials = [partial for count, partial in chunks if count]
+        if self.initial is NOTHING:
+            if not partials:
+                return None
+            return functools.reduce(self.reduce_function, partials)
+        return functools.reduce(self.reduce_function, partials, self.initial)
+
+
+def process_results(requests, map_function, reduce_function=None, **kwargs):
+    """
+    Shortcut for ResultPipeline(map_function, reduce_function, ...).run(requests).
+    """
+    return ResultPipeline(map_function, reduce_function, **kwargs).run(requests)
+
+
+__all__ = ["ResultPipeline", "process_results"]
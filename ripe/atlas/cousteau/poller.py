@@ -0,0 +1,220 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a poller of the latest results of many measurements,
+keeping the last result of every probe and reporting only what changed.
+"""
+
+import heapq
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .bulk import RateLimiter, pooled_transport
+from .request import AtlasLatestRequest
+
+
+class LatestUpdate(object):
+    """
+    Outcome of one poll of a measurement: changed lists the results that
+    are new or differ from the previous poll, removed the probe ids that no
+    longer have a latest result. not_modified is set when the server
+    answered a conditional request with 304, and error when the request
+    failed, the previous snapshot being kept in both cases.
+    """
+
+    __slots__ = ("msm_id", "changed", "removed", "not_modified", "error")
+
+    def __init__(self, msm_id, changed=(), removed=(), not_modified=False,
+                 error=None):
+        self.msm_id = msm_id
+        self.changed = list(changed)
+        self.removed = list(removed)
+        self.not_modified = not_modified
+        self.error = error
+
+    @property
+    def is_success(self):
+        return self.error is None
+
+    def __bool__(self):
+        return bool(self.changed or self.removed)
+
+    def __repr__(self):
+        return "<LatestUpdate #{0}: {1} changed, {2} removed>".format(
+            self.msm_id, len(self.changed), len(self.removed)
+        )
+
+
+class LatestPoller(object):
+    """
+    Polls the latest results of measurements every interval seconds, with
+    up to max_workers requests at a time. Polls are spread over the first
+    interval and every following one is moved by up to jitter * interval
+    seconds, so requests don't come in bursts. Entity tags and modification
+    dates of the responses are sent back as conditional requests. The last
+    result of every probe is kept, by result_key(result), so that only new
+    or changed results are reported. Other keyword arguments (key, server,
+    client, probe_ids...) are given to every AtlasLatestRequest.
+    Usage:
+        poller = LatestPoller(msm_ids, interval=60, key=ATLAS_API_KEY)
+        for update in poller.iter_updates():
+            for result in update.changed:
+                dashboard.update(update.msm_id, result)
+    """
+
+    def __init__(self, msm_ids, interval=60, jitter=0.1, max_workers=8,
+                 rate=None, limiter=None, result_key=None,
+                 clock=time.monotonic, sleep=time.sleep, **request_kwargs):
+        self.msm_ids = list(msm_ids)
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.result_key = result_key or (lambda result: result.get("prb_id"))
+        self.clock = clock
+        self.sleep = sleep
+        self.random = random.Random()
+
+        if limiter is None and rate:
+            limiter = RateLimiter(rate)
+        if limiter is not None:
+            request_kwargs["limiter"] = limiter
+        self.transport = None
+        if (request_kwargs.get("client") is None
+                and request_kwargs.get("transport") is None):
+            self.transport = pooled_transport(max_workers)
+            request_kwargs["transport"] = self.transport
+        self.request_kwargs = request_kwargs
+
+        # Last results by measurement id and result key
+        self.snapshots = {}
+        # Validators (ETag, Last-Modified) of the last response by measurement id
+        self.validators = {}
+
+    def snapshot(self, msm_id):
+        """Return the last results of a measurement by result key."""
+        return self.snapshots.get(msm_id, {})
+
+    def conditional_headers(self, msm_id):
+        etag, last_modified = self.validators.get(msm_id, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def poll(self, msm_id):
+        """Fetch the latest results of a measurement and return a LatestUpdate."""
+        request = AtlasLatestRequest(msm_id=msm_id, **self.request_kwargs)
+        request.http_method_args["headers"].update(
+            self.conditional_headers(msm_id)
+        )
+
+        is_success, results = request.create()
+        response = request.response
+        status_code = getattr(response, "status_code", None)
+        if status_code == 304:
+            return LatestUpdate(msm_id, not_modified=True)
+        if not is_success or not isinstance(results, list):
+            return LatestUpdate(msm_id, error=results)
+
+        headers = getattr(response, "headers", None) or {}
+        self.validators[msm_id] = (
+            headers.get("ETag"), headers.get("Last-Modified")
+        )
+        return self.diff(msm_id, results)
+
+    def diff(self, msm_id, results):
+        """Replace the snapshot of a measurement, return what changed."""
+        previous = self.snapshots.get(msm_id, {})
+        current = {}
+        changed = []
+        for result in results:
+            key = self.result_key(result)
+            current[key] = result
+            if previous.get(key) != result:
+                changed.append(result)
+        removed = [key for key in previous if key not in current]
+        self.snapshots[msm_id] = current
+        return LatestUpdate(msm_id, changed, removed)
+
+    def poll_all(self):
+        """Poll every measurement once, concurrently, return their updates."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.poll, self.msm_ids))
+
+    def next_time(self, now):
+        spread = self.jitter * self.interval
+        return now + self.interval + self.random.uniform(-spread, spread)
+
+    def iter_updates(self, seconds=None, changed_only=True):
+        """
+        Poll the measurements for `seconds` if specified, or else forever,
+        yielding a LatestUpdate as every poll completes. Unless changed_only
+        is False, updates without changes or errors are skipped.
+        """
+        start = self.clock()
+        step = self.interval / max(len(self.msm_ids), 1)
+        schedule = [
+            (start + index * step, msm_id)
+            for index, msm_id in enumerate(self.msm_ids)
+        ]
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while schedule or running:
+                now = self.clock()
+                if seconds is not None and now - start >= seconds:
+                    break
+                while (schedule and schedule[0][0] <= now
+                       and len(running) < self.max_workers):
+                    _, msm_id = heapq.heappop(schedule)
+                    running[executor.submit(self.poll, msm_id)] = msm_id
+
+                timeout = None
+                if schedule and len(running) < self.max_workers:
+                    timeout = max(schedule[0][0] - now, 0)
+                if seconds is not None:
+                    remaining = max(start + seconds - now, 0)
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                if not running:
+                    self.sleep(timeout)
+                    continue
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    msm_id = running.pop(future)
+                    heapq.heappush(schedule, (self.next_time(self.clock()), msm_id))
+                    try:
+                        update = future.result()
+                    except Exception as exc:
+                        update = LatestUpdate(msm_id, error=exc)
+                    if update or update.error is not None or not changed_only:
+                        yield update
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["LatestPoller", "LatestUpdate"]
@@ -0,0 +1,326 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing a local, indexed catalog of probes that answers selection
+queries without calling the ATLAS API.
+"""
+
+import ipaddress
+import json
+import math
+from collections import defaultdict
+
+from .api_listing import ProbeRequest
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.2
+
+
+class PrefixTree(object):
+    """
+    Binary radix tree keeping a set of values (probe ids) for every prefix
+    inserted. Each node is a list [zero child, one child, values].
+    """
+
+    def __init__(self, max_length):
+        self.max_length = max_length
+        self.root = [None, None, None]
+
+    def _bits(self, address, length):
+        shift = self.max_length - 1
+        for i in range(length):
+            yield (address >> (shift - i)) & 1
+
+    def insert(self, network, value):
+        """Add the value under the given network."""
+        node = self.root
+        for bit in self._bits(int(network.network_address), network.prefixlen):
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        if node[2] is None:
+            node[2] = set()
+        node[2].add(value)
+
+    def remove(self, network, value):
+        """Remove the value from the given network if it is there."""
+        node = self.root
+        for bit in self._bits(int(network.network_address), network.prefixlen):
+            node = node[bit]
+            if node is None:
+                return
+        if node[2]:
+            node[2].discard(value)
+
+    def covering(self, address):
+        """Return the values of all the prefixes containing the address."""
+        values = set()
+        node = self.root
+        for bit in self._bits(int(address), self.max_length):
+            if node[2]:
+                values.update(node[2])
+            node = node[bit]
+            if node is None:
+                return values
+        if node[2]:
+            values.update(node[2])
+        return values
+
+    def within(self, network):
+        """Return the values of all the prefixes inside the given network."""
+        node = self.root
+        for bit in self._bits(int(network.network_address), network.prefixlen):
+            node = node[bit]
+            if node is None:
+                return set()
+
+        values = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node[2]:
+                values.update(node[2])
+            stack.extend(child for child in node[:2] if child is not None)
+        return values
+
+
+class ProbeCatalog(object):
+    """
+    In memory catalog of probes with indexes on ASN, country, status, tags,
+    prefixes and location. Every query method returns a set of probe ids,
+    use select() to combine criteria and get the probes themselves.
+    Usage:
+        catalog = ProbeCatalog.from_api(is_public=True)
+        catalog.save("probes.json")
+        ...
+        catalog = ProbeCatalog.load("probes.json")
+        probes = catalog.select(country_code="NL", asn=3333, status="Connected")
+        ids = catalog.covering("193.0.0.1") & catalog.near(52.37, 4.89, 50)
+    """
+
+    def __init__(self, probes=()):
+        self.probes = {}
+        self._asns = {4: defaultdict(set), 6: defaultdict(set)}
+        self._countries = defaultdict(set)
+        self._statuses = defaultdict(set)
+        self._tags = defaultdict(set)
+        self._prefixes = {4: PrefixTree(32), 6: PrefixTree(128)}
+        self._grid = defaultdict(set)
+        for probe in probes:
+            self.add(probe)
+
+    @classmethod
+    def from_api(cls, **filters):
+        """Build the catalog from a single listing of the probes API."""
+        return cls(ProbeRequest(**filters))
+
+    @classmethod
+    def load(cls, path):
+        """Build the catalog from a snapshot written by save()."""
+        with open(path) as snapshot:
+            return cls(json.load(snapshot))
+
+    def save(self, path):
+        """Write a snapshot of the catalog probes to the given path."""
+        with open(path, "w") as snapshot:
+            json.dump(list(self.probes.values()), snapshot)
+
+    def __len__(self):
+        return len(self.probes)
+
+    def __iter__(self):
+        return iter(self.probes.values())
+
+    def __contains__(self, probe_id):
+        return probe_id in self.probes
+
+    def __getitem__(self, probe_id):
+        return self.probes[probe_id]
+
+    def _index_keys(self, probe):
+        """Yield (index, key) pairs under which the probe is indexed."""
+        for af in (4, 6):
+            asn = probe.get("asn_v{0}".format(af))
+            if asn is not None:
+                yield self._asns[af], asn
+
+        if probe.get("country_code"):
+            yield self._countries, probe["country_code"].upper()
+
+        status = probe.get("status")
+        if isinstance(status, dict):
+            if status.get("id") is not None:
+                yield self._statuses, status["id"]
+            if status.get("name"):
+                yield self._statuses, status["name"]
+        elif status is not None:
+            yield self._statuses, status
+        if probe.get("status_name"):
+            yield self._statuses, probe["status_name"]
+
+        for tag in probe.get("tags") or ():
+            if isinstance(tag, dict):
+                tag = tag.get("slug") or tag.get("name")
+            yield self._tags, tag
+
+        cell = self._get_location(probe)
+        if cell is not None:
+            yield self._grid, self._cell(*cell)
+
+    def _networks(self, probe):
+        for af in (4, 6):
+            prefix = probe.get("prefix_v{0}".format(af))
+            if not prefix:
+                continue
+            try:
+                yield af, ipaddress.ip_network(prefix, strict=False)
+            except ValueError:
+                continue
+
+    @staticmethod
+    def _get_location(probe):
+        """Return (latitude, longitude) of the probe if it is known."""
+        geometry = probe.get("geometry")
+        if geometry and geometry.get("coordinates"):
+            longitude, latitude = geometry["coordinates"][:2]
+            return latitude, longitude
+        if probe.get("latitude") is not None and probe.get("longitude") is not None:
+            return probe["latitude"], probe["longitude"]
+        return None
+
+    @staticmethod
+    def _cell(latitude, longitude):
+        return int(math.floor(latitude)), int(math.floor(longitude)) % 360
+
+    def add(self, probe):
+        """Add a probe to the catalog, replacing any previous version."""
+        if probe["id"] in self.probes:
+            self.remove(probe["id"])
+
+        self.probes[probe["id"]] = probe
+        for index, key in self._index_keys(probe):
+            index[key].add(probe["id"])
+        for af, network in self._networks(probe):
+            self._prefixes[af].insert(network, probe["id"])
+
+    def remove(self, probe_id):
+        """Remove a probe from the catalog."""
+        probe = self.probes.pop(probe_id)
+        for index, key in self._index_keys(probe):
+            index[key].discard(probe_id)
+            if not index[key]:
+                del index[key]
+        for af, network in self._networks(probe):
+            self._prefixes[af].remove(network, probe_id)
+
+    def by_asn(self, asn, af=None):
+        """Ids of probes in the given ASN, for IPv4, IPv6 or both."""
+        afs = (af,) if af else (4, 6)
+        ids = set()
+        for address_family in afs:
+            ids.update(self._asns[address_family].get(asn, ()))
+        return ids
+
+    def by_country(self, country_code):
+        """Ids of probes in the given country."""
+        return set(self._countries.get(country_code.upper(), ()))
+
+    def by_status(self, status):
+        """Ids of probes with the given status id or name."""
+        return set(self._statuses.get(status, ()))
+
+    def by_tag(self, tag):
+        """Ids of probes with the given tag."""
+        return set(self._tags.get(tag, ()))
+
+    def covering(self, address):
+        """Ids of probes whose prefix contains the given address."""
+        address = ipaddress.ip_address(address)
+        return self._prefixes[address.version].covering(address)
+
+    def within(self, prefix):
+        """Ids of probes whose prefix is inside the given prefix."""
+        network = ipaddress.ip_network(prefix, strict=False)
+        return self._prefixes[network.version].within(network)
+
+    def near(self, latitude, longitude, radius):
+        """Ids of probes within radius kilometres of the given point."""
+        lat_span = radius / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(abs(latitude) + lat_span, 90.0)))
+        if cos_lat * KM_PER_DEGREE * 180 <= radius:
+            lon_cells = range(360)
+        else:
+            lon_span = radius / (KM_PER_DEGREE * max(cos_lat, 1e-9))
+            lon_cells = range(
+                int(math.floor(longitude - lon_span)),
+                int(math.floor(longitude + lon_span)) + 1
+            )
+
+        ids = set()
+        lat_cells = range(
+            int(math.floor(latitude - lat_span)),
+            int(math.floor(latitude + lat_span)) + 1
+        )
+        for lat_cell in lat_cells:
+            for lon_cell in lon_cells:
+                for probe_id in self._grid.get((lat_cell, lon_cell % 360), ()):
+                    location = self._get_location(self.probes[probe_id])
+                    if self.distance(latitude, longitude, *location) <= radius:
+                        ids.add(probe_id)
+        return ids
+
+    @staticmethod
+    def distance(lat1, lon1, lat2, lon2):
+        """Great circle distance between two points in kilometres."""
+        lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+        a = (
+            math.sin((lat2 - lat1) / 2) ** 2 +
+            math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+    def select(self, asn=None, country_code=None, status=None, tags=(),
+               prefix=None, address=None, near=None):
+        """
+        Return the probes matching all the given criteria, sorted by id.
+        near is a (latitude, longitude, radius in km) tuple.
+        """
+        queries = []
+        if asn is not None:
+            queries.append(self.by_asn(asn))
+        if country_code is not None:
+            queries.append(self.by_country(country_code))
+        if status is not None:
+            queries.append(self.by_status(status))
+        for tag in tags:
+            queries.append(self.by_tag(tag))
+        if prefix is not None:
+            queries.append(self.within(prefix))
+        if address is not None:
+            queries.append(self.covering(address))
+        if near is not None:
+            queries.append(self.near(*near))
+
+        if not queries:
+            ids = set(self.probes)
+        else:
+            queries.sort(key=len)
+            ids = queries[0].intersection(*queries[1:])
+
+        return [self.probes[probe_id] for probe_id in sorted(ids)]
+
+
+__all__ = ["ProbeCatalog"]
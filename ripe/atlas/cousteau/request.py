@@ -18,14 +18,41 @@ Module containing the main class that create the post data and makes the HTTP
 request according to the ATLAS API.
 """
 
-import calendar
+import copy
+import heapq
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from dateutil import parser
-from datetime import datetime
 
+from . import instrumentation, timestamps
+from .exceptions import APIResponseError
+from .transport import RequestsTransport
 from .version import __version__
 
 
+def get_default_user_agent():
+    """Return the User-Agent used when none is given."""
+    return "RIPE ATLAS Cousteau v{0}".format(__version__)
+
+
+def build_headers(http_agent, key=None, headers=None):
+    """Build the headers of an HTTP request to the ATLAS API."""
+    request_headers = {
+        "User-Agent": http_agent,
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+    if key:
+        request_headers["Authorization"] = f"Key {key}"
+    if headers:
+        request_headers.update(headers)
+
+    return request_headers
+
+
 class AtlasRequest(object):
     """
     Base class for doing Atlas requests. Contains functions that can be used by
@@ -40,16 +67,23 @@ class AtlasRequest(object):
 
     def __init__(self, **kwargs):
 
+        self.client = kwargs.get("client")
+        if self.client is not None:
+            kwargs = self.client.get_request_kwargs(**kwargs)
+
         self.url = ""
         self.key = kwargs.get("key")
         self.url_path = kwargs.get("url_path", "")
         self.server = kwargs.get("server") or "atlas.ripe.net"
-        self.verify = kwargs.get("verify", True)
+        self.verify = kwargs.get("verify")
+        if self.verify is None:
+            self.verify = True
         self.proxies = kwargs.get("proxies", {})
         self.headers = kwargs.get("headers", None)
+        self.transport = kwargs.get("transport")
+        self.limiter = kwargs.get("limiter")
 
-        default_user_agent = "RIPE ATLAS Cousteau v{0}".format(__version__)
-        self.http_agent = kwargs.get("user_agent") or default_user_agent
+        self.http_agent = kwargs.get("user_agent") or get_default_user_agent()
 
         self.http_method_args = {
             "params": {},
@@ -59,20 +93,16 @@ class AtlasRequest(object):
         }
 
         self.post_data = {}
+        self.response = None
 
     def get_headers(self):
         """Return header for the HTTP request."""
-        headers = {
-            "User-Agent": self.http_agent,
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        if self.key:
-            headers["Authorization"] = f"Key {self.key}"
-        if self.headers:
-            headers.update(self.headers)
+        if self.client is not None:
+            headers = self.client.get_headers(self.key, self.headers, self.http_agent)
+            if headers is not None:
+                return headers
 
-        return headers
+        return build_headers(self.http_agent, self.key, self.headers)
 
     def http_method(self, method):
         """
@@ -82,9 +112,12 @@ class AtlasRequest(object):
         """
         self.build_url()
 
+        start = time.perf_counter()
+        response = error = received = None
         try:
-            response = self.get_http_method(method)
+            response = self.response = self.get_http_method(method)
             is_success = response.ok
+            received = time.perf_counter()
 
             try:
                 response_message = response.json()
@@ -94,19 +127,38 @@ class AtlasRequest(object):
         except requests.exceptions.RequestException as exc:
             is_success = False
             response_message = exc.args
+            error = exc
+
+        if "request" in instrumentation.hooks:
+            instrumentation.fire("request", instrumentation.request_event(
+                method, self.url, response, error, start, received,
+                time.perf_counter()
+            ))
 
         return is_success, response_message
 
     def get_http_method(self, method):
-        """Gets the http method that will be called from the requests library"""
+        """
+        Calls the given http method either through the transport, if one was
+        given, or directly from the requests library. Waits for the rate
+        limiter first if there is one.
+        """
+        if self.limiter is not None:
+            self.limiter.acquire()
+        if self.transport is not None:
+            return self.transport.request(method, self.url, **self.http_method_args)
         return self.http_methods[method](self.url, **self.http_method_args)
 
     def build_url(self):
         """
         Builds the request's url combining server and url_path
-        classes attributes.
+        classes attributes. The server can include a scheme, e.g.
+        http://localhost:8000 for a local test server.
         """
-        self.url = "https://{0}{1}".format(self.server, self.url_path)
+        if "://" in self.server:
+            self.url = "{0}{1}".format(self.server.rstrip("/"), self.url_path)
+        else:
+            self.url = "https://{0}{1}".format(self.server, self.url_path)
 
     def get(self, **url_params):
         """
@@ -116,6 +168,42 @@ class AtlasRequest(object):
             self.http_method_args["params"].update(url_params)
         return self.http_method("GET")
 
+    def stream(self, **url_params):
+        """
+        Makes a streamed HTTP GET to the url and yields the non empty lines of
+        the body as bytes while they are downloaded. Raises APIResponseError
+        if the request fails.
+        """
+        for line in self._stream(lambda response: response.iter_lines(), url_params):
+            if line:
+                yield line
+
+    def stream_chunks(self, chunk_size=1 << 20, **url_params):
+        """
+        Like stream, but yields the body in raw chunks of bytes as they are
+        downloaded, without splitting it into lines.
+        """
+        return self._stream(
+            lambda response: response.iter_content(chunk_size), url_params
+        )
+
+    def _stream(self, read, url_params):
+        if url_params:
+            self.http_method_args["params"].update(url_params)
+        self.build_url()
+
+        transport = self.transport or RequestsTransport()
+        if self.limiter is not None:
+            self.limiter.acquire()
+        try:
+            with transport.stream("GET", self.url, **self.http_method_args) as response:
+                if not response.ok:
+                    raise APIResponseError(response.text)
+                for data in read(response):
+                    yield data
+        except requests.exceptions.RequestException as exc:
+            raise APIResponseError(exc.args)
+
     def post(self):
         """
         Makes the HTTP POST to the url sending post_data.
@@ -132,14 +220,10 @@ class AtlasRequest(object):
 
     def clean_time(self, time):
         """
-        Transform time field to datetime object if there is any.
+        Transform time field (timestamp, datetime or time string) to a UNIX
+        timestamp if there is any.
         """
-        if isinstance(time, int):
-            time = datetime.utcfromtimestamp(time)
-        elif isinstance(time, str):
-            time = parser.parse(time)
-
-        return time
+        return timestamps.to_timestamp(time)
 
 
 class AtlasCreateRequest(AtlasRequest):
@@ -195,14 +279,10 @@ class AtlasCreateRequest(AtlasRequest):
         if self.is_oneoff:
             self.post_data.update({"is_oneoff": self.is_oneoff})
 
-        if self.start_time:
-            self.post_data.update(
-                {"start_time": int(calendar.timegm(self.start_time.timetuple()))}
-            )
-        if self.stop_time:
-            self.post_data.update(
-                {"stop_time": int(calendar.timegm(self.stop_time.timetuple()))}
-            )
+        if self.start_time is not None:
+            self.post_data.update({"start_time": self.start_time})
+        if self.stop_time is not None:
+            self.post_data.update({"stop_time": self.stop_time})
 
         if self.bill_to:
             self.post_data.update({"bill_to": self.bill_to})
@@ -264,7 +344,85 @@ class AtlasStopRequest(AtlasRequest):
         return self.delete()
 
 
-class AtlasLatestRequest(AtlasRequest):
+def result_time(result):
+    """Sort key of results, their timestamp."""
+    return result.get("timestamp") or 0
+
+
+class ProbeChunksMixin(object):
+    """
+    Splits a request filtering on more probe ids than fit in a url into
+    requests of at most PROBE_CHUNK_SIZE probes, sent by up to max_workers
+    threads, and merges their responses. Expects probe_ids and max_workers
+    attributes.
+    """
+
+    URL_LENGTH_LIMIT = 5000
+    PROBE_CHUNK_SIZE = 500
+
+    def probe_chunks(self):
+        """Return the probe ids, as strings, of every request to send."""
+        probe_ids = self.probe_ids
+        if not probe_ids or len(str(probe_ids)) <= self.URL_LENGTH_LIMIT:
+            return [probe_ids]
+
+        probe_ids = str(probe_ids).split(",")
+        return [
+            ",".join(probe_ids[i:i + self.PROBE_CHUNK_SIZE])
+            for i in range(0, len(probe_ids), self.PROBE_CHUNK_SIZE)
+        ]
+
+    def chunk_requests(self):
+        """Return a copy of the request for every chunk of probe ids."""
+        chunks = self.probe_chunks()
+        if len(chunks) == 1:
+            return [self]
+
+        chunk_requests = []
+        for chunk in chunks:
+            request = copy.copy(self)
+            request.probe_ids = chunk
+            request.http_method_args = dict(
+                self.http_method_args,
+                params=dict(self.http_method_args["params"], probe_ids=chunk),
+            )
+            chunk_requests.append(request)
+        return chunk_requests
+
+    def get_chunks(self):
+        """
+        Send the request, or the request of every chunk of probe ids, and
+        return (is_success, response) like get. If a chunk fails, its
+        response is returned.
+        """
+        chunk_requests = self.chunk_requests()
+        if len(chunk_requests) == 1:
+            return self.get()
+
+        max_workers = min(self.max_workers, len(chunk_requests))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(
+                executor.map(lambda request: request.get(), chunk_requests)
+            )
+        # A single response doesn't describe the merged one
+        self.response = None
+
+        for is_success, response in responses:
+            if not is_success or not isinstance(response, list):
+                return False, response
+        return True, self.merge_chunks([response for _, response in responses])
+
+    def merge_chunks(self, responses):
+        """Merge the responses of the chunks into one list."""
+        return list(itertools.chain.from_iterable(responses))
+
+
+class AtlasLatestRequest(ProbeChunksMixin, AtlasRequest):
+    """
+    Atlas request for fetching the latest results of a measurement.
+    Long lists of probe ids are split into several requests, see
+    ProbeChunksMixin.
+    """
 
     def __init__(self, msm_id, probe_ids=(), **kwargs):
         super(AtlasLatestRequest, self).__init__(**kwargs)
@@ -273,6 +431,7 @@ class AtlasLatestRequest(AtlasRequest):
 
         self.msm_id = msm_id
         self.probe_ids = None
+        self.max_workers = kwargs.get("max_workers") or 4
 
         self.url_path = self.url_path.format(self.msm_id)
 
@@ -302,11 +461,15 @@ class AtlasLatestRequest(AtlasRequest):
 
     def create(self):
         """Sends the GET request."""
-        return self.get()
+        return self.get_chunks()
 
 
-class AtlasResultsRequest(AtlasRequest):
-    """Atlas request for fetching results of a measurement."""
+class AtlasResultsRequest(ProbeChunksMixin, AtlasRequest):
+    """
+    Atlas request for fetching results of a measurement. Long lists of
+    probe ids are split into several requests, see ProbeChunksMixin, whose
+    results are merged by time.
+    """
 
     def __init__(self, **kwargs):
         super(AtlasResultsRequest, self).__init__(**kwargs)
@@ -318,6 +481,7 @@ class AtlasResultsRequest(AtlasRequest):
         self.stop = self.clean_time(kwargs.get("stop"))
 
         self.probe_ids = self.clean_probes(kwargs.get("probe_ids"))
+        self.max_workers = kwargs.get("max_workers") or 4
 
         self.url_path = self.url_path.format(self.msm_id)
 
@@ -340,24 +504,69 @@ class AtlasResultsRequest(AtlasRequest):
         """
         url_params = {}
 
-        if self.start:
-            url_params.update(
-                {"start": int(calendar.timegm(self.start.timetuple()))}
-            )
+        if self.start is not None:
+            url_params.update({"start": self.start})
 
-        if self.stop:
-            url_params.update(
-                {"stop": int(calendar.timegm(self.stop.timetuple()))}
-            )
+        if self.stop is not None:
+            url_params.update({"stop": self.stop})
 
         if self.probe_ids:
             url_params.update({"probe_ids": self.probe_ids})
 
         self.http_method_args["params"].update(url_params)
 
+    def merge_chunks(self, responses):
+        """Merge the results of the chunks by time."""
+        return list(heapq.merge(*responses, key=result_time))
+
+    def iter_lines(self):
+        """
+        Streams the results as newline delimited JSON, yielding every result
+        undecoded as bytes so it can be decoded or stored as needed. When
+        the probe ids are split, the results of every chunk follow the
+        ones of the previous chunk.
+        """
+        chunk_requests = self.chunk_requests()
+        if len(chunk_requests) == 1:
+            return self.stream(format="txt")
+        return itertools.chain.from_iterable(
+            request.stream(format="txt") for request in chunk_requests
+        )
+
+    def iter_chunks(self, chunk_size=1 << 20):
+        """
+        Streams the results as newline delimited JSON in chunks of bytes of
+        about chunk_size, every chunk ending with a complete result.
+        """
+        for request in self.chunk_requests():
+            rest = b""
+            for data in request.stream_chunks(chunk_size, format="txt"):
+                end = data.rfind(b"\n")
+                if end < 0:
+                    rest += data
+                    continue
+                yield rest + data[:end + 1]
+                rest = data[end + 1:]
+            if rest.strip():
+                yield rest
+
+    def iter_results(self):
+        """
+        Streams the results, yielding them one by one as dictionaries. When
+        the probe ids are split, the chunks are streamed together and their
+        results merged by time.
+        """
+        chunk_requests = self.chunk_requests()
+        if len(chunk_requests) > 1:
+            return heapq.merge(
+                *(request.iter_results() for request in chunk_requests),
+                key=result_time
+            )
+        return (json.loads(line) for line in self.iter_lines())
+
     def create(self):
         """Sends the GET request."""
-        return self.get()
+        return self.get_chunks()
 
 
 __all__ = [
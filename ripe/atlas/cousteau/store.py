@@ -0,0 +1,288 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing an append-only local store of raw results. Results are
+kept as JSON lines in segment files read through mmap, and every measurement
+has an index of (prb_id, timestamp) -> location so that queries for a probe
+and time range go straight to the matching results.
+"""
+
+import bisect
+import json
+from collections import OrderedDict
+import mmap
+import os
+import re
+import struct
+
+from .exceptions import CousteauGenericError
+
+# prb_id, timestamp, segment number, offset and length of the result line
+INDEX_RECORD = struct.Struct("<qqIQI")
+
+SEGMENT_NAME = "segment-{0:06d}.jsonl"
+SEGMENT_RE = re.compile(r"^segment-(\d{6})\.jsonl$")
+INDEX_NAME = "index-{0}.bin"
+INDEX_RE = re.compile(r"^index-(\d+)\.bin$")
+# Index files kept open for appending, the least recently used is closed
+MAX_INDEX_FILES = 64
+
+
+class MeasurementIndex(object):
+    """
+    Index of the results of one measurement. For every probe it keeps the
+    sorted timestamps and, at the same positions, the result locations.
+    """
+
+    def __init__(self):
+        self.probes = {}
+
+    def __len__(self):
+        return sum(len(timestamps) for timestamps, _ in self.probes.values())
+
+    def __contains__(self, key):
+        prb_id, timestamp = key
+        if prb_id not in self.probes:
+            return False
+        timestamps = self.probes[prb_id][0]
+        position = bisect.bisect_left(timestamps, timestamp)
+        return position < len(timestamps) and timestamps[position] == timestamp
+
+    def add(self, prb_id, timestamp, location):
+        timestamps, locations = self.probes.setdefault(prb_id, ([], []))
+        # Results mostly arrive in time order, making this an append.
+        position = bisect.bisect_right(timestamps, timestamp)
+        timestamps.insert(position, timestamp)
+        locations.insert(position, location)
+
+    def find(self, prb_id=None, start=None, stop=None):
+        """Return the (timestamp, location) pairs matching, in time order."""
+        prb_ids = self.probes if prb_id is None else (prb_id,)
+        found = []
+        for probe in prb_ids:
+            if probe not in self.probes:
+                continue
+            timestamps, locations = self.probes[probe]
+            low = 0 if start is None else bisect.bisect_left(timestamps, start)
+            high = (
+                len(timestamps) if stop is None
+                else bisect.bisect_right(timestamps, stop)
+            )
+            found.extend(zip(timestamps[low:high], locations[low:high]))
+        if prb_id is None:
+            found.sort(key=lambda item: item[0])
+        return found
+
+
+class ResultStore(object):
+    """
+    Append-only store of raw results under a directory. Results are appended
+    to segment files of about segment_size bytes, which are read back
+    through mmap, and indexed per measurement by probe and timestamp.
+    Results already in the store (same msm_id, prb_id and timestamp) are
+    skipped, so overlapping downloads can be stored again safely.
+    Usage:
+        with ResultStore("results") as store:
+            store.write_lines(AtlasResultsRequest(msm_id=1001).iter_lines())
+            for result in store.query(1001, prb_id=12, start=time.time() - 86400):
+                print(result["avg"])
+    """
+
+    def __init__(self, directory, segment_size=256 * 1024 * 1024):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.indexes = {}
+        self._index_files = OrderedDict()
+        self._maps = {}
+        self._segment = None
+        self._segment_number = 0
+        self._segment_offset = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        """Read the indexes, dropping records not fully written to a segment."""
+        sizes = {}
+        for name in os.listdir(self.directory):
+            match = SEGMENT_RE.match(name)
+            if match:
+                sizes[int(match.group(1))] = os.path.getsize(self._path(name))
+
+        for name in os.listdir(self.directory):
+            match = INDEX_RE.match(name)
+            if not match:
+                continue
+            index = self.indexes.setdefault(int(match.group(1)), MeasurementIndex())
+            with open(self._path(name), "rb") as index_file:
+                data = index_file.read()
+            usable = len(data) - len(data) % INDEX_RECORD.size
+            for prb_id, timestamp, segment, offset, length in \
+                    INDEX_RECORD.iter_unpack(data[:usable]):
+                if offset + length <= sizes.get(segment, 0):
+                    index.add(prb_id, timestamp, (segment, offset, length))
+
+        if sizes:
+            self._segment_number = max(sizes)
+            self._segment_offset = sizes[self._segment_number]
+
+    def _get_segment(self, size):
+        """Return the segment file to append size bytes to, rolling it over."""
+        if self._segment is not None and \
+                self._segment_offset + size > self.segment_size and \
+                self._segment_offset > 0:
+            self._segment.close()
+            self._segment = None
+            self._segment_number += 1
+            self._segment_offset = 0
+
+        if self._segment is None:
+            self._segment_number = self._segment_number or 1
+            path = self._path(SEGMENT_NAME.format(self._segment_number))
+            self._segment = open(path, "ab")
+            self._segment_offset = self._segment.tell()
+            if self._segment_offset + size > self.segment_size and \
+                    self._segment_offset > 0:
+                return self._get_segment(size)
+        return self._segment
+
+    def _get_index_file(self, msm_id):
+        index_file = self._index_files.get(msm_id)
+        if index_file is not None:
+            self._index_files.move_to_end(msm_id)
+            return index_file
+
+        if len(self._index_files) >= MAX_INDEX_FILES:
+            _, oldest = self._index_files.popitem(last=False)
+            oldest.close()
+        index_file = open(self._path(INDEX_NAME.format(msm_id)), "ab")
+        self._index_files[msm_id] = index_file
+        return index_file
+
+    def append(self, result):
+        """
+        Add a result, given as a dictionary or as a raw JSON line. Returns
+        False if the result was already in the store.
+        """
+        if isinstance(result, dict):
+            line = json.dumps(result, separators=(",", ":")).encode("utf-8")
+        else:
+            line = result.encode("utf-8") if isinstance(result, str) else result
+            line = line.strip()
+            result = json.loads(line)
+
+        try:
+            msm_id = int(result["msm_id"])
+            prb_id = int(result["prb_id"])
+            timestamp = int(result["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            raise CousteauGenericError(
+                "Results need msm_id, prb_id and timestamp to be stored."
+            )
+
+        index = self.indexes.setdefault(msm_id, MeasurementIndex())
+        if (prb_id, timestamp) in index:
+            return False
+
+        segment = self._get_segment(len(line) + 1)
+        location = (self._segment_number, self._segment_offset, len(line))
+        segment.write(line + b"\n")
+        self._segment_offset += len(line) + 1
+
+        index.add(prb_id, timestamp, location)
+        self._get_index_file(msm_id).write(
+            INDEX_RECORD.pack(prb_id, timestamp, *location)
+        )
+        return True
+
+    def write_lines(self, lines):
+        """Add raw results, e.g. from AtlasResultsRequest.iter_lines()."""
+        return sum(self.append(line) for line in lines if line)
+
+    def extend(self, results):
+        """Add results given as dictionaries."""
+        return sum(self.append(result) for result in results)
+
+    def flush(self):
+        """Write the segment and then the indexes to disk."""
+        if self._segment is not None:
+            self._segment.flush()
+        for index_file in self._index_files.values():
+            index_file.flush()
+
+    def _read(self, location):
+        segment, offset, length = location
+        if segment == self._segment_number and self._segment is not None:
+            self._segment.flush()
+
+        current = self._maps.get(segment)
+        if current is None or len(current) < offset + length:
+            if current is not None:
+                current.close()
+            with open(self._path(SEGMENT_NAME.format(segment)), "rb") as f:
+                current = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = current
+        return current[offset:offset + length]
+
+    def query(self, msm_id, prb_id=None, start=None, stop=None, raw=False):
+        """
+        Yield the results of a measurement in time order, optionally only
+        those of one probe and between start and stop (UNIX timestamps,
+        both included). raw=True yields the JSON lines undecoded.
+        """
+        index = self.indexes.get(msm_id)
+        if index is None:
+            return
+        for _, location in index.find(prb_id, start, stop):
+            line = self._read(location)
+            yield line if raw else json.loads(line)
+
+    def measurements(self):
+        """Return the ids of the measurements in the store."""
+        return sorted(self.indexes)
+
+    def probes(self, msm_id):
+        """Return the ids of the probes with results for a measurement."""
+        index = self.indexes.get(msm_id)
+        return sorted(index.probes) if index else []
+
+    def __len__(self):
+        return sum(len(index) for index in self.indexes.values())
+
+    def close(self):
+        """Flush everything to disk and release the files and mappings."""
+        self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        for index_file in self._index_files.values():
+            index_file.close()
+        self._index_files = OrderedDict()
+        for segment_map in self._maps.values():
+            segment_map.close()
+        self._maps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+__all__ = ["ResultStore"]
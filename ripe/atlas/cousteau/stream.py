@@ -16,7 +16,10 @@
 from urllib.parse import urlparse
 import os
 from typing import Dict, Callable, List, Tuple, Any, Optional, Iterator
-from typing_extensions import TypeAlias
+try:
+    from typing import TypeAlias
+except ImportError:  # Python < 3.10
+    from typing_extensions import TypeAlias
 import json
 import logging
 import re
@@ -28,12 +31,145 @@ import select
 import requests
 import websocket
 
+from . import instrumentation
 from .version import __version__
 
 LOG = logging.getLogger("atlas-stream")
 LOG.addHandler(logging.NullHandler())
 
 
+def message_size(msg: Any) -> int:
+    """Return the size in bytes of a message received as text or binary."""
+    if isinstance(msg, str):
+        return len(msg.encode("utf-8"))
+    return len(msg)
+
+
+class StreamStats:
+    """
+    Throughput and lag of an AtlasStream, accumulated over windows of
+    `interval` seconds. At the end of every window a snapshot is taken and
+    given to `callback` if one is set, AtlasStream.iter() and
+    StreamBroker.serve() wake up for it even if no message arrives. Lag is
+    the time between the result `timestamp` (or `stored_timestamp`) and its
+    arrival, a growing lag means the consumer is falling behind the stream.
+    Usage:
+        stream.track_stats(interval=60, callback=LOG.info)
+        stream.timeout(seconds=600)
+        print(stream.stats.last)
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.interval = interval
+        self.callback = callback
+        self.clock = clock
+        self.totals: Dict[str, int] = {}
+        self.last: Optional[Dict[str, Any]] = None
+        self.reset(clock())
+
+    def reset(self, now: float) -> None:
+        self.window_start = now
+        self.events: Dict[str, int] = {}
+        self.bytes = 0
+        self.decode_seconds = 0.0
+        self.callbacks = 0
+        self.callback_seconds = 0.0
+        # count, total, max and last of the result and stored lags
+        self.lag = [0, 0.0, 0.0, 0.0]
+        self.stored_lag = [0, 0.0, 0.0, 0.0]
+
+    @staticmethod
+    def add_lag(lag: List, value: float) -> None:
+        lag[0] += 1
+        lag[1] += value
+        if value > lag[2] or lag[0] == 1:
+            lag[2] = value
+        lag[3] = value
+
+    def record_message(
+        self, event_name: str, size: int, decode_seconds: float, payload: Any
+    ) -> None:
+        """Account for a message received from the stream."""
+        now = self.clock()
+        self.events[event_name] = self.events.get(event_name, 0) + 1
+        self.bytes += size
+        self.decode_seconds += decode_seconds
+        if event_name == AtlasStream.EVENT_NAME_RESULTS and isinstance(payload, dict):
+            timestamp = payload.get("timestamp")
+            if isinstance(timestamp, (int, float)):
+                self.add_lag(self.lag, now - timestamp)
+            stored_timestamp = payload.get("stored_timestamp")
+            if isinstance(stored_timestamp, (int, float)):
+                self.add_lag(self.stored_lag, now - stored_timestamp)
+        self.tick(now)
+
+    def seconds_left(self, now: Optional[float] = None) -> float:
+        """Return the seconds until the end of the current window."""
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.window_start + self.interval - now)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Take a snapshot if the current window has ended."""
+        if now is None:
+            now = self.clock()
+        if now - self.window_start >= self.interval:
+            self.snapshot(now)
+
+    def record_callback(self, seconds: float) -> None:
+        """Account for the time spent in a bound callback."""
+        self.callbacks += 1
+        self.callback_seconds += seconds
+
+    @staticmethod
+    def lag_summary(lag: List) -> Optional[Dict[str, float]]:
+        count, total, maximum, last = lag
+        if not count:
+            return None
+        return {"mean": total / count, "max": maximum, "last": last}
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Return the statistics of the current window, start a new window and
+        call the callback with the snapshot.
+        """
+        if now is None:
+            now = self.clock()
+        seconds = now - self.window_start
+        messages = sum(self.events.values())
+        for event_name, count in self.events.items():
+            self.totals[event_name] = self.totals.get(event_name, 0) + count
+
+        snapshot = {
+            "time": now,
+            "seconds": seconds,
+            "events": dict(self.events),
+            "events_per_second": {
+                event_name: count / seconds if seconds > 0 else 0.0
+                for event_name, count in self.events.items()
+            },
+            "bytes": self.bytes,
+            "bytes_per_second": self.bytes / seconds if seconds > 0 else 0.0,
+            "decode_seconds": self.decode_seconds / messages if messages else 0.0,
+            "callback_seconds": (
+                self.callback_seconds / self.callbacks if self.callbacks else 0.0
+            ),
+            "lag": self.lag_summary(self.lag),
+            "stored_lag": self.lag_summary(self.stored_lag),
+            "totals": dict(self.totals),
+        }
+        self.last = snapshot
+        self.reset(now)
+        if self.callback is not None:
+            self.callback(snapshot)
+        return snapshot
+
+
 class AtlasStream:
     # For the current list of events see:
     # https://atlas.ripe.net/docs/result-streaming/
@@ -104,6 +240,7 @@ class AtlasStream:
         self.subscriptions: List[Dict] = []
 
         self.ws: Optional[websocket.WebSocket] = None
+        self.stats: Optional[StreamStats] = None
 
     def _get_proxy_options(self):
         """
@@ -132,6 +269,18 @@ class AtlasStream:
             res.update({ "http_proxy_auth" : (parsed.username, parsed.password) })
         return res
 
+    def track_stats(
+        self,
+        interval: float = 10.0,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> StreamStats:
+        """
+        Start tracking throughput, decode and callback times and result lag,
+        calling `callback` with a snapshot every `interval` seconds.
+        """
+        self.stats = StreamStats(interval=interval, callback=callback)
+        return self.stats
+
     def connect(self) -> None:
         while self.ws is None:
             try:
@@ -191,12 +340,33 @@ class AtlasStream:
         """
         ws.send(json.dumps([msg_type, payload]))
 
+    def recv_raw(self, ws: websocket.WebSocket) -> str:
+        """
+        Receive a single message from the server, without decoding it.
+        """
+        return ws.recv()
+
     def recv(self, ws: websocket.WebSocket) -> Tuple[str, Any]:
         """
         Receive a single message from the server.
         """
-        msg = ws.recv()
+        msg = self.recv_raw(ws)
+        if self.stats is None and "stream_message" not in instrumentation.hooks:
+            event_name, payload = json.loads(msg)
+            return event_name, payload
+
+        start = time.perf_counter()
         event_name, payload = json.loads(msg)
+        decode_seconds = time.perf_counter() - start
+        size = message_size(msg)
+        if self.stats is not None:
+            self.stats.record_message(event_name, size, decode_seconds, payload)
+        if "stream_message" in instrumentation.hooks:
+            instrumentation.fire("stream_message", {
+                "event_name": event_name,
+                "bytes": size,
+                "decode_seconds": decode_seconds,
+            })
         return event_name, payload
 
     def iter(self, seconds: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
@@ -205,14 +375,22 @@ class AtlasStream:
         """
         t0 = time.perf_counter()
         while True:
+            wait = None
             if seconds is not None:
                 elapsed = time.perf_counter() - t0
-                remaining = seconds - elapsed
-                if remaining < 0:
+                wait = seconds - elapsed
+                if wait < 0:
                     break
-                rlist, _, _ = select.select([self.ws], [], [], remaining)
+            if self.stats is not None:
+                # Wake up for the stats snapshot even if nothing arrives
+                stats_wait = self.stats.seconds_left()
+                wait = stats_wait if wait is None else min(wait, stats_wait)
+            if wait is not None:
+                rlist, _, _ = select.select([self.ws], [], [], wait)
                 if not rlist:
-                    break
+                    if self.stats is not None:
+                        self.stats.tick()
+                    continue
             try:
                 yield self.recv(self.ws)
             except Exception as exc:
@@ -230,8 +408,14 @@ class AtlasStream:
         """
         for event_name, payload in self.iter(seconds=seconds):
             callback = self.callbacks.get(event_name)
-            if callback:
+            if not callback:
+                continue
+            if self.stats is None:
                 callback(payload)
+                continue
+            start = time.perf_counter()
+            callback(payload)
+            self.stats.record_callback(time.perf_counter() - start)
 
     def __iter__(self):
         """
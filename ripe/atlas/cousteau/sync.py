@@ -0,0 +1,154 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing helpers that keep a local copy of the probe and
+measurement catalogs up to date by fetching only what changed since the last
+synchronisation.
+"""
+
+import json
+import os
+import time
+
+from .api_listing import ProbeRequest, MeasurementRequest
+from .exceptions import CousteauGenericError
+
+
+class CatalogSync(object):
+    """
+    Keeps a local store of entities in sync with the ATLAS API. The first
+    sync lists every entity, the following ones only fetch entities with an
+    id higher than any seen before plus the ones matching change_filters:
+    API filters that get the time of the previous sync as value, or pairs of
+    lower and upper bound filters that select the time between the previous
+    sync and this one.
+
+    The store can be any mapping, entities are upserted with their id as a
+    string key so that shelve or dbm backed stores work too. The sync point
+    is persisted in state_file if one is given.
+    """
+
+    request_class = None
+    change_filters = ()
+
+    def __init__(self, store=None, state_file=None, change_filters=None,
+                 **request_kwargs):
+        if request_kwargs.get("return_objects"):
+            raise CousteauGenericError(
+                "Catalogs are synced as dictionaries, return_objects is not "
+                "supported."
+            )
+        self.store = {} if store is None else store
+        self.state_file = state_file
+        if change_filters is not None:
+            self.change_filters = tuple(change_filters)
+        self.request_kwargs = request_kwargs
+        self.state = self.load_state()
+
+    def load_state(self):
+        """Return the last sync point, stored in the state file if any."""
+        state = {"last_sync": None, "max_id": None}
+        if self.state_file:
+            try:
+                with open(self.state_file) as state_file:
+                    state.update(json.load(state_file))
+            except FileNotFoundError:
+                pass
+        return state
+
+    def save_state(self):
+        """Atomically write the last sync point to the state file."""
+        if not self.state_file:
+            return
+        tmp_file = "{0}.tmp".format(self.state_file)
+        with open(tmp_file, "w") as state_file:
+            json.dump(self.state, state_file)
+        os.replace(tmp_file, self.state_file)
+
+    def get_queries(self, until=None):
+        """
+        Return the list of filters needed to fetch the changes made up to
+        until (now by default).
+        """
+        if self.state["max_id"] is None:
+            return [{}]
+
+        if until is None:
+            until = int(time.time())
+        queries = [{"id__gt": self.state["max_id"]}]
+        if self.state["last_sync"] is not None:
+            for change_filter in self.change_filters:
+                if isinstance(change_filter, str):
+                    queries.append({change_filter: self.state["last_sync"]})
+                    continue
+                lower, upper = change_filter
+                queries.append({lower: self.state["last_sync"], upper: until})
+        return queries
+
+    def sync(self):
+        """
+        Fetch the entities created or changed since the last sync and upsert
+        them to the store. Returns the number of upserted entities.
+        """
+        started = int(time.time())
+        max_id = self.state["max_id"]
+        upserted = 0
+
+        for filters in self.get_queries(started):
+            query = dict(self.request_kwargs, **filters)
+            for entity in self.request_class(**query):
+                self.store[str(entity["id"])] = entity
+                if max_id is None or entity["id"] > max_id:
+                    max_id = entity["id"]
+                upserted += 1
+
+        # Changes made while we were listing are picked up by the next sync
+        self.state = {"last_sync": started, "max_id": max_id}
+        self.save_state()
+
+        return upserted
+
+
+class ProbeSync(CatalogSync):
+    """
+    Keeps a local store of probes in sync. Besides new probes it refreshes
+    the ones whose status changed since the last sync.
+    e.g.
+    probes = ProbeSync(store=shelf, state_file="probes.state", client=client)
+    probes.sync()
+    """
+    request_class = ProbeRequest
+    change_filters = (("status_since__gte", "status_since__lte"),)
+
+
+class MeasurementSync(CatalogSync):
+    """
+    Keeps a local store of measurements in sync. Besides new measurements it
+    refreshes the ones that started or stopped, so changed status, since the
+    last sync. Bounding the times to this sync leaves out the measurements
+    scheduled to start or stop later, they are fetched once they do.
+    e.g.
+    measurements = MeasurementSync(state_file="msms.state", client=client)
+    measurements.sync()
+    """
+    request_class = MeasurementRequest
+    change_filters = (
+        ("start_time__gte", "start_time__lte"),
+        ("stop_time__gte", "stop_time__lte"),
+    )
+
+
+__all__ = ["CatalogSync", "ProbeSync", "MeasurementSync"]
@@ -0,0 +1,97 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module converting between the UNIX timestamps used by the API and datetime
+objects. Times are kept as int timestamps and only turned into datetime
+objects when they are read. ISO-8601 strings are parsed by the standard
+library, dateutil is only imported for other formats.
+"""
+
+from calendar import timegm
+from datetime import date, datetime, timedelta, timezone
+
+from .exceptions import CousteauGenericError
+
+UTC = timezone.utc
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+
+def parse(value):
+    """
+    Parse a time string, e.g. "2015-10-16T00:00:00Z", into a datetime.
+    The result is naive if the string has no timezone.
+    """
+    try:
+        if value.endswith(("Z", "z")):
+            # datetime.fromisoformat only accepts Z from Python 3.11
+            return datetime.fromisoformat(value[:-1] + "+00:00")
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    from dateutil import parser
+    try:
+        return parser.parse(value)
+    except (ValueError, OverflowError):
+        raise CousteauGenericError("Invalid time: {0!r}".format(value))
+
+
+def to_timestamp(value):
+    """
+    Return the UNIX timestamp of a number, a datetime, a date or a time
+    string as an int. Strings of more than 8 digits are taken as timestamps,
+    naive datetimes and other strings are taken to be in UTC.
+    None is returned as is.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        # Shorter digit strings are dates like "20151016", not timestamps
+        if value.isdigit() and len(value) > 8:
+            return int(value)
+        value = parse(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return (value - NAIVE_EPOCH) // SECOND
+        return (value - EPOCH) // SECOND
+    if isinstance(value, date):
+        return timegm(value.timetuple())
+    raise CousteauGenericError("Invalid time: {0!r}".format(value))
+
+
+def to_datetime(value):
+    """
+    Return a timezone aware datetime in UTC for a UNIX timestamp, a time
+    string or a datetime. None is returned as is.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, UTC)
+    if isinstance(value, str):
+        value = parse(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
+    raise CousteauGenericError("Invalid time: {0!r}".format(value))
+
+
+__all__ = ["parse", "to_timestamp", "to_datetime"]
@@ -0,0 +1,219 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module containing the HTTP transports that AtlasRequest can use to talk to
+the ATLAS API. A transport is any object with a request(method, url, **kwargs)
+method returning a response that has ok, status_code, text and json().
+Transports supporting streamed downloads also have a stream() method, a
+context manager giving a response with iter_lines() and iter_content().
+"""
+
+import time
+from contextlib import closing, contextmanager
+
+import requests
+
+from . import instrumentation
+from .exceptions import CousteauGenericError
+
+# Seconds HTTP2Transport waits to connect, send, or receive the next data
+DEFAULT_TIMEOUT = 60.0
+
+
+class RequestsTransport(object):
+    """
+    Transport sending requests through the requests library. If a session is
+    given, connections are kept alive and reused between requests.
+    Usage:
+        transport = RequestsTransport(session=requests.Session())
+        ProbeRequest(transport=transport, country_code="NL")
+    """
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def request(self, method, url, **kwargs):
+        """Sends the request and returns the requests response."""
+        if self.session is None:
+            return requests.request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def stream(self, method, url, **kwargs):
+        """
+        Context manager sending the request without reading the body, which
+        can then be consumed with iter_lines().
+        """
+        return closing(self.request(method, url, stream=True, **kwargs))
+
+    def close(self):
+        """Closes the underlying session if there is one."""
+        if self.session is not None:
+            self.session.close()
+
+
+def trace_timings(timings):
+    """
+    Return an httpx trace callback storing the duration of every connection
+    and request phase (e.g. connect_tcp, start_tls) in timings, in seconds.
+    """
+    started = {}
+
+    def trace(event_name, info):
+        phase, _, state = event_name.rpartition(".")
+        phase = phase.rpartition(".")[2]
+        if state == "started":
+            started[phase] = time.perf_counter()
+        elif state == "complete" and phase in started:
+            timings[phase] = time.perf_counter() - started.pop(phase)
+
+    return trace
+
+
+class HTTP2Response(object):
+    """
+    Thin wrapper giving an httpx response the attributes AtlasRequest expects
+    from a requests response.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.ok = response.status_code < 400
+        self.timings = {}
+
+    @property
+    def text(self):
+        return self.response.text
+
+    @property
+    def content(self):
+        return self.response.content
+
+    def json(self):
+        return self.response.json()
+
+    def iter_lines(self):
+        """Yield the body line by line as bytes, like requests does."""
+        for line in self.response.iter_lines():
+            yield line.encode("utf-8")
+
+    def iter_content(self, chunk_size=None):
+        """Yield the body in chunks of bytes, like requests does."""
+        return self.response.iter_bytes(chunk_size)
+
+
+class HTTP2Transport(object):
+    """
+    Transport multiplexing concurrent requests over a small number of HTTP/2
+    connections. Needs httpx installed with its http2 extra
+    (pip install ripe.atlas.cousteau[http2]).
+
+    The same transport can be shared between threads, every request made
+    in parallel becomes a stream on one of the open connections.
+    Certificate verification and proxies are connection wide settings in
+    httpx, so they are given here and the per request values are ignored.
+    timeout applies to every request unless one gives its own, None waits
+    forever.
+    Usage:
+        transport = HTTP2Transport(max_connections=2)
+        probes = [Probe(id=i, transport=transport) for i in ids]
+    """
+
+    def __init__(self, verify=True, proxies=None, max_connections=2,
+                 timeout=DEFAULT_TIMEOUT, **client_kwargs):
+        try:
+            import httpx
+        except ImportError:
+            raise CousteauGenericError(
+                "HTTP2Transport requires httpx with http2 support to be installed."
+            )
+
+        self._httpx = httpx
+        proxies = proxies or {}
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            proxy=proxies.get("https"),
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=timeout,
+            **client_kwargs
+        )
+
+    def merge_params(self, url, params):
+        """
+        Return the url with params added to its query string. httpx would
+        otherwise replace the query string, e.g. of listing next urls.
+        """
+        if not params:
+            return url
+        return self._httpx.URL(url).copy_merge_params(params)
+
+    @staticmethod
+    def timeout_of(kwargs):
+        """Return the timeout given to a request, if any, for httpx."""
+        if "timeout" in kwargs:
+            return {"timeout": kwargs["timeout"]}
+        return {}
+
+    def request(self, method, url, params=None, headers=None, json=None,
+                **kwargs):
+        """
+        Sends the request over HTTP/2. Network errors are raised as requests
+        exceptions so that AtlasRequest handles them as with the default
+        transport.
+        """
+        timings = {}
+        extensions = {}
+        if "request" in instrumentation.hooks:
+            extensions["trace"] = trace_timings(timings)
+
+        try:
+            response = self.client.request(
+                method, self.merge_params(url, params), headers=headers,
+                json=json, extensions=extensions, **self.timeout_of(kwargs)
+            )
+        except self._httpx.HTTPError as exc:
+            raise requests.exceptions.RequestException(*exc.args)
+
+        response = HTTP2Response(response)
+        response.timings = timings
+        return response
+
+    @contextmanager
+    def stream(self, method, url, params=None, headers=None, json=None,
+               **kwargs):
+        """
+        Context manager sending the request over HTTP/2 without reading the
+        body, which can then be consumed with iter_lines().
+        """
+        try:
+            with self.client.stream(
+                method, self.merge_params(url, params), headers=headers,
+                json=json, **self.timeout_of(kwargs)
+            ) as response:
+                if response.status_code >= 400:
+                    response.read()
+                yield HTTP2Response(response)
+        except self._httpx.HTTPError as exc:
+            raise requests.exceptions.RequestException(*exc.args)
+
+    def close(self):
+        """Closes all the open connections."""
+        self.client.close()
+
+
+__all__ = ["RequestsTransport", "HTTP2Transport"]
@@ -13,6 +13,14 @@ install_requires = [
     "typing-extensions",
 ]
 
+extras_require = {
+    "http2": ["httpx[http2]"],
+    "arrow": ["pyarrow"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "opentelemetry": ["opentelemetry-api"],
+}
+
 # Get proper long description for package
 current_dir = dirname(abspath(__file__))
 description = open(join(current_dir, "README.rst")).read()
@@ -34,6 +42,7 @@ setup(
     maintainer="The RIPE Atlas Team",
     maintainer_email="atlas@ripe.net",
     install_requires=install_requires,
+    extras_require=extras_require,
     keywords=["RIPE", "RIPE NCC", "RIPE Atlas"],
     classifiers=[
         "Operating System :: POSIX",
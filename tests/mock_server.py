@@ -0,0 +1,343 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+In-process mock of the ATLAS API serving synthetic payloads over plain HTTP:
+the probes and measurements listings and objects, measurement results and
+latest results (with entity tags for conditional requests), and a WebSocket
+result stream. Requests can be slowed down by
+a fixed latency to mimic a remote server.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from .payloads import make_probe, make_measurement, make_ping_result
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+LISTING_RE = re.compile(r"^/api/v2/(probes|measurements)/$")
+OBJECT_RE = re.compile(r"^/api/v2/(probes|measurements)/(\d+)/$")
+RESULTS_RE = re.compile(r"^/api/v2/measurements/(\d+)/(results|latest)/?$")
+
+
+class MockAtlasHandler(BaseHTTPRequestHandler):
+    """Handler answering the ATLAS API paths from the server's settings."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes, avoid delayed ACK stalls.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def mock(self):
+        return self.server.mock
+
+    def do_GET(self):
+        self.mock.count_request()
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            return self.serve_stream()
+
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+
+        match = LISTING_RE.match(url.path)
+        if match:
+            return self.send_json(self.listing(match.group(1), url.path, params))
+
+        match = OBJECT_RE.match(url.path)
+        if match:
+            kind, object_id = match.group(1), int(match.group(2))
+            if object_id > self.mock.total(kind):
+                return self.send_json({"error": {"status": 404}}, status=404)
+            return self.send_json(self.mock.make(kind, object_id))
+
+        match = RESULTS_RE.match(url.path)
+        if match:
+            msm_id = int(match.group(1))
+            if match.group(2) == "latest":
+                etag = self.mock.latest_etag(msm_id, params)
+                if self.headers.get("If-None-Match") == etag:
+                    return self.send_not_modified(etag)
+                return self.send_json(self.mock.latest(msm_id, params), etag=etag)
+            return self.send_results(msm_id, params)
+
+        self.send_json({"error": {"status": 404}}, status=404)
+
+    def listing(self, kind, path, params):
+        page_size = int(params.get("page_size", self.mock.page_size))
+        page = int(params.get("page", 1))
+        if params.get("id__in"):
+            ids = [int(i) for i in params["id__in"].split(",")]
+            ids = [i for i in ids if i <= self.mock.total(kind)]
+        else:
+            ids = range(1, self.mock.total(kind) + 1)
+
+        start = (page - 1) * page_size
+        results = [self.mock.make(kind, i) for i in ids[start:start + page_size]]
+
+        next_url = None
+        if start + page_size < len(ids):
+            params = dict(params, page=page + 1)
+            next_url = "{0}{1}?{2}".format(
+                self.mock.url, path,
+                "&".join("{0}={1}".format(k, v) for k, v in params.items())
+            )
+        return {
+            "count": len(ids), "next": next_url, "previous": None,
+            "results": results,
+        }
+
+    def send_json(self, payload, status=200, etag=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_results(self, msm_id, params):
+        """Send the results, as a JSON list or as JSON lines, in chunks."""
+        lines = (
+            json.dumps(result).encode("utf-8")
+            for result in self.mock.results(msm_id, params)
+        )
+        txt = params.get("format") == "txt"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain" if txt else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        chunk = [] if txt else [b"["]
+        size = 0
+        first = True
+        for line in lines:
+            if txt:
+                chunk.append(line + b"\n")
+            else:
+                chunk.append(line if first else b"," + line)
+            first = False
+            size += len(line)
+            if size >= 65536:
+                self.write_chunk(b"".join(chunk))
+                chunk, size = [], 0
+        if not txt:
+            chunk.append(b"]")
+        if chunk:
+            self.write_chunk(b"".join(chunk))
+        self.write_chunk(b"")
+
+    def write_chunk(self, data):
+        """Write a chunk of the body, an empty one ends the body."""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def serve_stream(self):
+        """Accept a WebSocket and send results on every subscription."""
+        key = self.headers["Sec-WebSocket-Key"]
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+        ).decode("ascii")
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                break
+            opcode, payload = frame
+            if opcode == 0x8:
+                self.write_frame(b"", opcode=0x8)
+                break
+            if opcode == 0x9:
+                self.write_frame(payload, opcode=0xA)
+                continue
+            if opcode != 0x1:
+                continue
+
+            event_name, parameters = json.loads(payload)
+            if event_name == "atlas_subscribe":
+                self.write_frame(json.dumps(["atlas_subscribed", parameters]).encode())
+                for result in self.mock.stream_results(parameters):
+                    self.write_frame(json.dumps(["atlas_result", result]).encode())
+        self.close_connection = True
+
+    def read_frame(self):
+        """Return (opcode, payload) of the next client frame, None on EOF."""
+        head = self.rfile.read(2)
+        if len(head) < 2:
+            return None
+        opcode = head[0] & 0x0F
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.rfile.read(8))[0]
+        mask = self.rfile.read(4) if head[1] & 0x80 else b"\x00" * 4
+        payload = bytearray(self.rfile.read(length))
+        for i in range(len(payload)):
+            payload[i] ^= mask[i % 4]
+        return opcode, bytes(payload)
+
+    def write_frame(self, payload, opcode=0x1):
+        length = len(payload)
+        if length < 126:
+            head = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.wfile.write(head + payload)
+
+
+class MockAtlasServer(object):
+    """
+    Mock ATLAS API listening on a local port, serving probes probes,
+    measurements measurements and, for every measurement, results ping
+    results from result_probes probes. Every HTTP request waits latency
+    seconds and the stream sends stream_results results per subscription.
+    Usage:
+        with MockAtlasServer(probes=5000, latency=0.02) as server:
+            for probe in ProbeRequest(server=server.url):
+                ...
+            stream = AtlasStream(base_url=server.url)
+    """
+
+    def __init__(self, probes=1000, measurements=100, results=10000,
+                 result_probes=100, packets=3, page_size=100, latency=0.0,
+                 stream_results=1000, seed=0, host="127.0.0.1", port=0):
+        self.probes = probes
+        self.measurements = measurements
+        self.result_count = results
+        self.result_probes = result_probes
+        self.packets = packets
+        self.page_size = page_size
+        self.latency = latency
+        self.stream_result_count = stream_results
+        self.seed = seed
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), MockAtlasHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.url = "http://{0}:{1}".format(*self.httpd.server_address[:2])
+        self.thread = None
+
+    def count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def total(self, kind):
+        return self.probes if kind == "probes" else self.measurements
+
+    def make(self, kind, object_id):
+        if kind == "probes":
+            return make_probe(object_id, self.seed)
+        return make_measurement(object_id, self.seed)
+
+    def result(self, msm_id, index):
+        return make_ping_result(
+            msm_id, index, self.result_probes, self.packets, self.seed
+        )
+
+    @staticmethod
+    def probe_ids(params):
+        """The probe ids the request filters on, None if it doesn't."""
+        if not params.get("probe_ids"):
+            return None
+        return {int(i) for i in params["probe_ids"].split(",")}
+
+    def results(self, msm_id, params):
+        """Yield the results of a measurement matching the request filters."""
+        probe_ids = self.probe_ids(params)
+        start = int(params.get("start", 0))
+        stop = int(params.get("stop", 2 ** 62))
+        for index in range(self.result_count):
+            result = self.result(msm_id, index)
+            if probe_ids is not None and result["prb_id"] not in probe_ids:
+                continue
+            if start <= result["timestamp"] <= stop:
+                yield result
+
+    def latest(self, msm_id, params=None):
+        """Return the last result of every probe, or of the requested ones."""
+        probe_ids = self.probe_ids(params or {})
+        last = max(self.result_count - self.result_probes, 0)
+        results = (
+            self.result(msm_id, index)
+            for index in range(last, min(last + self.result_probes, self.result_count))
+        )
+        return [
+            result for result in results
+            if probe_ids is None or result["prb_id"] in probe_ids
+        ]
+
+    def latest_etag(self, msm_id, params=None):
+        """
+        Entity tag of the latest results, which change with result_count and
+        the requested probes.
+        """
+        probe_ids = (params or {}).get("probe_ids", "")
+        return '"{0}-{1}-{2}-{3}"'.format(
+            msm_id, self.result_count, self.seed,
+            hashlib.sha1(probe_ids.encode("ascii")).hexdigest()[:8]
+        )
+
+    def stream_results(self, parameters):
+        msm_id = parameters.get("msm") or 1001
+        for index in range(self.stream_result_count):
+            yield self.result(msm_id, index)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,138 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Synthetic probes, measurements and results shaped like the ones of the ATLAS
+API. Every payload only depends on its id and the seed, so the mock server can
+generate any page on demand.
+"""
+
+import random
+
+COUNTRIES = ("NL", "DE", "FR", "GB", "US", "JP", "BR", "ZA", "AU", "IN")
+BASE_TIME = 1700000000
+
+
+def make_probe(probe_id, seed=0):
+    rand = random.Random(seed * 1000003 + probe_id)
+    asn = rand.randint(1000, 65000)
+    third = rand.randint(0, 255)
+    return {
+        "id": probe_id,
+        "address_v4": "10.{0}.{1}.{2}".format(
+            probe_id % 256, third, rand.randint(1, 254)
+        ),
+        "address_v6": None,
+        "asn_v4": asn,
+        "asn_v6": asn if rand.random() < 0.4 else None,
+        "country_code": rand.choice(COUNTRIES),
+        "description": "Synthetic probe {0}".format(probe_id),
+        "first_connected": BASE_TIME - rand.randint(10 ** 6, 10 ** 8),
+        "geometry": {
+            "type": "Point",
+            "coordinates": [
+                round(rand.uniform(-180, 180), 4), round(rand.uniform(-60, 70), 4)
+            ],
+        },
+        "is_anchor": rand.random() < 0.05,
+        "is_public": True,
+        "last_connected": BASE_TIME - rand.randint(0, 3600),
+        "prefix_v4": "10.{0}.{1}.0/24".format(probe_id % 256, third),
+        "prefix_v6": None,
+        "status": {"id": 1, "name": "Connected", "since": "2023-11-01T00:00:00Z"},
+        "status_since": BASE_TIME - 86400,
+        "tags": [
+            {"name": "system: V4 Works", "slug": "system-ipv4-works"},
+            {"name": "Home", "slug": "home"},
+        ],
+        "total_uptime": rand.randint(10 ** 5, 10 ** 8),
+        "type": "Probe",
+    }
+
+
+def make_measurement(msm_id, seed=0):
+    rand = random.Random(seed * 1000003 + msm_id)
+    start_time = BASE_TIME - rand.randint(0, 10 ** 7)
+    return {
+        "id": msm_id,
+        "af": 4,
+        "creation_time": start_time - 60,
+        "description": "Synthetic ping {0}".format(msm_id),
+        "group_id": msm_id,
+        "interval": 240,
+        "is_all_scheduled": True,
+        "is_oneoff": False,
+        "is_public": True,
+        "packet_interval": 1000,
+        "packets": 3,
+        "participant_count": rand.randint(1, 1000),
+        "probes_requested": 10,
+        "probes_scheduled": 10,
+        "resolve_on_probe": False,
+        "resolved_ips": ["193.0.14.129"],
+        "result": "https://atlas.ripe.net/api/v2/measurements/{0}/results/".format(
+            msm_id
+        ),
+        "size": 48,
+        "spread": None,
+        "start_time": start_time,
+        "status": {"id": 2, "name": "Ongoing", "when": None},
+        "stop_time": None,
+        "tags": [],
+        "target": "k.root-servers.net",
+        "target_asn": 25152,
+        "target_ip": "193.0.14.129",
+        "target_prefix": "193.0.14.0/23",
+        "type": "ping",
+    }
+
+
+def make_ping_result(msm_id, index, probes=100, packets=3, seed=0):
+    """Return the index-th result of a ping measurement run by probes probes."""
+    rand = random.Random(seed * 1000003 + msm_id * 7919 + index)
+    prb_id = index % probes + 1
+    # Rounds of 240 seconds in which probes report in order, like the API
+    # results sorted by time
+    timestamp = BASE_TIME + (index // probes) * 240 + (prb_id - 1) * 240 // probes
+    rtts = [round(rand.uniform(1, 300), 3) for _ in range(packets)]
+    lost = rand.random() < 0.05
+    replies = [{"x": "*"}] * packets if lost else [{"rtt": rtt} for rtt in rtts]
+    return {
+        "af": 4,
+        "avg": -1 if lost else round(sum(rtts) / packets, 3),
+        "dst_addr": "193.0.14.129",
+        "dst_name": "k.root-servers.net",
+        "dup": 0,
+        "from": "10.{0}.0.1".format(prb_id % 256),
+        "fw": 5080,
+        "group_id": msm_id,
+        "lts": rand.randint(1, 60),
+        "max": -1 if lost else max(rtts),
+        "min": -1 if lost else min(rtts),
+        "msm_id": msm_id,
+        "msm_name": "Ping",
+        "prb_id": prb_id,
+        "proto": "ICMP",
+        "rcvd": 0 if lost else packets,
+        "result": replies,
+        "sent": packets,
+        "size": 48,
+        "src_addr": "10.{0}.0.1".format(prb_id % 256),
+        "step": 240,
+        "stored_timestamp": timestamp + rand.randint(1, 120),
+        "timestamp": timestamp,
+        "ttl": rand.randint(40, 64),
+        "type": "ping",
+    }
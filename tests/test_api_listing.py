@@ -13,14 +13,34 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+import os
+import tempfile
+import unittest
 from unittest import mock
 from unittest import TestCase
 
 from ripe.atlas.cousteau.api_listing import RequestGenerator
+from ripe.atlas.cousteau.columnar import Column
 from ripe.atlas.cousteau import (
     ProbeRequest, AnchorRequest, MeasurementRequest
 )
-from ripe.atlas.cousteau.exceptions import APIResponseError
+from ripe.atlas.cousteau.exceptions import APIResponseError, CousteauGenericError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
 
 
 class TestRequestGenerator(TestCase):
@@ -366,6 +386,124 @@ class TestRequestGenerator(TestCase):
         mock.patch.stopall()
 
 
+class TestRequestGeneratorCursor(TestCase):
+    def setUp(self):
+        self.get = mock.patch('ripe.atlas.cousteau.request.AtlasRequest.get').start()
+        self.pages = [
+            (True, {
+                "count": 4, "next": "https://atlas.ripe.net/api/v2/probes/?page=2",
+                "results": [{"id": 1}, {"id": 2}]
+            }),
+            (True, {"count": 4, "next": None, "results": [{"id": 3}, {"id": 4}]}),
+        ]
+        self.get.side_effect = self.pages
+
+    def test_resume_from_cursor(self):
+        probes = ProbeRequest(status=1)
+        self.assertEqual(next(probes), {"id": 1})
+        cursor = json.loads(json.dumps(probes.get_cursor()))
+        self.assertEqual(cursor, {
+            "next_url": "/api/v2/probes/?page=2",
+            "split_urls": [],
+            "counts": [4],
+            "total_count_flag": True,
+            "pending": [{"id": 2}],
+        })
+
+        resumed = ProbeRequest(status=1, resume_from=cursor)
+        self.assertEqual(list(resumed), [{"id": 2}, {"id": 3}, {"id": 4}])
+        self.assertEqual(resumed.total_count, 4)
+        self.assertEqual(self.get.call_count, 2)
+
+    def test_checkpoint_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint = os.path.join(tmp_dir, "probes.json")
+            probes = ProbeRequest(status=1, checkpoint_file=checkpoint)
+            self.assertEqual(next(probes), {"id": 1})
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)["next_url"], "/api/v2/probes/?page=2")
+
+            # A new generator picks up where the checkpoint was saved
+            resumed = ProbeRequest(status=1, checkpoint_file=checkpoint)
+            self.assertEqual(
+                list(resumed), [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+            )
+            self.assertFalse(os.path.exists(checkpoint))
+
+    def tearDown(self):
+        mock.patch.stopall()
+
+
+class TestColumnarExport(TestCase):
+    def setUp(self):
+        self.get = mock.patch('ripe.atlas.cousteau.request.AtlasRequest.get').start()
+        self.get.side_effect = [
+            (True, {
+                "count": 2,
+                "next": "https://atlas.ripe.net/api/v2/measurements/?page=2",
+                "results": [{
+                    "id": 1, "type": {"id": 1, "name": "ping"}, "af": 4,
+                    "status": {"id": 2, "name": "Ongoing"},
+                    "start_time": 1439379910, "stop_time": None, "is_oneoff": False,
+                }]
+            }),
+            (True, {
+                "count": 2, "next": None,
+                "results": [{
+                    "id": 2, "type": "dns", "af": 6,
+                    "status": {"id": 4, "name": "Stopped"},
+                    "start_time": 1439379911, "stop_time": 1439380502,
+                    "is_oneoff": True,
+                }]
+            }),
+        ]
+        self.fields = ["id", "type", "status", "stop_time", "is_oneoff"]
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_to_columns(self):
+        columns = MeasurementRequest().to_columns(fields=self.fields + [
+            Column("status_id", ("status", "id"), "int"),
+            Column("probes", "probes_requested", "int"),
+        ])
+        self.assertEqual(columns["id"].dtype, numpy.int64)
+        self.assertEqual(columns["id"].tolist(), [1, 2])
+        self.assertEqual(columns["type"].tolist(), ["ping", "dns"])
+        self.assertEqual(columns["status"].tolist(), ["Ongoing", "Stopped"])
+        self.assertEqual(str(columns["stop_time"].dtype), "datetime64[s]")
+        self.assertTrue(numpy.isnat(columns["stop_time"][0]))
+        self.assertEqual(columns["stop_time"][1].astype(int), 1439380502)
+        self.assertEqual(columns["is_oneoff"].dtype, numpy.bool_)
+        self.assertEqual(columns["status_id"].tolist(), [2, 4])
+        self.assertEqual(columns["probes"].mask.tolist(), [True, True])
+        self.assertRaises(
+            CousteauGenericError, MeasurementRequest().to_columns, fields=["nope"]
+        )
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_to_arrow(self):
+        table = MeasurementRequest().to_arrow(fields=self.fields)
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(str(table.schema.field("id").type), "int64")
+        self.assertEqual(
+            str(table.schema.field("stop_time").type), "timestamp[s, tz=UTC]"
+        )
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field("type").type))
+        self.assertEqual(table.column("stop_time").null_count, 1)
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_to_dataframe(self):
+        with mock.patch.dict("sys.modules", {"pyarrow": None}):
+            df = MeasurementRequest().to_dataframe(fields=self.fields)
+        self.assertEqual(str(df["id"].dtype), "Int64")
+        self.assertEqual(str(df["type"].dtype), "category")
+        self.assertEqual(list(df["status"]), ["Ongoing", "Stopped"])
+        self.assertTrue(df["stop_time"].isna()[0])
+        self.assertEqual(df["stop_time"][1].timestamp(), 1439380502)
+
+    def tearDown(self):
+        mock.patch.stopall()
+
+
 class TestProbeRequestGenerator(TestCase):
     def test_url(self):
         gen = ProbeRequest()
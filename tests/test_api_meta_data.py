@@ -69,6 +69,12 @@ class TestProbeRepresentation(TestCase):
             request_mock.return_value = False, {}
             self.assertRaises(APIResponseError, lambda: Probe(id=1))
 
+    def test_meta_data_without_status(self):
+        probe = Probe(meta_data={"id": 3, "status": None})
+        self.assertEqual(probe.id, 3)
+        self.assertEqual(probe.status, None)
+        self.assertFalse(hasattr(probe, "__dict__"))
+
     def test_user_agent(self):
 
         paths = {
@@ -205,3 +211,19 @@ class TestMeasurementRepresentation(TestCase):
             self.assertEqual(measurement.stop_time, None)
             self.assertEqual(measurement.start_time, None)
             self.assertEqual(measurement.creation_time, None)
+
+    def test_lazy_attributes(self):
+        measurement = Measurement(meta_data=self.resp)
+        self.assertFalse(hasattr(measurement, "__dict__"))
+        self.assertEqual(measurement.id, None)
+        self.assertEqual(measurement.status_id, 4)
+
+        # Times are converted once and then kept
+        start_time = measurement.start_time
+        self.assertIs(measurement.start_time, start_time)
+
+        # Assigned values take precedence over meta data
+        measurement.description = "changed"
+        self.assertEqual(measurement.description, "changed")
+        self.assertEqual(self.resp["description"], "Blaaaaaaaaaah")
+        self.assertRaises(AttributeError, setattr, measurement, "unknown", 1)
@@ -0,0 +1,94 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import TestCase
+
+from benchmarks.imports import IMPORTS, measure_import
+from benchmarks.run import BENCHMARKS, compare, parse_args, run
+from ripe.atlas.cousteau import AtlasResultsRequest, Measurement, ProbeRequest
+from ripe.atlas.cousteau.exceptions import APIResponseError
+
+from .mock_server import MockAtlasServer
+
+
+class TestMockAtlasServer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAtlasServer(
+            probes=25, measurements=3, results=30, result_probes=10, page_size=10
+        ).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_listing(self):
+        probes = list(ProbeRequest(server=self.server.url))
+        self.assertEqual([probe["id"] for probe in probes], list(range(1, 26)))
+        probes = list(ProbeRequest(server=self.server.url, id__in=[3, 30, 7]))
+        self.assertEqual([probe["id"] for probe in probes], [3, 7])
+
+    def test_objects(self):
+        measurement = Measurement(id=2, server=self.server.url)
+        self.assertEqual(measurement.type, "ping")
+        self.assertRaises(APIResponseError, Measurement, id=9, server=self.server.url)
+
+    def test_results(self):
+        request = AtlasResultsRequest(
+            msm_id=5, server=self.server.url, probe_ids=[1, 2]
+        )
+        is_success, results = request.create()
+        self.assertTrue(is_success)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(list(request.iter_results()), results)
+        self.assertEqual({result["msm_id"] for result in results}, {5})
+
+
+class TestBenchmarks(TestCase):
+    def test_run_and_compare(self):
+        options = parse_args([
+            "--probes", "20", "--page-size", "10", "--results", "20",
+            "--result-probes", "5", "--objects", "3", "--stream-results", "5",
+            "--repeat", "1",
+        ])
+        report = run(options)
+        self.assertEqual(set(report["benchmarks"]), set(BENCHMARKS) | set(IMPORTS))
+        self.assertEqual(report["benchmarks"]["listing"]["items"], 20)
+        self.assertEqual(report["benchmarks"]["results_stream"]["items"], 20)
+        self.assertEqual(report["benchmarks"]["latest"]["items"], 5)
+        self.assertEqual(report["benchmarks"]["metadata"]["items"], 3)
+        self.assertEqual(report["benchmarks"]["stream"]["items"], 5)
+
+        baseline = {"benchmarks": {
+            name: dict(stats, seconds=stats["seconds"] / 2)
+            for name, stats in report["benchmarks"].items()
+        }}
+        rows = compare(report, baseline, threshold=0.1)
+        self.assertTrue(all(regressed for *_, regressed in rows))
+        rows = compare(report, report, 0.1)
+        self.assertFalse(any(regressed for *_, regressed in rows))
+
+
+class TestImports(TestCase):
+    def test_lazy_imports(self):
+        seconds, modules = measure_import("import ripe.atlas.cousteau")
+        self.assertNotIn("requests", modules)
+
+        seconds, modules = measure_import(
+            "from ripe.atlas.cousteau import AtlasResultsRequest"
+        )
+        self.assertIn("ripe.atlas.cousteau.request", modules)
+        self.assertNotIn("websocket", modules)
+        self.assertNotIn("ripe.atlas.cousteau.stream", modules)
@@ -0,0 +1,116 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest import mock
+
+from ripe.atlas.cousteau import AtlasStream
+from ripe.atlas.cousteau.broker import (
+    StreamBroker, StreamSubscriber, event_name_of
+)
+
+from .mock_server import MockAtlasServer
+
+
+class TestStreamBroker(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "stream.sock")
+        self.server = MockAtlasServer(stream_results=20, result_probes=10).start()
+        self.stream = AtlasStream(base_url=self.server.url)
+        self.stream.connect()
+        self.broker = StreamBroker(self.stream, self.path)
+
+    def tearDown(self):
+        self.broker.close()
+        self.stream.disconnect()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_event_name(self):
+        self.assertEqual(event_name_of('["atlas_result", {"a": 1}]'), "atlas_result")
+        self.assertEqual(event_name_of(' [ "atlas_error" , "x"]'), "atlas_error")
+
+    def test_fan_out(self):
+        everything = StreamSubscriber(self.path)
+        filtered = StreamSubscriber(
+            self.path, events=["atlas_result"], match={"prb_id": [1, 2]}
+        )
+        everything.connect()
+        filtered.connect()
+        self.broker.serve(seconds=0.1)
+        stats = self.stream.track_stats(interval=3600)
+
+        self.stream.subscribe("result", msm=1001)
+        self.broker.serve(seconds=0.3)
+
+        events = list(everything.iter(seconds=0.2))
+        self.assertEqual(events[0][0], "atlas_subscribed")
+        self.assertEqual(len(events), 21)
+        results = list(filtered.iter(seconds=0.2))
+        self.assertEqual(
+            [payload["prb_id"] for _, payload in results], [1, 2, 1, 2]
+        )
+        self.assertEqual(self.broker.messages, 21)
+        self.assertEqual(stats.events, {"atlas_subscribed": 1, "atlas_result": 20})
+
+        callback_results = []
+        everything.bind("atlas_result", callback_results.append)
+        self.stream.subscribe("result", msm=1002)
+        self.broker.serve(seconds=0.3)
+        everything.timeout(seconds=0.2)
+        self.assertEqual(len(callback_results), 20)
+        self.assertEqual(callback_results[0]["msm_id"], 1002)
+        everything.disconnect()
+        filtered.disconnect()
+
+    def test_slow_subscriber(self):
+        self.broker.max_backlog = 10000
+        subscriber = StreamSubscriber(self.path)
+        subscriber.connect()
+        self.broker.serve(seconds=0.1)
+        message = json.dumps(["atlas_result", {"data": "x" * 1000}])
+        for _ in range(2000):
+            self.broker.publish(message)
+        self.assertEqual(self.broker.dropped, 1)
+        self.assertEqual(self.broker.clients, {})
+        subscriber.disconnect()
+
+    def test_reconnect(self):
+        subscriber = StreamSubscriber(self.path, events=["atlas_result"])
+        subscriber.connect()
+        self.broker.serve(seconds=0.1)
+        self.stream.subscribe("result", msm=1001)
+        ws = self.stream.ws
+        recv_raw = self.stream.recv_raw
+        resets = [ConnectionResetError("Connection reset by peer")]
+
+        def reset_once(ws):
+            if resets:
+                raise resets.pop()
+            return recv_raw(ws)
+
+        with mock.patch.object(self.stream, "recv_raw", side_effect=reset_once):
+            self.broker.serve(seconds=0.3)
+        self.assertEqual(resets, [])
+        self.assertIsNot(self.stream.ws, ws)
+        # The subscription is replayed on the new connection
+        results = list(subscriber.iter(seconds=0.2))
+        self.assertEqual(len(results), 20)
+        subscriber.disconnect()
@@ -0,0 +1,248 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import (
+    AtlasChangeSource, AtlasClient, AtlasSource, BulkCreator, Ping, RateLimiter
+)
+from ripe.atlas.cousteau.bulk import (
+    create_many, stop_many, change_many, run_many
+)
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+
+
+class FakeCreateTransport(object):
+    """Answers creation requests with consecutive measurement ids."""
+
+    def __init__(self, fail_batches=(), short_batches=()):
+        self.fail_batches = fail_batches
+        self.short_batches = short_batches
+        self.posts = []
+        self.lock = threading.Lock()
+        self.next_id = 1000
+
+    def request(self, method, url, json=None, **kwargs):
+        with self.lock:
+            self.posts.append(json)
+            response = mock.Mock()
+            targets = [definition["target"] for definition in json["definitions"]]
+            if targets[0] in self.fail_batches:
+                response.ok = False
+                response.json.return_value = {"error": {"detail": "quota"}}
+                return response
+            msm_ids = list(range(self.next_id, self.next_id + len(targets)))
+            self.next_id += len(targets)
+            if targets[0] in self.short_batches:
+                msm_ids.pop()
+            response.ok = True
+            response.json.return_value = {"measurements": msm_ids}
+            return response
+
+
+def make_pings(count):
+    return [
+        Ping(af=4, target="target{0}".format(i), description="ping {0}".format(i))
+        for i in range(count)
+    ]
+
+
+class TestBulkCreator(TestCase):
+    def setUp(self):
+        self.sources = [AtlasSource(type="area", value="WW", requested=5)]
+
+    def test_split_batches(self):
+        transport = FakeCreateTransport()
+        creator = BulkCreator(batch_size=3, key="key", transport=transport)
+        pings = make_pings(7)
+        result = creator.create(pings, self.sources, is_oneoff=True)
+
+        self.assertTrue(result.is_success)
+        self.assertEqual(
+            sorted(len(post["definitions"]) for post in transport.posts), [1, 3, 3]
+        )
+        self.assertTrue(all(post["is_oneoff"] for post in transport.posts))
+        self.assertEqual(len(set(result.msm_ids)), 7)
+        self.assertEqual([msm for msm, _, _ in result.measurements], pings)
+
+        # Measurement ids follow the definitions of their batch
+        for post in transport.posts:
+            targets = [definition["target"] for definition in post["definitions"]]
+            ids = [
+                msm_id for msm, msm_id, _ in result.measurements
+                if msm.target in targets
+            ]
+            self.assertEqual(ids, sorted(ids))
+            self.assertEqual(ids[-1] - ids[0], len(ids) - 1)
+
+    def test_failed_batch_and_invalid_measurement(self):
+        transport = FakeCreateTransport(fail_batches=("target3",))
+        pings = make_pings(6)
+        pings[1].target = None
+        result = create_many(
+            pings, self.sources, batch_size=2, max_workers=1, transport=transport,
+            is_oneoff=True
+        )
+
+        self.assertFalse(result.is_success)
+        self.assertEqual(len(transport.posts), 3)
+        self.assertEqual(len(result.errors), 1)
+        index, failed_batch, error = result.errors[0]
+        self.assertEqual([msm.target for msm in failed_batch], ["target3", "target4"])
+        self.assertEqual(error, {"error": {"detail": "quota"}})
+        self.assertEqual(
+            [msm.target for msm, _ in result.failed], [None, "target3", "target4"]
+        )
+        self.assertEqual(len(result.msm_ids), 3)
+
+    def test_inconsistent_batch(self):
+        transport = FakeCreateTransport(short_batches=("target2",))
+        creator = BulkCreator(batch_size=2, max_workers=1, transport=transport)
+        with self.assertLogs("ripe.atlas.cousteau.bulk", "WARNING"):
+            result = creator.create(make_pings(4), self.sources)
+
+        self.assertTrue(result.is_success)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.failed, [])
+        (index, batch, msm_ids), = result.inconsistent
+        self.assertEqual([msm.target for msm in batch], ["target2", "target3"])
+        self.assertEqual(msm_ids, [1002])
+        self.assertEqual(result.msm_ids, [1000, 1001, 1002])
+        self.assertEqual(result.measurements[3][1:], (None, None))
+
+    def test_conflicting_options(self):
+        transport = FakeCreateTransport()
+        creator = BulkCreator(transport=transport, is_oneoff=False)
+        self.assertRaises(
+            CousteauGenericError, creator.create, make_pings(1), self.sources,
+            is_oneoff=True
+        )
+        self.assertEqual(transport.posts, [])
+
+    def test_client_create_many(self):
+        transport = FakeCreateTransport()
+        client = AtlasClient(key="key", transport=transport)
+        result = client.create_many(make_pings(2), self.sources, is_oneoff=True)
+        self.assertEqual(result.msm_ids, [1000, 1001])
+
+    def test_rate_limited(self):
+        transport = FakeCreateTransport()
+        limiter = mock.Mock()
+        creator = BulkCreator(batch_size=1, transport=transport, limiter=limiter)
+        creator.create(make_pings(3), self.sources)
+        self.assertEqual(limiter.acquire.call_count, 3)
+
+
+class TestRateLimiter(TestCase):
+    def test_acquire(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+        now[0] += 10
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(len(sleeps), 2)
+
+
+class RecordingTransport(object):
+    """Answers every request, failing those whose url contains fail."""
+
+    def __init__(self, fail="/13"):
+        self.fail = fail
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, json=None, **kwargs):
+        with self.lock:
+            self.calls.append((method, url, json))
+        if self.fail in url:
+            return mock.Mock(ok=False, **{"json.return_value": {"error": "no"}})
+        return mock.Mock(ok=True, **{"json.return_value": {}})
+
+
+class TestBulkOperations(TestCase):
+    def test_stop_many(self):
+        transport = RecordingTransport()
+        result = stop_many([11, 12, 13], key="key", transport=transport)
+        self.assertFalse(result.is_success)
+        self.assertEqual(result.succeeded, [11, 12])
+        self.assertEqual(result.failed, [(13, {"error": "no"})])
+        self.assertEqual(
+            sorted(call[:2] for call in transport.calls),
+            [("DELETE", "https://atlas.ripe.net/api/v2/measurements/{0}".format(i))
+             for i in (11, 12, 13)]
+        )
+
+    def test_change_many(self):
+        transport = RecordingTransport()
+        sources = [AtlasChangeSource(
+            action="remove", type="probes", value="1,2", requested=2
+        )]
+        result = change_many({11: sources, 12: sources}, transport=transport)
+        self.assertTrue(result.is_success)
+        self.assertEqual([item[0] for item in result.succeeded], [11, 12])
+        method, url, post_data = transport.calls[0]
+        self.assertEqual(method, "POST")
+        self.assertTrue(url.endswith("/participation-requests/"))
+        self.assertEqual(post_data[0]["action"], "remove")
+
+    def test_tag_many(self):
+        transport = RecordingTransport()
+        client = AtlasClient(key="key", transport=transport)
+        client.tag_many([11, 12], "stale")
+        self.assertEqual(
+            sorted((method, json) for method, _, json in transport.calls),
+            [("POST", {"tag": "stale"})] * 2
+        )
+
+        transport.calls = []
+        client.tag_many([11], "stale", remove=True)
+        self.assertEqual(
+            transport.calls[0][:2],
+            ("DELETE", "https://atlas.ripe.net/api/v2/measurements/11/tags/stale/")
+        )
+
+    def test_exceptions_reported(self):
+        def operation(item, **kwargs):
+            if item == 2:
+                raise ValueError("bad")
+            return True, item
+
+        result = run_many(operation, [1, 2, 3], max_workers=2)
+        self.assertEqual(result.succeeded, [1, 3])
+        self.assertIsInstance(result.failed[0][1], ValueError)
+
+    def test_shared_session_and_limiter(self):
+        seen = []
+
+        def operation(item, **kwargs):
+            seen.append((kwargs["transport"], kwargs["limiter"]))
+            return True, None
+
+        run_many(operation, range(4), rate=100)
+        self.assertEqual(len(set(seen)), 1)
+        self.assertIsInstance(seen[0][1], RateLimiter)
+        self.assertIsNotNone(seen[0][0].session)
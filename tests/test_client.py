@@ -0,0 +1,100 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau.version import __version__
+from ripe.atlas.cousteau import (
+    AtlasClient, AtlasLatestRequest, ProbeRequest, Probe
+)
+
+
+class TestAtlasClient(TestCase):
+    def setUp(self):
+        self.transport = mock.Mock()
+        self.response = self.transport.request.return_value
+        self.response.ok = True
+        self.response.json.return_value = {}
+        self.client = AtlasClient(
+            key="client_key", server="test", verify=False, transport=self.transport
+        )
+
+    def test_prebuilt_headers(self):
+        expected_headers = {
+            "User-Agent": "RIPE ATLAS Cousteau v{0}".format(__version__),
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": "Key client_key",
+        }
+        request = self.client.request(AtlasLatestRequest, msm_id=1001)
+        self.assertEqual(request.http_method_args["headers"], expected_headers)
+        self.assertIsNot(request.http_method_args["headers"], self.client.http_headers)
+        self.assertEqual(request.http_method_args["verify"], False)
+        self.assertEqual(request.server, "test")
+
+    def test_request_options_override_client(self):
+        request = self.client.request(
+            AtlasLatestRequest, msm_id=1001, key="other_key", server="other"
+        )
+        self.assertEqual(
+            request.http_method_args["headers"]["Authorization"], "Key other_key"
+        )
+        self.assertEqual(request.server, "other")
+
+    def test_requests_use_client_transport(self):
+        self.client.results(msm_id=1001, probe_ids=[1, 2])
+        method, url = self.transport.request.call_args[0]
+        self.assertEqual(method, "GET")
+        self.assertEqual(url, "https://test/api/v2/measurements/1001/results")
+        self.assertEqual(
+            self.transport.request.call_args[1]["params"], {"probe_ids": "1,2"}
+        )
+
+        self.client.stop(1001)
+        method, url = self.transport.request.call_args[0]
+        self.assertEqual(method, "DELETE")
+        self.assertEqual(url, "https://test/api/v2/measurements/1001")
+
+    def test_listing_and_meta_data(self):
+        self.response.json.return_value = {
+            "count": 1, "next": None, "results": [{"id": 1, "status": {}}]
+        }
+        generator = self.client.probes(return_objects=True, country_code="NL")
+        self.assertIsInstance(generator, ProbeRequest)
+        probe = list(generator)[0]
+        self.assertIsInstance(probe, Probe)
+        self.assertEqual(probe.client, self.client)
+        headers = self.transport.request.call_args[1]["headers"]
+        self.assertEqual(headers["Authorization"], "Key client_key")
+        self.assertEqual(self.transport.request.call_args[1]["verify"], False)
+
+        self.response.json.return_value = {"id": 2, "status": {"name": "Connected"}}
+        self.assertEqual(self.client.probe(2).status, "Connected")
+        self.assertEqual(
+            self.transport.request.call_args[0][1], "https://test/api/v2/probes/2/"
+        )
+
+    def test_tagger(self):
+        self.client.tagger().add_tag(1001, "tag")
+        method, url = self.transport.request.call_args[0]
+        self.assertEqual(method, "POST")
+        self.assertEqual(url, "https://test/api/v2/measurements/1001/tags/")
+        self.assertEqual(self.transport.request.call_args[1]["json"], {"tag": "tag"})
+
+    def test_close(self):
+        with self.client:
+            pass
+        self.transport.close.assert_called_once_with()
@@ -0,0 +1,141 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasResultsRequest
+from ripe.atlas.cousteau.decoders import (
+    decode_ping, decode_traceroute, unpack_address
+)
+from ripe.atlas.cousteau.exceptions import APIResponseError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PING_RESULT = {
+    "fw": 5020, "lts": 12, "af": 4, "dst_addr": "193.0.14.129",
+    "proto": "ICMP", "ttl": 56, "size": 48,
+    "result": [{"rtt": 5.1}, {"rtt": 5.3}, {"x": "*"}],
+    "dup": 0, "rcvd": 2, "sent": 3, "min": 5.1, "max": 5.3, "avg": 5.2,
+    "msm_id": 1001, "prb_id": 12, "timestamp": 1600000000,
+    "from": "1.2.3.4", "type": "ping", "stored_timestamp": 1600000100,
+}
+
+
+class FakeStreamTransport(object):
+    def __init__(self, lines, ok=True):
+        self.lines = lines
+        self.ok = ok
+        self.calls = []
+
+    @contextmanager
+    def stream(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        response = mock.Mock(ok=self.ok, text="error")
+        response.iter_lines.return_value = iter(self.lines)
+        yield response
+
+
+class TestResultsStreaming(TestCase):
+    def test_iter_lines(self):
+        line = json.dumps(PING_RESULT).encode()
+        lines = [line, b"", line]
+        transport = FakeStreamTransport(lines)
+        request = AtlasResultsRequest(
+            msm_id=1001, start=1600000000, transport=transport
+        )
+        self.assertEqual(list(request.iter_results()), [PING_RESULT, PING_RESULT])
+        method, url, kwargs = transport.calls[0]
+        self.assertEqual(url, "https://atlas.ripe.net/api/v2/measurements/1001/results")
+        self.assertEqual(kwargs["params"], {"start": 1600000000, "format": "txt"})
+
+    def test_failed_stream(self):
+        transport = FakeStreamTransport([], ok=False)
+        request = AtlasResultsRequest(msm_id=1001, transport=transport)
+        self.assertRaises(APIResponseError, list, request.iter_lines())
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestPingDecoder(TestCase):
+    def test_decode_ping(self):
+        lines = [
+            json.dumps(dict(PING_RESULT, prb_id=prb_id)).encode()
+            for prb_id in range(5)
+        ]
+        # No replies and a line with missing fields
+        lines.append(json.dumps(
+            dict(PING_RESULT, rcvd=0, min=-1, avg=-1, max=-1)
+        ).encode())
+        lines.append(json.dumps({"msm_id": 1, "prb_id": 2, "timestamp": 3}))
+
+        chunks = list(decode_ping(lines, chunk_size=3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        ping = numpy.concatenate(chunks)
+        self.assertEqual(list(ping["prb_id"][:5]), [0, 1, 2, 3, 4])
+        self.assertEqual(ping["timestamp"][0], 1600000000)
+        self.assertEqual(ping["sent"][0], 3)
+        self.assertAlmostEqual(ping["avg"][0], 5.2)
+        self.assertTrue(numpy.isnan(ping["avg"][5]))
+        self.assertEqual(ping["rcvd"][5], 0)
+        self.assertEqual(
+            (ping["msm_id"][6], ping["prb_id"][6], ping["timestamp"][6]), (1, 2, 3)
+        )
+        self.assertEqual(ping["sent"][6], -1)
+
+
+TRACEROUTE_RESULT = {
+    "msm_id": 5001, "prb_id": 7, "timestamp": 1600000000, "af": 4,
+    "type": "traceroute", "dst_addr": "193.0.14.129",
+    "result": [
+        {"hop": 1, "result": [
+            {"from": "192.168.1.1", "rtt": 1.2, "size": 28, "ttl": 64},
+            {"x": "*"},
+        ]},
+        {"hop": 2, "error": "network unreachable"},
+        {"hop": 3, "result": [
+            {"from": "2001:db8::1", "rtt": 9.1, "size": 76, "ttl": 62},
+        ]},
+    ],
+}
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestTracerouteDecoder(TestCase):
+    def test_decode_traceroute(self):
+        lines = [json.dumps(TRACEROUTE_RESULT).encode()] * 3
+        chunks = list(decode_traceroute(lines, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [6, 3])
+
+        hops = chunks[1]
+        self.assertEqual(list(hops["hop"]), [1, 1, 3])
+        self.assertEqual(list(hops["prb_id"]), [7, 7, 7])
+        self.assertEqual(hops["timestamp"][0], 1600000000)
+        self.assertEqual(list(hops["ttl"]), [64, -1, 62])
+        self.assertAlmostEqual(hops["rtt"][0], 1.2)
+        self.assertTrue(numpy.isnan(hops["rtt"][1]))
+        self.assertEqual(
+            [unpack_address(h, l) for h, l in zip(hops["from_hi"], hops["from_lo"])],
+            ["192.168.1.1", None, "2001:db8::1"]
+        )
+
+    def test_empty_traceroute(self):
+        result = dict(TRACEROUTE_RESULT, result=None)
+        self.assertEqual(len(next(decode_traceroute([json.dumps(result)]))), 0)
@@ -0,0 +1,99 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest import mock
+
+from ripe.atlas.cousteau import AtlasClient, MeasurementRequest
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+from ripe.atlas.cousteau.fetcher import MultiResultsFetcher, results_many
+
+from .mock_server import MockAtlasServer
+
+
+class TestMultiResultsFetcher(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAtlasServer(results=200, result_probes=20).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_arrival_order(self):
+        done = []
+        fetcher = MultiResultsFetcher(
+            [1, 2, 3, 4, 5], max_workers=2, queue_size=10,
+            progress_callback=done.append, server=self.server.url,
+        )
+        counts = Counter(result["msm_id"] for result in fetcher)
+        self.assertEqual(counts, {msm_id: 200 for msm_id in range(1, 6)})
+        self.assertEqual(sorted(progress.msm_id for progress in done), [1, 2, 3, 4, 5])
+        self.assertTrue(all(progress.done for progress in fetcher.progress.values()))
+        self.assertEqual(fetcher.progress[3].results, 200)
+        self.assertEqual(fetcher.errors, [])
+
+    def test_interleave(self):
+        measurements = MeasurementRequest(server=self.server.url, id__in=[1, 2, 3])
+        results = list(results_many(
+            measurements, interleave=True, queue_size=5, server=self.server.url,
+        ))
+        self.assertEqual(len(results), 600)
+        timestamps = [result["timestamp"] for result in results]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual({result["msm_id"] for result in results[:3]}, {1, 2, 3})
+
+    def test_interleave_workers(self):
+        done = []
+        fetcher = MultiResultsFetcher(
+            [1, 2, 3, 4, 5], max_workers=2, interleave=True,
+            start=1700000000, stop=1700003000, window=600,
+            progress_callback=done.append, server=self.server.url,
+        )
+        with mock.patch(
+            "ripe.atlas.cousteau.fetcher.ThreadPoolExecutor",
+            wraps=ThreadPoolExecutor
+        ) as executor:
+            results = list(fetcher)
+        executor.assert_called_once_with(max_workers=2)
+        self.assertEqual(len(results), 1000)
+        timestamps = [result["timestamp"] for result in results]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(len(done), 5)
+        self.assertEqual(fetcher.progress[4].results, 200)
+
+        with self.assertRaises(CousteauGenericError):
+            MultiResultsFetcher([1, 2, 3], max_workers=2, interleave=True)
+
+    def test_errors(self):
+        with AtlasClient(server=self.server.url) as client:
+            results = list(client.results_many([1, "missing"], stop=1700000300))
+        self.assertEqual({result["msm_id"] for result in results}, {1})
+        self.assertTrue(all(result["timestamp"] <= 1700000300 for result in results))
+
+        fetcher = MultiResultsFetcher(["missing"], server=self.server.url)
+        self.assertEqual(list(fetcher), [])
+        (msm_id, error), = fetcher.errors
+        self.assertEqual(msm_id, "missing")
+
+    def test_stop_early(self):
+        fetcher = MultiResultsFetcher(
+            [1, 2, 3], max_workers=3, queue_size=2, server=self.server.url
+        )
+        self.assertEqual(len(list(itertools.islice(fetcher, 5))), 5)
+        self.assertTrue(fetcher.stopped.is_set())
@@ -0,0 +1,187 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+from unittest import TestCase
+
+import requests
+
+from ripe.atlas.cousteau import AtlasSource, Ping
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+from ripe.atlas.cousteau.idempotency import (
+    CreationLedger, IdempotentCreateRequest, fingerprint
+)
+
+
+class FakeAPI(object):
+    """Records creations and answers tag filtered measurement listings."""
+
+    def __init__(self):
+        self.created = []
+        self.posts = 0
+        self.timeout_after_create = False
+        self.error_after_create = False
+        self.error = None
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        response = mock.Mock(ok=True, status_code=200)
+        if method == "POST":
+            self.posts += 1
+            if self.error:
+                response.ok = False
+                response.status_code = 400
+                response.json.return_value = self.error
+                return response
+            msm_ids = []
+            for definition in json["definitions"]:
+                msm_ids.append(1000 + len(self.created))
+                self.created.append({"id": msm_ids[-1], "tags": definition["tags"]})
+            if self.timeout_after_create:
+                raise requests.exceptions.ReadTimeout("timed out")
+            if self.error_after_create:
+                response.ok = False
+                response.status_code = 502
+                response.json.side_effect = ValueError()
+                response.text = "Bad Gateway"
+                return response
+            response.json.return_value = {"measurements": msm_ids}
+            return response
+
+        tag = url.split("tags=")[1]
+        response.json.return_value = {
+            "count": 0, "next": None,
+            "results": [msm for msm in self.created if tag in msm["tags"]],
+        }
+        return response
+
+
+class TestIdempotentCreateRequest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ledger_path = os.path.join(self.directory, "ledger.json")
+        self.api = FakeAPI()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create(self, ttl=None, **kwargs):
+        request = IdempotentCreateRequest(
+            ledger=CreationLedger(self.ledger_path, ttl=ttl),
+            key="key",
+            transport=self.api,
+            measurements=[
+                Ping(af=4, target="ripe.net", description="a", tags=["mine"]),
+                Ping(af=6, target="ripe.net", description="b"),
+            ],
+            sources=[AtlasSource(type="area", value="WW", requested=5)],
+            is_oneoff=True,
+            **kwargs
+        )
+        return request, request.create()
+
+    def test_created_once(self):
+        request, (is_success, response) = self.create()
+        self.assertTrue(is_success)
+        self.assertEqual(response, {"measurements": [1000, 1001]})
+        self.assertEqual(self.api.created[0]["tags"], ["mine", request.marker_tag])
+        self.assertTrue(request.marker_tag.startswith("cousteau-"))
+
+        _, (is_success, response) = self.create()
+        self.assertTrue(is_success)
+        self.assertEqual(response, {"measurements": [1000, 1001]})
+        self.assertEqual(self.api.posts, 1)
+
+    def test_retry_after_timeout(self):
+        self.api.timeout_after_create = True
+        request, (is_success, response) = self.create()
+        self.assertFalse(is_success)
+        entry = CreationLedger(self.ledger_path).get(request.fingerprint)
+        self.assertEqual(entry["state"], "pending")
+
+        self.api.timeout_after_create = False
+        _, (is_success, response) = self.create()
+        self.assertTrue(is_success)
+        self.assertEqual(response, {"measurements": [1000, 1001]})
+        self.assertEqual(self.api.posts, 1)
+        self.assertEqual(
+            CreationLedger(self.ledger_path).get(request.fingerprint)["state"],
+            "created"
+        )
+
+    def test_retry_after_server_error(self):
+        self.api.error_after_create = True
+        request, (is_success, response) = self.create()
+        self.assertFalse(is_success)
+        self.assertEqual(response, "Bad Gateway")
+        entry = CreationLedger(self.ledger_path).get(request.fingerprint)
+        self.assertEqual(entry["state"], "pending")
+
+        self.api.error_after_create = False
+        retry, (is_success, response) = self.create()
+        self.assertTrue(is_success)
+        self.assertEqual(response, {"measurements": [1000, 1001]})
+        self.assertEqual(retry.marker_tag, request.marker_tag)
+        self.assertEqual(self.api.posts, 1)
+
+    def test_forget(self):
+        request, _ = self.create()
+        request.forget()
+        again, (is_success, response) = self.create()
+        self.assertEqual(response, {"measurements": [1002, 1003]})
+        self.assertNotEqual(again.marker_tag, request.marker_tag)
+        self.assertEqual(self.api.posts, 2)
+
+    def test_ttl(self):
+        self.create(ttl=60)
+        self.create(ttl=60)
+        self.assertEqual(self.api.posts, 1)
+        with mock.patch(
+            "ripe.atlas.cousteau.idempotency.time.time",
+            return_value=time.time() + 61
+        ):
+            _, (is_success, response) = self.create(ttl=60)
+        self.assertEqual(response, {"measurements": [1002, 1003]})
+        self.assertEqual(self.api.posts, 2)
+
+    def test_idempotency_key_tag(self):
+        request, _ = self.create(idempotency_key="Run #1 / Ping, ÄÖ")
+        self.assertRegex(request.marker_tag, "^cousteau-[0-9a-f]{32}$")
+        self.assertRaises(
+            CousteauGenericError, self.create, idempotency_key=1
+        )
+
+    def test_pending_not_created(self):
+        request, _ = self.create(idempotency_key="run-1")
+        self.assertEqual(request.fingerprint, "run-1")
+        # An attempt that never reached the API
+        ledger = CreationLedger(self.ledger_path)
+        ledger.set("run-2", "pending", "cousteau-run-2")
+        _, (is_success, response) = self.create(idempotency_key="run-2")
+        self.assertTrue(is_success)
+        self.assertEqual(self.api.posts, 2)
+
+    def test_api_error_clears_entry(self):
+        self.api.error = {"error": {"detail": "not enough credits"}}
+        request, (is_success, response) = self.create()
+        self.assertFalse(is_success)
+        self.assertIsNone(CreationLedger(self.ledger_path).get(request.fingerprint))
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint({"a": 1, "b": 2}), fingerprint({"b": 2, "a": 1}))
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": 2}))
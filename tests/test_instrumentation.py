@@ -0,0 +1,162 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from unittest import mock
+from unittest import TestCase
+
+import requests
+
+from ripe.atlas.cousteau import AtlasRequest, AtlasStream, ProbeRequest
+from ripe.atlas.cousteau import instrumentation
+from ripe.atlas.cousteau.instrumentation import (
+    MetricsRegistry, add_hook, remove_hook
+)
+
+
+class InstrumentationTestCase(TestCase):
+    def setUp(self):
+        self.events = []
+        for event in instrumentation.EVENTS:
+            add_hook(event, self.events.append)
+
+    def tearDown(self):
+        for event in instrumentation.EVENTS:
+            remove_hook(event, self.events.append)
+
+
+class TestHooks(InstrumentationTestCase):
+    def test_request_event(self):
+        transport = mock.Mock()
+        response = transport.request.return_value
+        response.ok = True
+        response.status_code = 200
+        response.content = b'{"a": 1}'
+        response.json.return_value = {"a": 1}
+        AtlasRequest(server="test", url_path="/path", transport=transport).get()
+
+        event, = self.events
+        self.assertEqual(event["event"], "request")
+        self.assertEqual(event["method"], "GET")
+        self.assertEqual(event["url"], "https://test/path")
+        self.assertEqual(event["status_code"], 200)
+        self.assertEqual(event["bytes"], 8)
+        self.assertIsNone(event["error"])
+        self.assertGreaterEqual(event["seconds"], event["response_seconds"])
+
+    def test_request_error_event(self):
+        transport = mock.Mock()
+        transport.request.side_effect = requests.exceptions.ConnectionError("down")
+        AtlasRequest(server="test", transport=transport).get()
+        event, = self.events
+        self.assertIsInstance(event["error"], requests.exceptions.ConnectionError)
+        self.assertIsNone(event["status_code"])
+        self.assertEqual(event["decode_seconds"], 0.0)
+
+    def test_page_event(self):
+        pages = [
+            {"count": 3, "next": "https://test/api/v2/probes/?page=2",
+             "results": [{"id": 1}, {"id": 2}]},
+            {"count": 3, "next": None, "results": [{"id": 3}]},
+        ]
+        with mock.patch(
+            "ripe.atlas.cousteau.api_listing.AtlasRequest.get",
+            side_effect=[(True, page) for page in pages]
+        ):
+            self.assertEqual(len(list(ProbeRequest())), 3)
+
+        self.assertEqual([event["items"] for event in self.events], [2, 1])
+        self.assertEqual(self.events[1]["url"], "/api/v2/probes/?page=2")
+        self.assertEqual(self.events[0]["count"], 3)
+
+    def test_stream_message_event(self):
+        ws = mock.Mock()
+        ws.recv.return_value = json.dumps(["atlas_result", {"msm_id": 1}])
+        event_name, payload = AtlasStream().recv(ws)
+        self.assertEqual(event_name, "atlas_result")
+        event, = self.events
+        self.assertEqual(event["event_name"], "atlas_result")
+        self.assertEqual(event["bytes"], len(ws.recv.return_value))
+
+    def test_unknown_event(self):
+        self.assertRaises(ValueError, add_hook, "nope", print)
+
+    def test_failing_hook(self):
+        def fail(data):
+            raise RuntimeError("broken hook")
+
+        add_hook("request", fail)
+        self.addCleanup(remove_hook, "request", fail)
+        transport = mock.Mock()
+        response = transport.request.return_value
+        response.ok = True
+        response.json.return_value = {"a": 1}
+        with self.assertLogs(instrumentation.LOG, "ERROR"):
+            result = AtlasRequest(server="test", transport=transport).get()
+        self.assertEqual(result, (True, {"a": 1}))
+        self.assertEqual(len(self.events), 1)
+
+
+class TestMetricsRegistry(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry().install()
+
+    def tearDown(self):
+        self.registry.uninstall()
+
+    def test_prometheus(self):
+        self.registry.on_request({
+            "method": "GET", "status_code": 200, "error": None, "seconds": 0.3,
+            "response_seconds": 0.2, "decode_seconds": 0.01, "bytes": 100,
+        })
+        self.registry.on_request({
+            "method": "GET", "status_code": None, "error": Exception(),
+            "seconds": 1.0, "response_seconds": 1.0, "decode_seconds": 0.0,
+            "bytes": 0,
+        })
+        self.registry.on_page({"items": 100})
+        self.registry.on_stream_message(
+            {"event_name": "atlas_result", "bytes": 20, "decode_seconds": 0.001}
+        )
+        text = self.registry.to_prometheus()
+        for line in (
+            'cousteau_requests_total{method="GET",status_code="200"} 1',
+            'cousteau_request_errors_total{method="GET"} 1',
+            'cousteau_request_seconds_bucket{method="GET",le="0.25"} 0',
+            'cousteau_request_seconds_bucket{method="GET",le="0.5"} 1',
+            'cousteau_request_seconds_bucket{method="GET",le="+Inf"} 2',
+            'cousteau_request_seconds_sum{method="GET"} 1.3',
+            'cousteau_response_bytes_total{method="GET"} 100',
+            'cousteau_listing_page_items_bucket{le="100"} 1',
+            'cousteau_stream_messages_total{event_name="atlas_result"} 1',
+            "# TYPE cousteau_request_seconds histogram",
+        ):
+            self.assertIn(line + "\n", text)
+
+    def test_installed(self):
+        transport = mock.Mock()
+        transport.request.return_value.json.return_value = {}
+        AtlasRequest(server="test", transport=transport).get()
+        self.assertEqual(
+            self.registry.snapshot()["cousteau_request_seconds_count"],
+            [({"method": "GET"}, 1)]
+        )
+
+    def test_opentelemetry(self):
+        meter = mock.Mock()
+        self.registry.add_opentelemetry(meter=meter)
+        self.registry.on_page({"items": 5})
+        page_items = meter.create_histogram.return_value
+        page_items.record.assert_called_with(5)
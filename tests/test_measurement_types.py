@@ -14,11 +14,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """File containing the nose tests"""
+import copy
+import pickle
 import unittest
 
+from unittest import mock
+
 from ripe.atlas.cousteau import (
-    Ping, Traceroute, Dns, Sslcert, Ntp, Http
+    Ping, Traceroute, Dns, Sslcert, Ntp, Http, MeasurementTemplate
 )
+from ripe.atlas.cousteau.measurement import MalFormattedMeasurement
 
 
 class TestMeasurementTypes(unittest.TestCase):
@@ -113,3 +118,86 @@ class TestMeasurementTypes(unittest.TestCase):
             'target': 'www.ripe.net', 'prefer_anchors': True
         }
         self.assertEqual(post_body, expected_output)
+
+
+class TestMeasurementTemplate(unittest.TestCase):
+
+    def test_variants(self):
+        """Variants match the structure of the equivalent measurements"""
+        template = MeasurementTemplate(Traceroute(
+            af=4, protocol="ICMP", description="trace {target}", maxhops=16
+        ))
+        targets = ["ripe.net", "example.com"]
+        with mock.patch("builtins.print") as printed:
+            structs = template.build_api_structs({"target": t} for t in targets)
+        printed.assert_not_called()
+
+        with mock.patch("builtins.print"):
+            expected = [
+                Traceroute(
+                    af=4, protocol="ICMP", description="trace " + target,
+                    maxhops=16, target=target
+                ).build_api_struct()
+                for target in targets
+            ]
+        self.assertEqual(structs, expected)
+
+    def test_overrides(self):
+        template = MeasurementTemplate(Dns(
+            af=4, description="dns", query_class="IN", query_type="A",
+            query_argument="ripe.net", target="k.root-servers.net"
+        ))
+        with mock.patch("builtins.print"):
+            struct = template.build_api_struct(af=6, noabuf=True)
+        self.assertEqual(struct["af"], 6)
+        self.assertEqual(struct["include_abuf"], False)
+        self.assertEqual(struct["description"], "dns")
+        self.assertEqual(struct["query_argument"], "ripe.net")
+
+    def test_definitions(self):
+        template = MeasurementTemplate(Ping(af=4, description="ping"))
+        definitions = template.definitions([{"target": "a"}, {"target": "b"}])
+        self.assertEqual(definitions[1].target, "b")
+        struct = definitions[0].build_api_struct()
+        self.assertEqual(
+            struct, {"type": "ping", "af": 4, "description": "ping", "target": "a"}
+        )
+        struct["tags"] = ["x"]
+        self.assertNotIn("tags", definitions[0].build_api_struct())
+
+    def test_definition_copy(self):
+        template = MeasurementTemplate(Ping(af=4, description="ping"))
+        definition = template.definition(target="a")
+        for other in (copy.copy(definition), copy.deepcopy(definition),
+                      pickle.loads(pickle.dumps(definition))):
+            self.assertEqual(other.target, "a")
+            self.assertEqual(
+                other.build_api_struct(), definition.build_api_struct()
+            )
+        self.assertRaises(AttributeError, getattr, definition, "tags")
+
+    def test_description_braces(self):
+        template = MeasurementTemplate(Ping(af=4, description="x { y"))
+        self.assertEqual(
+            template.build_api_struct(target="a")["description"], "x { y"
+        )
+        template = MeasurementTemplate(Ping(af=4, description="{target} }"))
+        self.assertEqual(
+            template.build_api_struct(target="a")["description"], "{target} }"
+        )
+        for description in ("x {1}", "x {}"):
+            self.assertRaises(
+                MalFormattedMeasurement, MeasurementTemplate,
+                Ping(af=4, description=description)
+            )
+        template = MeasurementTemplate(Ping(af=4, description="x {af:q}"))
+        self.assertRaises(
+            MalFormattedMeasurement, template.build_api_struct, target="a"
+        )
+
+    def test_missing_options(self):
+        template = MeasurementTemplate(Ping(af=4, description="ping {tarrget}"))
+        self.assertRaises(MalFormattedMeasurement, template.build_api_struct)
+        self.assertRaises(
+            MalFormattedMeasurement, template.build_api_struct, target="a"
+        )
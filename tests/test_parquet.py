@@ -0,0 +1,118 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+from ripe.atlas.cousteau.parquet import ParquetResultSink
+
+try:
+    import pyarrow.dataset
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+PING_RESULT = {
+    "fw": 5020, "af": 4, "dst_addr": "193.0.14.129", "proto": "ICMP",
+    "ttl": 56, "size": 48, "result": [{"rtt": 5.1}, {"rtt": 5.3}, {"x": "*"}],
+    "dup": 0, "rcvd": 2, "sent": 3, "min": 5.1, "max": 5.3, "avg": 5.2,
+    "msm_id": 1001, "prb_id": 12, "timestamp": 1600000000,
+    "from": "1.2.3.4", "type": "ping", "stored_timestamp": 1600000100,
+}
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestParquetResultSink(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get_files(self, *parts):
+        directory = os.path.join(self.root, *parts)
+        return sorted(os.listdir(directory))
+
+    def read(self, result_type):
+        return pyarrow.dataset.dataset(
+            os.path.join(self.root, "type=" + result_type), partitioning="hive"
+        ).to_table()
+
+    def test_partitions(self):
+        with ParquetResultSink(self.root) as sink:
+            sink.write(PING_RESULT)
+            sink.write(dict(PING_RESULT, prb_id=13, timestamp=1600100000))
+            sink.write(dict(PING_RESULT, msm_id=1002))
+            sink.write({"type": "sslcert", "msm_id": 5, "timestamp": 1600000000,
+                        "cert": ["a", "b"], "alert": {"level": 2}})
+
+        self.assertEqual(
+            self.get_files("type=ping", "msm_id=1001"),
+            ["date=2020-09-13", "date=2020-09-14"]
+        )
+        self.assertEqual(self.get_files("type=ping"), ["msm_id=1001", "msm_id=1002"])
+
+        table = self.read("ping").sort_by("prb_id").to_pydict()
+        self.assertEqual(sorted(table["msm_id"]), [1001, 1001, 1002])
+        self.assertEqual(table["rtts"][0], [5.1, 5.3])
+        self.assertEqual(table["proto"][0], "ICMP")
+
+        sslcert = self.read("sslcert").to_pydict()
+        self.assertEqual(sslcert["cert"], [["a", "b"]])
+        self.assertEqual(json.loads(sslcert["alert"][0]), {"level": 2})
+
+    def test_missing_values(self):
+        with ParquetResultSink(self.root) as sink:
+            sink.write(dict(PING_RESULT, rcvd=0, min=-1, avg=-1, max=-1, result=[]))
+        table = self.read("ping").to_pydict()
+        self.assertEqual(table["avg"], [None])
+        self.assertEqual(table["rtts"], [[]])
+
+    def test_row_groups(self):
+        with ParquetResultSink(self.root, row_group_size=2) as sink:
+            sink.write_lines(
+                json.dumps(dict(PING_RESULT, prb_id=i)).encode() for i in range(5)
+            )
+        directory = os.path.join(
+            self.root, "type=ping", "msm_id=1001", "date=2020-09-13"
+        )
+        files = os.listdir(directory)
+        self.assertEqual(len(files), 1)
+        path = os.path.join(directory, files[0])
+        metadata = pyarrow.parquet.ParquetFile(path).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        self.assertEqual(metadata.num_rows, 5)
+
+    def test_buffer_limit(self):
+        sink = ParquetResultSink(self.root, max_buffered_rows=3, max_open_files=1)
+        for msm_id in (1, 1, 2):
+            sink.write(dict(PING_RESULT, msm_id=msm_id))
+        self.assertEqual(sink.buffered_rows, 1)
+        self.assertEqual(list(sink.buffers), [("ping", 2, "2020-09-13")])
+        sink.write(dict(PING_RESULT, msm_id=3))
+        sink.write(dict(PING_RESULT, msm_id=3))
+        self.assertEqual(len(sink.writers), 1)
+        sink.close()
+        self.assertEqual(self.read("ping").num_rows, 5)
+
+    def test_append(self):
+        for _ in range(2):
+            with ParquetResultSink(self.root) as sink:
+                sink.write(PING_RESULT)
+        self.assertEqual(self.read("ping").num_rows, 2)
@@ -0,0 +1,115 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasResultsRequest
+from ripe.atlas.cousteau.exceptions import APIResponseError
+from ripe.atlas.cousteau.pipeline import ResultPipeline, process_results
+
+from .mock_server import MockAtlasServer
+
+
+def probe_id(result):
+    return result["prb_id"]
+
+
+def one(result):
+    return 1
+
+
+def even_probe_id(result):
+    return result["prb_id"] if result["prb_id"] % 2 == 0 else None
+
+
+class FakeChunkTransport(object):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    @contextmanager
+    def stream(self, method, url, **kwargs):
+        response = mock.Mock(ok=True)
+        response.iter_content.return_value = iter(self.chunks)
+        yield response
+
+
+class TestIterChunks(TestCase):
+    def test_chunks_end_with_lines(self):
+        body = b"".join(
+            json.dumps({"prb_id": i}).encode() + b"\n" for i in range(10)
+        ) + b'{"prb_id": 10}'
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+        request = AtlasResultsRequest(
+            msm_id=1, transport=FakeChunkTransport(chunks)
+        )
+        received = list(request.iter_chunks(chunk_size=7))
+        self.assertEqual(b"".join(received), body)
+        for chunk in received[:-1]:
+            self.assertTrue(chunk.endswith(b"\n"))
+        self.assertEqual(
+            [json.loads(line)["prb_id"] for line in b"".join(received).splitlines()],
+            list(range(11)),
+        )
+
+
+class TestResultPipeline(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAtlasServer(results=500, result_probes=10).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_reduce_in_processes(self):
+        total = process_results(
+            [1, 2, {"msm_id": 3, "probe_ids": [1, 2]}], one, operator.add,
+            processes=2, chunk_size=4096, server=self.server.url,
+        )
+        self.assertEqual(total, 500 + 500 + 100)
+
+    def test_map_keeps_order(self):
+        pipeline = ResultPipeline(
+            even_probe_id, executor=ThreadPoolExecutor(2), chunk_size=1024,
+            max_pending=1, server=self.server.url,
+        )
+        values = pipeline.run([1])
+        expected = [
+            result["prb_id"] for result in self.server.results(1, {})
+            if result["prb_id"] % 2 == 0
+        ]
+        self.assertEqual(values, expected)
+
+    def test_initial(self):
+        pipeline = ResultPipeline(
+            probe_id, max, initial=100, executor=ThreadPoolExecutor(1),
+            server=self.server.url,
+        )
+        self.assertEqual(pipeline.run([1]), 100)
+        self.assertEqual(pipeline.run([]), 100)
+
+    def test_failed_request(self):
+        pipeline = ResultPipeline(
+            probe_id, executor=ThreadPoolExecutor(1), server=self.server.url,
+        )
+        with mock.patch.object(
+            AtlasResultsRequest, "iter_chunks", side_effect=APIResponseError("down")
+        ):
+            self.assertRaises(APIResponseError, pipeline.run, [1])
@@ -0,0 +1,84 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasClient
+from ripe.atlas.cousteau.poller import LatestPoller
+
+from .mock_server import MockAtlasServer
+
+
+class TestLatestPoller(TestCase):
+    def setUp(self):
+        self.server = MockAtlasServer(results=100, result_probes=10).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_poll(self):
+        with LatestPoller([1001], server=self.server.url) as poller:
+            update = poller.poll(1001)
+            self.assertEqual(len(update.changed), 10)
+            self.assertEqual(set(poller.snapshot(1001)), set(range(1, 11)))
+
+            update = poller.poll(1001)
+            self.assertTrue(update.not_modified)
+            self.assertFalse(update)
+
+            self.server.result_count += 3
+            update = poller.poll(1001)
+            self.assertEqual(len(update.changed), 3)
+            self.assertEqual(update.removed, [])
+            for result in update.changed:
+                self.assertEqual(poller.snapshot(1001)[result["prb_id"]], result)
+
+    def test_diff(self):
+        poller = LatestPoller([1])
+        poller.diff(1, [{"prb_id": 1, "timestamp": 1}, {"prb_id": 2, "timestamp": 1}])
+        update = poller.diff(1, [{"prb_id": 1, "timestamp": 2}])
+        self.assertEqual(update.changed, [{"prb_id": 1, "timestamp": 2}])
+        self.assertEqual(update.removed, [2])
+
+    def test_failed_poll(self):
+        poller = LatestPoller([1], server=self.server.url)
+        poller.diff(1, [{"prb_id": 1}])
+        self.server.stop()
+        update = poller.poll(1)
+        self.assertFalse(update.is_success)
+        self.assertEqual(poller.snapshot(1), {1: {"prb_id": 1}})
+        self.server = MockAtlasServer().start()
+
+    def test_client_headers_unchanged(self):
+        client = AtlasClient(server=self.server.url)
+        poller = LatestPoller([1001], client=client)
+        poller.poll(1001)
+        self.assertEqual(poller.poll(1001).not_modified, True)
+        self.assertNotIn("If-None-Match", client.get_headers(None, None, "agent") or {})
+
+    def test_iter_updates(self):
+        poller = LatestPoller(
+            [1001, 1002, 1003], interval=0.1, jitter=0.5, max_workers=2,
+            server=self.server.url,
+        )
+        updates = poller.iter_updates(seconds=0.5)
+        first = [next(updates) for _ in range(3)]
+        self.assertEqual(sorted(update.msm_id for update in first), [1001, 1002, 1003])
+        self.server.result_count += 1
+        changed = [update for update in updates]
+        self.assertEqual(
+            sorted(update.msm_id for update in changed), [1001, 1002, 1003]
+        )
+        self.assertTrue(all(len(update.changed) == 1 for update in changed))
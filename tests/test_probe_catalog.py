@@ -0,0 +1,129 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import ProbeCatalog
+
+
+class TestProbeCatalog(TestCase):
+    def setUp(self):
+        self.probes = [
+            {
+                "id": 1,
+                "asn_v4": 3333,
+                "asn_v6": 3333,
+                "country_code": "NL",
+                "prefix_v4": "193.0.0.0/21",
+                "prefix_v6": "2001:67c:2e8::/48",
+                "status": {"id": 1, "name": "Connected"},
+                "tags": [{"name": "Home", "slug": "home"}],
+                "geometry": {"type": "Point", "coordinates": [4.8875, 52.3875]},
+            },
+            {
+                "id": 2,
+                "asn_v4": 1136,
+                "asn_v6": None,
+                "country_code": "nl",
+                "prefix_v4": "193.0.0.0/16",
+                "prefix_v6": None,
+                "status": {"id": 2, "name": "Disconnected"},
+                "tags": [{"name": "NAT", "slug": "nat"}],
+                "geometry": {"type": "Point", "coordinates": [5.1214, 52.0907]},
+            },
+            {
+                "id": 3,
+                "asn_v4": 3329,
+                "country_code": "GR",
+                "prefix_v4": "62.1.0.0/16",
+                "status": 1,
+                "status_name": "Connected",
+                "tags": ["home", "nat"],
+                "latitude": 37.9838,
+                "longitude": 23.7275,
+            },
+            {
+                "id": 4,
+                "asn_v4": None,
+                "country_code": "NZ",
+                "status": {"id": 1, "name": "Connected"},
+                "geometry": {"type": "Point", "coordinates": [179.9, -37.0]},
+            },
+        ]
+        self.catalog = ProbeCatalog(self.probes)
+
+    def test_hash_indexes(self):
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.by_asn(3333), {1})
+        self.assertEqual(self.catalog.by_asn(3333, af=6), {1})
+        self.assertEqual(self.catalog.by_asn(1136, af=6), set())
+        self.assertEqual(self.catalog.by_country("nl"), {1, 2})
+        self.assertEqual(self.catalog.by_status("Connected"), {1, 3, 4})
+        self.assertEqual(self.catalog.by_status(2), {2})
+        self.assertEqual(self.catalog.by_tag("nat"), {2, 3})
+
+    def test_prefix_queries(self):
+        self.assertEqual(self.catalog.covering("193.0.0.1"), {1, 2})
+        self.assertEqual(self.catalog.covering("193.0.200.1"), {2})
+        self.assertEqual(self.catalog.covering("8.8.8.8"), set())
+        self.assertEqual(self.catalog.covering("2001:67c:2e8::1"), {1})
+        self.assertEqual(self.catalog.within("193.0.0.0/8"), {1, 2})
+        self.assertEqual(self.catalog.within("193.0.0.0/18"), {1})
+        self.assertEqual(self.catalog.within("2001::/16"), {1})
+
+    def test_near(self):
+        self.assertEqual(self.catalog.near(52.37, 4.89, 10), {1})
+        self.assertEqual(self.catalog.near(52.37, 4.89, 100), {1, 2})
+        # Across the antimeridian
+        self.assertEqual(self.catalog.near(-37.0, -179.9, 50), {4})
+
+    def test_select(self):
+        self.assertEqual(
+            [p["id"] for p in self.catalog.select(
+                country_code="NL", status="Connected"
+            )],
+            [1]
+        )
+        self.assertEqual(
+            [p["id"] for p in self.catalog.select(tags=["home", "nat"])], [3]
+        )
+        self.assertEqual(len(self.catalog.select()), 4)
+
+    def test_update_and_remove(self):
+        self.catalog.add(dict(self.probes[0], country_code="BE", prefix_v4=None))
+        self.assertEqual(self.catalog.by_country("NL"), {2})
+        self.assertEqual(self.catalog.by_country("BE"), {1})
+        self.assertEqual(self.catalog.covering("193.0.0.1"), {2})
+        self.catalog.remove(2)
+        self.assertNotIn(2, self.catalog)
+        self.assertEqual(self.catalog.by_tag("nat"), {3})
+        self.assertEqual(self.catalog.covering("193.0.0.1"), set())
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "probes.json")
+            self.catalog.save(path)
+            loaded = ProbeCatalog.load(path)
+        self.assertEqual(list(loaded), self.probes)
+        self.assertEqual(loaded.within("193.0.0.0/8"), {1, 2})
+
+    def test_from_api(self):
+        with mock.patch("ripe.atlas.cousteau.request.AtlasRequest.get") as get:
+            get.return_value = True, {"count": 1, "next": None, "results": self.probes}
+            catalog = ProbeCatalog.from_api(is_public=True)
+        self.assertEqual(len(catalog), 4)
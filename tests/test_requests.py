@@ -32,6 +32,7 @@ from ripe.atlas.cousteau import (
     AtlasRequest,
 )
 from . import post_data_create_schema, post_data_change_schema
+from .mock_server import MockAtlasServer
 
 
 class FakeResponse(object):
@@ -106,6 +107,12 @@ class TestAtlasRequest(TestCase):
         self.request.build_url()
         self.assertEqual(self.request.url, "https://testtesting")
 
+    def test_url_build_with_scheme(self):
+        """Tests a server given with a scheme, like a local test server."""
+        request = AtlasRequest(server="http://localhost:8000/", url_path="/api/v2/")
+        request.build_url()
+        self.assertEqual(request.url, "http://localhost:8000/api/v2/")
+
     def test_success_http_method(self):
         """Tests the main http method function of the request in case of success"""
         with mock.patch("ripe.atlas.cousteau.AtlasRequest.get_http_method") as mock_get:
@@ -457,3 +464,59 @@ class TestAtlasRequestCustomHeaders(TestCase):
             "Authorization": "Key sample_api_key",
         }
         self.assertEqual(self.request.get_headers(), expected_headers)
+
+
+class TestProbeChunks(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockAtlasServer(results=3000, result_probes=1500).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_chunks(self):
+        request = AtlasResultsRequest(msm_id=1, probe_ids=list(range(1, 1501)))
+        chunks = request.probe_chunks()
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[1].split(",")[0], "501")
+        request = AtlasResultsRequest(msm_id=1, probe_ids=[1, 2])
+        self.assertEqual(request.chunk_requests(), [request])
+
+    def test_results(self):
+        probe_ids = list(range(1, 1501))
+        request = AtlasResultsRequest(
+            msm_id=1, probe_ids=probe_ids, server=self.server.url
+        )
+        count = self.server.request_count
+        is_success, results = request.create()
+        self.assertTrue(is_success)
+        self.assertEqual(self.server.request_count - count, 3)
+        self.assertEqual(len(results), 3000)
+        timestamps = [result["timestamp"] for result in results]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(list(request.iter_results()), results)
+        self.assertEqual(len(list(request.iter_lines())), 3000)
+        self.assertEqual(
+            sum(chunk.count(b"\n") for chunk in request.iter_chunks()), 3000
+        )
+
+    def test_latest(self):
+        request = AtlasLatestRequest(
+            msm_id=1, probe_ids=list(range(1, 2001)), server=self.server.url
+        )
+        is_success, results = request.create()
+        self.assertTrue(is_success)
+        self.assertEqual(
+            sorted(result["prb_id"] for result in results), list(range(1, 1501))
+        )
+
+    def test_failed_chunk(self):
+        request = AtlasLatestRequest(
+            msm_id=1, probe_ids=list(range(1, 2001)), server=self.server.url
+        )
+        responses = iter([(True, []), (False, "error"), (True, []), (True, [])])
+        with mock.patch.object(
+            AtlasRequest, "get", side_effect=lambda: next(responses)
+        ):
+            self.assertEqual(request.create(), (False, "error"))
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest import mock
+
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+from ripe.atlas.cousteau.store import ResultStore, INDEX_RECORD
+
+
+def make_result(msm_id=1001, prb_id=1, timestamp=1600000000, **extra):
+    result = {"msm_id": msm_id, "prb_id": prb_id, "timestamp": timestamp}
+    result.update(extra)
+    return result
+
+
+class TestResultStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fill(self, store):
+        for timestamp in range(1600000000, 1600000000 + 10 * 240, 240):
+            for prb_id in (1, 2, 3):
+                store.append(make_result(prb_id=prb_id, timestamp=timestamp, avg=1.5))
+        store.append(make_result(msm_id=1002, prb_id=1))
+
+    def test_query(self):
+        with ResultStore(self.directory) as store:
+            self.fill(store)
+            self.assertEqual(len(store), 31)
+            self.assertEqual(store.measurements(), [1001, 1002])
+            self.assertEqual(store.probes(1001), [1, 2, 3])
+
+            results = list(store.query(
+                1001, prb_id=2, start=1600000240, stop=1600000720
+            ))
+            self.assertEqual(
+                [result["timestamp"] for result in results],
+                [1600000240, 1600000480, 1600000720]
+            )
+            self.assertEqual({result["prb_id"] for result in results}, {2})
+
+            timestamps = [r["timestamp"] for r in store.query(1001, start=1600002000)]
+            self.assertEqual(timestamps, [1600002160] * 3)
+            self.assertEqual(list(store.query(1001, prb_id=9)), [])
+            self.assertEqual(list(store.query(9)), [])
+
+    def test_raw_lines_and_duplicates(self):
+        line = json.dumps(make_result(avg=3)).encode()
+        with ResultStore(self.directory) as store:
+            self.assertEqual(store.write_lines([line, b"", line + b"\n"]), 1)
+            self.assertFalse(store.append(make_result()))
+            self.assertEqual(list(store.query(1001, raw=True)), [line])
+
+    def test_invalid_result(self):
+        with ResultStore(self.directory) as store:
+            self.assertRaises(CousteauGenericError, store.append, {"msm_id": 1})
+
+    def test_reopen(self):
+        with ResultStore(self.directory, segment_size=512) as store:
+            self.fill(store)
+        segments = [
+            name for name in os.listdir(self.directory)
+            if name.startswith("segment")
+        ]
+        self.assertGreater(len(segments), 1)
+
+        with ResultStore(self.directory, segment_size=512) as store:
+            self.assertEqual(len(store), 31)
+            self.assertFalse(store.append(make_result(prb_id=3)))
+            store.append(make_result(prb_id=3, timestamp=1700000000))
+            results = list(store.query(1001, prb_id=3))
+            self.assertEqual(len(results), 11)
+            self.assertEqual(results[0]["avg"], 1.5)
+            self.assertEqual(results[-1]["timestamp"], 1700000000)
+
+    def test_many_measurements(self):
+        with mock.patch("ripe.atlas.cousteau.store.MAX_INDEX_FILES", 3):
+            with ResultStore(self.directory) as store:
+                for timestamp in (1, 2):
+                    for msm_id in range(1, 11):
+                        store.append(make_result(msm_id=msm_id, timestamp=timestamp))
+                self.assertEqual(len(store._index_files), 3)
+        with ResultStore(self.directory) as store:
+            self.assertEqual(store.measurements(), list(range(1, 11)))
+            self.assertEqual(len(list(store.query(5))), 2)
+
+    def test_read_while_appending(self):
+        with ResultStore(self.directory) as store:
+            store.append(make_result(timestamp=1))
+            self.assertEqual(len(list(store.query(1001))), 1)
+            store.append(make_result(timestamp=2))
+            self.assertEqual(len(list(store.query(1001))), 2)
+
+    def test_truncated_segment(self):
+        with ResultStore(self.directory) as store:
+            store.append(make_result(timestamp=1))
+            store.append(make_result(timestamp=2))
+        # An index record for a result that never made it to the segment
+        with open(os.path.join(self.directory, "index-1001.bin"), "ab") as index:
+            index.write(INDEX_RECORD.pack(1, 3, 1, 10 ** 6, 20))
+            index.write(b"\x00\x01")
+
+        with ResultStore(self.directory) as store:
+            self.assertEqual([r["timestamp"] for r in store.query(1001)], [1, 2])
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import socket
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasStream, StreamStats
+
+
+class FakeClock(object):
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestStreamStats(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.snapshots = []
+        self.stats = StreamStats(
+            interval=10, callback=self.snapshots.append, clock=self.clock
+        )
+
+    def test_window(self):
+        self.clock.now += 2
+        result = {"timestamp": 990, "stored_timestamp": 995}
+        self.stats.record_message("atlas_result", 100, 0.001, result)
+        self.stats.record_message("atlas_result", 100, 0.003, result)
+        self.stats.record_message("atlas_subscribed", 50, 0.002, {})
+        self.stats.record_callback(0.5)
+        self.assertEqual(self.snapshots, [])
+
+        self.clock.now += 8
+        self.stats.record_message("atlas_result", 50, 0.002, {"timestamp": 1008})
+        snapshot, = self.snapshots
+        self.assertEqual(snapshot["seconds"], 10)
+        self.assertEqual(snapshot["events"], {"atlas_result": 3, "atlas_subscribed": 1})
+        self.assertEqual(snapshot["events_per_second"]["atlas_result"], 0.3)
+        self.assertEqual(snapshot["bytes_per_second"], 30)
+        self.assertAlmostEqual(snapshot["decode_seconds"], 0.002)
+        self.assertEqual(snapshot["callback_seconds"], 0.5)
+        self.assertEqual(snapshot["lag"], {"mean": 26 / 3, "max": 12, "last": 2})
+        self.assertEqual(snapshot["stored_lag"], {"mean": 7, "max": 7, "last": 7})
+        self.assertIs(self.stats.last, snapshot)
+
+        self.clock.now += 5
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot["events"], {})
+        self.assertIsNone(snapshot["lag"])
+        self.assertEqual(snapshot["totals"], {"atlas_result": 3, "atlas_subscribed": 1})
+
+    def test_tick(self):
+        self.clock.now += 4
+        self.assertEqual(self.stats.seconds_left(), 6)
+        self.stats.tick()
+        self.assertEqual(self.snapshots, [])
+        self.clock.now += 7
+        self.assertEqual(self.stats.seconds_left(), 0)
+        self.stats.tick()
+        snapshot, = self.snapshots
+        self.assertEqual(snapshot["seconds"], 11)
+        self.assertEqual(self.stats.seconds_left(), 10)
+
+
+class TestStreamTracking(TestCase):
+    def test_timeout(self):
+        stream = AtlasStream()
+        stats = stream.track_stats(interval=3600)
+        callback = mock.Mock()
+        stream.bind("atlas_result", callback)
+        messages = [
+            ["atlas_subscribed", {}],
+            ["atlas_result", {"msm_id": 1, "timestamp": 1}],
+        ]
+        stream.ws = mock.Mock()
+        stream.ws.recv.side_effect = [json.dumps(message) for message in messages]
+        with mock.patch.object(stream, "iter", side_effect=lambda seconds: (
+            stream.recv(stream.ws) for _ in messages
+        )):
+            stream.timeout()
+
+        callback.assert_called_once_with({"msm_id": 1, "timestamp": 1})
+        self.assertEqual(stats.events, {"atlas_subscribed": 1, "atlas_result": 1})
+        self.assertEqual(stats.callbacks, 1)
+        self.assertEqual(stats.lag[0], 1)
+
+    def test_utf8_bytes(self):
+        stream = AtlasStream()
+        stats = stream.track_stats(interval=3600)
+        stream.ws = mock.Mock()
+        stream.ws.recv.return_value = json.dumps(
+            ["atlas_result", {"msm_id": 1, "name": "\u00e9"}], ensure_ascii=False
+        )
+        stream.recv(stream.ws)
+        self.assertEqual(stats.bytes, len(stream.ws.recv.return_value) + 1)
+
+    def test_idle_snapshots(self):
+        stream = AtlasStream()
+        snapshots = []
+        stream.track_stats(interval=0.05, callback=snapshots.append)
+        stream.ws, other = socket.socketpair()
+        try:
+            self.assertEqual(list(stream.iter(seconds=0.3)), [])
+        finally:
+            stream.ws.close()
+            other.close()
+        self.assertGreaterEqual(len(snapshots), 3)
+        self.assertEqual(snapshots[0]["events"], {})
@@ -0,0 +1,123 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shelve
+import tempfile
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasClient, ProbeSync, MeasurementSync
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+
+
+class TestMeasurementSync(TestCase):
+    def setUp(self):
+        self.transport = mock.Mock()
+        self.client = AtlasClient(transport=self.transport)
+        self.responses = []
+
+        def request(method, url, **kwargs):
+            response = mock.Mock(ok=True)
+            response.json.return_value = self.responses.pop(0)
+            return response
+
+        self.transport.request.side_effect = request
+
+    def requested_urls(self):
+        return [c[0][1] for c in self.transport.request.call_args_list]
+
+    def test_full_then_delta_sync(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_file = os.path.join(tmp_dir, "state.json")
+            store = {}
+
+            self.responses = [{
+                "count": 2, "next": None,
+                "results": [{"id": 10, "status": 2}, {"id": 12, "status": 2}]
+            }]
+            with mock.patch("ripe.atlas.cousteau.sync.time.time", return_value=1000):
+                syncer = MeasurementSync(
+                    store=store, state_file=state_file, client=self.client
+                )
+                self.assertEqual(syncer.sync(), 2)
+            self.assertEqual(self.requested_urls(), [
+                "https://atlas.ripe.net/api/v2/measurements/"
+            ])
+            with open(state_file) as f:
+                self.assertEqual(json.load(f), {"last_sync": 1000, "max_id": 12})
+
+            self.responses = [
+                {"count": 1, "next": None, "results": [{"id": 13, "status": 1}]},
+                {"count": 0, "next": None, "results": []},
+                {"count": 1, "next": None, "results": [{"id": 10, "status": 4}]},
+            ]
+            with mock.patch("ripe.atlas.cousteau.sync.time.time", return_value=2000):
+                syncer = MeasurementSync(
+                    store=store, state_file=state_file, client=self.client
+                )
+                self.assertEqual(syncer.sync(), 2)
+            url = "https://atlas.ripe.net/api/v2/measurements/"
+            self.assertEqual(self.requested_urls()[1:], [
+                url + "?id__gt=12",
+                url + "?start_time__gte=1000&start_time__lte=2000",
+                url + "?stop_time__gte=1000&stop_time__lte=2000",
+            ])
+            self.assertEqual(store, {
+                "10": {"id": 10, "status": 4},
+                "12": {"id": 12, "status": 2},
+                "13": {"id": 13, "status": 1},
+            })
+            self.assertEqual(syncer.state["max_id"], 13)
+
+    def test_probe_sync_with_filters(self):
+        syncer = ProbeSync(client=self.client, is_public=True)
+        syncer.state = {"last_sync": 1000, "max_id": 5}
+        self.assertEqual(syncer.get_queries(2000), [
+            {"id__gt": 5},
+            {"status_since__gte": 1000, "status_since__lte": 2000},
+        ])
+        self.responses = [
+            {"count": 1, "next": None, "results": [{"id": 6}]},
+            {"count": 1, "next": None, "results": [{"id": 3, "status": 2}]},
+        ]
+        with mock.patch("ripe.atlas.cousteau.sync.time.time", return_value=2000):
+            self.assertEqual(syncer.sync(), 2)
+        url = "https://atlas.ripe.net/api/v2/probes/?is_public=True"
+        self.assertEqual(self.requested_urls(), [
+            url + "&id__gt=5",
+            url + "&status_since__gte=1000&status_since__lte=2000",
+        ])
+
+        syncer = ProbeSync(client=self.client, change_filters=["status_since__gte"])
+        syncer.state = {"last_sync": 1000, "max_id": 5}
+        self.assertEqual(syncer.get_queries(2000), [
+            {"id__gt": 5}, {"status_since__gte": 1000},
+        ])
+
+    def test_shelve_store(self):
+        self.responses = [{"count": 1, "next": None, "results": [{"id": 6}]}]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with shelve.open(os.path.join(tmp_dir, "probes")) as shelf:
+                syncer = ProbeSync(store=shelf, client=self.client)
+                self.assertEqual(syncer.sync(), 1)
+                self.assertEqual(dict(shelf), {"6": {"id": 6}})
+
+    def test_return_objects(self):
+        self.assertRaises(
+            CousteauGenericError, ProbeSync, client=self.client,
+            return_objects=True
+        )
@@ -0,0 +1,71 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import AtlasResultsRequest, timestamps
+from ripe.atlas.cousteau.exceptions import CousteauGenericError
+
+UTC = timezone.utc
+
+
+class TestTimestamps(TestCase):
+    def test_to_timestamp(self):
+        for value in (
+            1444953600,
+            1444953600.7,
+            "1444953600",
+            datetime(2015, 10, 16),
+            datetime(2015, 10, 16, tzinfo=UTC),
+            datetime(2015, 10, 16, 2, tzinfo=timezone(timedelta(hours=2))),
+            date(2015, 10, 16),
+            "2015-10-16",
+            "20151016",
+            "2015-10-16T00:00:00Z",
+            "2015-10-16T02:00:00+02:00",
+            "Oct 16 2015 00:00 UTC",
+        ):
+            self.assertEqual(timestamps.to_timestamp(value), 1444953600, value)
+        self.assertIsNone(timestamps.to_timestamp(None))
+        self.assertRaises(CousteauGenericError, timestamps.to_timestamp, "no time")
+        self.assertRaises(CousteauGenericError, timestamps.to_timestamp, [])
+
+    def test_iso_without_dateutil(self):
+        with mock.patch("dateutil.parser.parse") as parse:
+            self.assertEqual(
+                timestamps.parse("2015-10-16T00:00:00.5Z"),
+                datetime(2015, 10, 16, 0, 0, 0, 500000, tzinfo=UTC),
+            )
+        parse.assert_not_called()
+
+    def test_to_datetime(self):
+        expected = datetime(2015, 10, 16, tzinfo=UTC)
+        for value in (1444953600, "2015-10-16T02:00:00+02:00", datetime(2015, 10, 16)):
+            converted = timestamps.to_datetime(value)
+            self.assertEqual(converted, expected)
+            self.assertIs(converted.tzinfo, UTC)
+        self.assertIsNone(timestamps.to_datetime(None))
+
+    def test_request_times(self):
+        request = AtlasResultsRequest(
+            msm_id=1, start="2015-10-16T00:00:00Z", stop=datetime(2015, 10, 17)
+        )
+        self.assertEqual(request.start, 1444953600)
+        self.assertEqual(
+            request.http_method_args["params"],
+            {"start": 1444953600, "stop": 1445040000},
+        )
@@ -0,0 +1,136 @@
+# Copyright (c) 2026 RIPE NCC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from unittest import mock
+from unittest import TestCase
+
+from ripe.atlas.cousteau import (
+    AtlasRequest, ProbeRequest, Probe, RequestsTransport, HTTP2Transport
+)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TestRequestsTransport(TestCase):
+    def test_session_request(self):
+        session = mock.Mock()
+        transport = RequestsTransport(session=session)
+        request = AtlasRequest(server="test", url_path="/testing", transport=transport)
+        request.get(bull="shit")
+        method, url = session.request.call_args[0]
+        self.assertEqual(method, "GET")
+        self.assertEqual(url, "https://test/testing")
+        self.assertEqual(session.request.call_args[1]["params"], {"bull": "shit"})
+
+    def test_without_session(self):
+        with mock.patch("ripe.atlas.cousteau.transport.requests.request") as req:
+            RequestsTransport().request("GET", "https://test/", params={})
+            req.assert_called_once_with("GET", "https://test/", params={})
+
+    def test_stream(self):
+        session = mock.Mock()
+        transport = RequestsTransport(session=session)
+        with transport.stream("GET", "https://test/") as response:
+            self.assertEqual(response, session.request.return_value)
+        session.request.assert_called_once_with("GET", "https://test/", stream=True)
+        response.close.assert_called_once_with()
+
+    def test_listing_and_meta_data_forward_transport(self):
+        transport = mock.Mock()
+        response = transport.request.return_value
+        response.ok = True
+        response.json.return_value = {
+            "count": 1, "next": None, "results": [{"id": 1, "status": {}}]
+        }
+        probes = list(ProbeRequest(return_objects=True, transport=transport))
+        self.assertEqual(probes[0].transport, transport)
+        self.assertEqual(transport.request.call_count, 1)
+
+        response.json.return_value = {"id": 2, "status": {"name": "Connected"}}
+        probe = Probe(id=2, transport=transport)
+        self.assertEqual(probe.status, "Connected")
+        self.assertEqual(
+            transport.request.call_args[0][1], "https://atlas.ripe.net/api/v2/probes/2/"
+        )
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHTTP2Transport(TestCase):
+    def test_request(self):
+        def handler(request):
+            self.assertEqual(request.url.params["limit"], "1")
+            self.assertEqual(request.headers["Accept"], "application/json")
+            return httpx.Response(200, json={"count": 0})
+
+        transport = HTTP2Transport(transport=httpx.MockTransport(handler))
+        request = AtlasRequest(server="test", url_path="/testing", transport=transport)
+        self.assertEqual(request.get(limit=1), (True, {"count": 0}))
+
+    def test_query_string_kept(self):
+        def handler(request):
+            self.assertEqual(request.url.params["page"], "2")
+            self.assertEqual(request.url.params["limit"], "1")
+            return httpx.Response(200, json={})
+
+        transport = HTTP2Transport(transport=httpx.MockTransport(handler))
+        request = AtlasRequest(
+            server="test", url_path="/api/v2/probes/?page=2", transport=transport
+        )
+        self.assertEqual(request.get(limit=1), (True, {}))
+
+    def test_error_response(self):
+        transport = HTTP2Transport(
+            transport=httpx.MockTransport(lambda r: httpx.Response(404, text="nope"))
+        )
+        request = AtlasRequest(server="test", transport=transport)
+        self.assertEqual(request.get(), (False, "nope"))
+
+    def test_stream(self):
+        transport = HTTP2Transport(transport=httpx.MockTransport(
+            lambda r: httpx.Response(200, text='{"a": 1}\n{"a": 2}\n')
+        ))
+        request = AtlasRequest(server="test", transport=transport)
+        self.assertEqual(list(request.stream()), [b'{"a": 1}', b'{"a": 2}'])
+
+    def test_network_error(self):
+        def handler(request):
+            raise httpx.ConnectError("boom")
+
+        transport = HTTP2Transport(transport=httpx.MockTransport(handler))
+        request = AtlasRequest(server="test", transport=transport)
+        self.assertEqual(request.get(), (False, ("boom",)))
+
+    def test_timeout(self):
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, json={})
+
+        transport = HTTP2Transport(transport=httpx.MockTransport(handler))
+        self.assertEqual(transport.client.timeout, httpx.Timeout(60.0))
+        transport.request("GET", "https://test/")
+        transport.request("GET", "https://test/", timeout=5)
+        self.assertEqual(timeouts[0]["read"], 60.0)
+        self.assertEqual(timeouts[1]["read"], 5)
+
+        transport = HTTP2Transport(
+            timeout=10, transport=httpx.MockTransport(handler)
+        )
+        self.assertEqual(transport.client.timeout, httpx.Timeout(10))